@@ -0,0 +1,79 @@
+# batch_report.py (版本 1.0 - 命令行批量报告：不经过 Streamlit，为多个评论文件并发生成 CSV 与 HTML 报告)
+"""
+用法：
+    python batch_report.py exports/*.xlsx --profile 霓虹笔专属画像 --output-dir reports --workers 4
+    python batch_report.py exports/ --category-mapping asin_mapping.json --summary reports/summary.json
+
+输入可以是文件或目录（目录下所有支持格式的文件）。每个输入文件在输出目录中生成
+<文件名>_processed_data.csv 与 <文件名>_report.html；任一文件失败时退出码为 1，其余文件照常生成。
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from analysis_config import PROFILE_OVERRIDES, REPORT_CACHE_DIR, UPLOAD_FILE_TYPES, build_analysis_config
+from report_pipeline import build_report
+
+
+def expand_inputs(paths: List[str]) -> List[str]:
+    """展开输入路径：目录替换为其中所有支持格式的文件（按文件名排序），保持命令行中的先后顺序。"""
+    extensions = {f'.{file_type}' for file_type in UPLOAD_FILE_TYPES}
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            inputs.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                          if os.path.splitext(name)[1].lower() in extensions)
+        else:
+            inputs.append(path)
+    return inputs
+
+
+def _load_json(path: Optional[str]):
+    if not path:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="为多个评论数据文件批量生成分析报告（CSV + HTML）。")
+    parser.add_argument('inputs', nargs='+', help="评论数据文件或目录（Excel / CSV / Parquet / Arrow）")
+    parser.add_argument('--profile', default="默认基础画像", choices=list(PROFILE_OVERRIDES), help="产品画像")
+    parser.add_argument('--output-dir', default='reports', help="报告输出目录")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="并发处理的文件数（工作进程数）")
+    parser.add_argument('--category-mapping', help="ASIN → 产品系列 映射的 JSON 文件")
+    parser.add_argument('--extra-roles', help="追加的用户角色规则 JSON 文件（{角色: [关键词, ...]}）")
+    parser.add_argument('--no-cache', action='store_true', help="不读写结果缓存、增量评论库与极性缓存")
+    parser.add_argument('--summary', help="把每个文件的处理摘要写入该 JSON 文件")
+    args = parser.parse_args(argv)
+
+    inputs = expand_inputs(args.inputs)
+    if not inputs:
+        print("错误: 没有找到任何输入文件。")
+        return 1
+
+    config = build_analysis_config(None, args.profile, category_mapping=_load_json(args.category_mapping),
+                                   extra_roles=_load_json(args.extra_roles), use_caches=not args.no_cache)
+    print(f"正在为 {len(inputs)} 个文件生成【{args.profile}】报告（{min(args.workers, len(inputs))} 个工作进程）...")
+    summaries = build_report(config, inputs, args.profile, args.output_dir, args.workers,
+                             result_cache_dir=None if args.no_cache else REPORT_CACHE_DIR)
+
+    failed = [summary for summary in summaries if summary['error']]
+    print("\n" + "=" * 70)
+    for summary in summaries:
+        status = f"❌ {summary['error']}" if summary['error'] else f"✅ {summary['rows']} 条评论" + ("（缓存）" if summary['cached'] else "")
+        print(f"{summary['input']}: {status}，{summary['seconds']:.1f} 秒")
+    print(f"完成: {len(summaries) - len(failed)} 个成功，{len(failed)} 个失败。报告目录: {args.output_dir}")
+
+    if args.summary:
+        os.makedirs(os.path.dirname(args.summary) or '.', exist_ok=True)
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summaries, f, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
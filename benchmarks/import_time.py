@@ -0,0 +1,114 @@
+# benchmarks/import_time.py (版本 1.0 - 入口模块的导入耗时预算与延迟导入检查)
+"""
+在全新的子进程中测量各入口模块在 pandas / numpy 之上额外的导入耗时（多次运行取中位数），并检查：
+- 额外耗时不超过 IMPORT_BUDGETS_MS 中的预算；
+- 导入时没有加载 DEFERRED_MODULES 中的重型依赖。这些依赖只应在首次处理文本、读取对应格式时才导入。
+  pandas 自身在导入时就可能加载 pyarrow，因此不看 sys.modules，而是在子进程中拦截这些包：
+  模块级导入了其中任何一个，导入就会失败。
+子进程以隔离模式（-I）运行，不受 PYTHONPATH 与用户 site-packages 的影响。
+
+用法（在仓库根目录下）：
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 15 --output benchmarks/results/import_time.json
+全部模块都在预算内、且没有提前加载重型依赖时退出码为 0，否则为 1。
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+# 各入口模块在 pandas / numpy 之上额外的导入耗时预算（毫秒）。目前实测约 15~20 ms，
+# 预算留出充足余量以容忍机器差异，但任何一个重型依赖（如 NLTK 约 200 ms）被提前导入都会超出预算
+IMPORT_BUDGETS_MS = {
+    'review_io': 100,
+    'review_analyzer_core': 150,
+    'report_pipeline': 150,
+    'batch_report': 150,
+}
+DEFERRED_MODULES = ['nltk', 'textblob', 'pyarrow', 'openpyxl']
+DEFAULT_RUNS = 7
+
+# 在子进程中执行：可选地拦截指定的包，先导入 pandas / numpy，再计时导入目标模块
+_PROBE = r'''
+import importlib, json, sys, time
+repo_dir, module, blocked = sys.argv[1], sys.argv[2], set(filter(None, sys.argv[3].split(',')))
+sys.path.insert(0, repo_dir)
+
+class _Blocker:
+    def find_spec(self, name, path=None, target=None):
+        if name.split('.')[0] in blocked:
+            raise ImportError(f"'{name}' 不应在模块导入时加载")
+        return None
+
+sys.meta_path.insert(0, _Blocker())
+import numpy, pandas
+start = time.perf_counter()
+try:
+    importlib.import_module(module)
+    error = None
+except ImportError as e:
+    error = str(e)
+print(json.dumps({'seconds': time.perf_counter() - start, 'error': error}))
+'''
+
+
+def _probe(module: str, blocked: List[str]) -> Dict:
+    completed = subprocess.run([sys.executable, '-I', '-c', _PROBE, REPO_DIR, module, ','.join(blocked)],
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure_import(module: str, runs: int = DEFAULT_RUNS) -> Dict:
+    """返回 {'module', 'median_ms', 'runs_ms', 'deferred_error'}；deferred_error 为提前加载重型依赖时的报错信息。"""
+    runs_ms = [_probe(module, [])['seconds'] * 1000 for _ in range(runs)]
+    return {
+        'module': module,
+        'median_ms': statistics.median(runs_ms),
+        'runs_ms': runs_ms,
+        'deferred_error': _probe(module, DEFERRED_MODULES)['error'],
+    }
+
+
+def check_imports(budgets: Dict[str, float], runs: int = DEFAULT_RUNS) -> List[Dict]:
+    """测量 budgets 中的每个模块，并在结果中记录预算与是否通过。"""
+    results = []
+    for module, budget in budgets.items():
+        result = measure_import(module, runs)
+        result['budget_ms'] = budget
+        result['ok'] = result['median_ms'] <= budget and result['deferred_error'] is None
+        results.append(result)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="测量入口模块的导入耗时，并检查预算与重型依赖的延迟导入。")
+    parser.add_argument('--modules', nargs='+', default=list(IMPORT_BUDGETS_MS), help="要测量的模块")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="每个模块的测量次数（取中位数）")
+    parser.add_argument('--budget-ms', type=float, help="对所有模块统一使用该预算（毫秒），覆盖 IMPORT_BUDGETS_MS")
+    parser.add_argument('--output', help="把结果写入该 JSON 文件")
+    args = parser.parse_args(argv)
+
+    budgets = {module: args.budget_ms if args.budget_ms is not None else IMPORT_BUDGETS_MS.get(module, 150)
+               for module in args.modules}
+    results = check_imports(budgets, args.runs)
+    for result in results:
+        status = '✅' if result['ok'] else '❌'
+        print(f"{status} {result['module']:<24}{result['median_ms']:8.1f} ms（预算 {result['budget_ms']:.0f} ms）")
+        if result['deferred_error']:
+            print(f"   提前加载了重型依赖: {result['deferred_error']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# benchmarks/run_benchmarks.py (版本 1.1 - 合成评论数据上的可复现性能基准；可选记录各阶段的内存峰值)
+"""
+在 1k / 10k / 100k / 1M 行的合成评论数据上，对完整的报告流程（即 app.py 的全部步骤，不经过 Streamlit）
+以及 ReviewAnalyzer 的各个公开分析方法计时，结果保存为 JSON，便于跨版本比较。全程离线运行：
+合成数据由本地词库生成，分析不使用任何缓存；缺少 NLTK 数据包时直接报错退出，而不是尝试下载。
+
+用法（在仓库根目录下）：
+    python -m benchmarks.run_benchmarks --sizes 1000 10000
+    python -m benchmarks.run_benchmarks --sizes 1000 --compare benchmarks/results/<上次结果>.json
+    python -m benchmarks.run_benchmarks --sizes 10000 --trace-memory   # 另外用 tracemalloc 记录各阶段的内存峰值（耗时会偏高）
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from importlib import metadata
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+DATA_DIR = os.path.join(BENCHMARK_DIR, 'data')
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+# 超过该行数时 auto 格式改用 Parquet：用 openpyxl 写出 / 读取百万行的工作簿本身就要数十分钟
+MAX_AUTO_EXCEL_ROWS = 100_000
+DEFAULT_PROFILE = "默认基础画像"
+
+
+def check_offline_resources() -> List[str]:
+    """逐项实际调用分析所需的 NLTK 资源，返回缺失项的说明；为空表示可以离线运行。"""
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    from nltk.tokenize import sent_tokenize, word_tokenize
+
+    checks = {
+        'punkt (sent_tokenize / word_tokenize)': lambda: word_tokenize(sent_tokenize("Great pens. Love them.")[0]),
+        'stopwords': lambda: stopwords.words('english'),
+        'wordnet': lambda: WordNetLemmatizer().lemmatize('markers'),
+    }
+    missing = []
+    for name, check in checks.items():
+        try:
+            check()
+        except LookupError:
+            missing.append(name)
+    return missing
+
+
+def corpus_path(n_rows: int, seed: int, input_format: str) -> str:
+    if input_format == 'auto':
+        input_format = 'xlsx' if n_rows <= MAX_AUTO_EXCEL_ROWS else 'parquet'
+    return os.path.join(DATA_DIR, f'reviews_{n_rows}_seed{seed}.{input_format}')
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def environment_info() -> Dict:
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': {name: _package_version(name) for name in ('pandas', 'numpy', 'nltk', 'textblob', 'openpyxl', 'pyarrow')},
+    }
+
+
+def benchmark_size(n_rows: int, input_path: str, profile: str, n_jobs: int, streaming: bool, verbose: bool,
+                   trace_memory: bool = False) -> Dict:
+    """
+    在一个全新的进程中对一份数据完整运行一次：
+    - app_flow: 与 app.py 相同的全部步骤（核心分析、分类、内存压缩、分时段诊断、仪表盘数据、CSV 与 HTML）；
+    - 之后在同一结果上运行 run_comprehensive_feature_diagnostics / run_comprehensive_user_diagnostics；
+    - streaming: 用另一个分析器运行 run_streaming_analysis。
+    各方法的耗时、CPU 时间、内存与行数取自分析器的阶段记录：每个阶段都有进程内存高水位被推高的幅度
+    （new_high_water_mark_mb，多数阶段为 0）；trace_memory=True 时另有 tracemalloc 统计的阶段内存峰值（peak_memory_delta_mb）。
+    """
+    from analysis_config import DEFAULT_CLASSIFICATIONS, build_analysis_config
+    from report_pipeline import analyze_reviews, write_report_files
+    from review_analyzer_core import ReviewAnalyzer
+    from stage_profiler import max_rss_mb
+
+    result = {'rows_requested': n_rows, 'input_file': os.path.relpath(input_path, REPO_DIR)}
+    output = sys.stdout if verbose else io.StringIO()
+    with tempfile.TemporaryDirectory() as work_dir, contextlib.redirect_stdout(output):
+        config = build_analysis_config(input_path, profile, category_mapping={'B0SYNTH001': '系列A', 'B0SYNTH002': '系列B'},
+                                       output_filepath=os.path.join(work_dir, 'processed_data.csv'),
+                                       report_output_path=os.path.join(work_dir, 'final_report.html'), use_caches=False)
+        config['profile_memory'] = trace_memory
+        start = time.perf_counter()
+        analyzer = ReviewAnalyzer(config=config, product_type=profile, n_jobs=n_jobs)
+        result['init_seconds'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        processed_df, dashboard_data = analyze_reviews(analyzer, progress=lambda message: None)
+        write_report_files(analyzer, dashboard_data, progress=lambda message: None)
+        result['app_flow_seconds'] = time.perf_counter() - start
+        result['rows'] = len(processed_df)
+        if analyzer.lean_memory and (analyzer.token_corpus is None or 'Processed_Text' in processed_df.columns):
+            raise RuntimeError("精简内存模式未生效：分析完成后应只以词元语料保存预处理文本，而不再常驻 Processed_Text 列。")
+
+        analyzer.run_comprehensive_feature_diagnostics()
+        analyzer.run_comprehensive_user_diagnostics()
+        report = analyzer.stage_report()
+        result['stages'] = analyzer.profiler.summary()
+        result['diagnostic_tasks'] = len(report['tasks'])
+        del analyzer, processed_df, dashboard_data
+
+        if streaming:
+            config = dict(config, output_filepath=os.path.join(work_dir, 'streaming_data.csv'))
+            stream_analyzer = ReviewAnalyzer(config=config, product_type=profile, n_jobs=n_jobs)
+            start = time.perf_counter()
+            stream_analyzer.run_streaming_analysis(classifications=DEFAULT_CLASSIFICATIONS)
+            result['streaming'] = {'wall_seconds': time.perf_counter() - start, 'stages': stream_analyzer.profiler.summary()}
+    result['peak_rss_mb'] = max_rss_mb()
+    return result
+
+
+def compare_results(baseline: Dict, current: Dict) -> str:
+    """
+    逐个数据规模、逐个阶段对比两次结果的墙钟耗时，返回可打印的文本表格（比值 < 1 表示变快）。
+    两次都以 --trace-memory 运行时，另外对比各阶段的内存峰值。
+    """
+    baseline_runs = {run['rows_requested']: run for run in baseline.get('runs', [])}
+    lines = [f"基准: {baseline['environment'].get('git_commit')} ({baseline['environment'].get('timestamp')})  →  "
+             f"当前: {current['environment'].get('git_commit')} ({current['environment'].get('timestamp')})"]
+    if baseline.get('settings', {}).get('trace_memory', False) != current.get('settings', {}).get('trace_memory', False):
+        lines.append("注意: 两次结果只有一次开启了 --trace-memory，跟踪内存分配会拖慢分析，耗时不宜直接比较。")
+    for run in current.get('runs', []):
+        base_run = baseline_runs.get(run['rows_requested'])
+        if base_run is None:
+            continue
+        lines.append(f"\n== {run['rows_requested']} 行 ==")
+        rows = [('app_flow', base_run.get('app_flow_seconds'), run.get('app_flow_seconds')),
+                ('peak_rss_mb', base_run.get('peak_rss_mb'), run.get('peak_rss_mb'))]
+        base_stages = {stage['stage']: stage for stage in base_run.get('stages', [])}
+        rows += [(stage['stage'], base_stages.get(stage['stage'], {}).get('wall_seconds'), stage['wall_seconds'])
+                 for stage in run.get('stages', [])]
+        # 阶段内存峰值只在两次结果都以 --trace-memory 运行时才可比较
+        rows += [(f"{stage['stage']} (peak MB)", base_stages[stage['stage']].get('peak_memory_delta_mb'), stage['peak_memory_delta_mb'])
+                 for stage in run.get('stages', []) if stage.get('peak_memory_delta_mb') is not None
+                 and base_stages.get(stage['stage'], {}).get('peak_memory_delta_mb') is not None]
+        if 'streaming' in run and 'streaming' in base_run:
+            rows.append(('streaming', base_run['streaming']['wall_seconds'], run['streaming']['wall_seconds']))
+        for name, before, after in rows:
+            ratio = f"{after / before:6.2f}x" if before and after is not None else '      -'
+            before_text = f"{before:10.3f}" if before is not None else ' ' * 10
+            after_text = f"{after:10.3f}" if after is not None else ' ' * 10
+            lines.append(f"  {name:<52}{before_text}{after_text}  {ratio}")
+    return '\n'.join(lines)
+
+
+def _print_run(run: Dict):
+    print(f"\n== {run['rows']} 行（{run['input_file']}）: 完整流程 {run['app_flow_seconds']:.2f} 秒，"
+          f"初始化 {run['init_seconds']:.2f} 秒，峰值内存 {run['peak_rss_mb'] or 0:.0f} MB ==")
+    for stage in run['stages']:
+        # 进程内存新高：该阶段把进程常驻内存的历史最高点推高了多少（不是阶段自身的峰值）；阶段峰值需 --trace-memory
+        peak = stage.get('peak_memory_delta_mb')
+        peak_text = f"  阶段峰值 {peak:7.1f} MB" if peak is not None else ''
+        print(f"  {'  ' * stage['depth']}{stage['stage']:<40}{stage['wall_seconds']:9.3f} 秒  CPU {stage['cpu_seconds']:9.3f} 秒"
+              f"{peak_text}  进程内存新高 +{stage.get('new_high_water_mark_mb') or 0:7.1f} MB  ×{stage['calls']}")
+    if 'streaming' in run:
+        print(f"  {'run_streaming_analysis':<40}{run['streaming']['wall_seconds']:9.3f} 秒")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="在合成评论数据上运行性能基准，并把结果保存为 JSON。")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="数据规模（行数）")
+    parser.add_argument('--seed', type=int, default=0, help="合成数据的随机种子")
+    parser.add_argument('--format', dest='input_format', default='auto', choices=['auto', 'xlsx', 'csv', 'parquet'],
+                        help=f"合成数据的文件格式；auto 为不超过 {MAX_AUTO_EXCEL_ROWS} 行时用 Excel，否则用 Parquet")
+    parser.add_argument('--profile', default=DEFAULT_PROFILE, help="使用的产品画像")
+    parser.add_argument('--n-jobs', type=int, default=1, help="NLP 预处理进程数")
+    parser.add_argument('--no-streaming', action='store_true', help="跳过 run_streaming_analysis")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="用 tracemalloc 记录各阶段的内存峰值（会明显拖慢分析，耗时不宜与未开启时比较）")
+    parser.add_argument('--output', help="结果 JSON 路径，默认写入 benchmarks/results/")
+    parser.add_argument('--compare', help="与之前的结果 JSON 对比")
+    parser.add_argument('--verbose', action='store_true', help="显示分析器自身的输出")
+    args = parser.parse_args(argv)
+
+    missing = check_offline_resources()
+    if missing:
+        sys.exit(f"缺少 NLTK 数据包: {', '.join(missing)}。基准测试离线运行，请先在联网环境中执行 nltk.download 安装。")
+
+    from benchmarks.synthetic_reviews import write_corpus
+
+    results = {'environment': environment_info(), 'settings': {'seed': args.seed, 'format': args.input_format,
+                                                                'profile': args.profile, 'n_jobs': args.n_jobs,
+                                                                'trace_memory': args.trace_memory},
+               'runs': []}
+    for n_rows in args.sizes:
+        path = corpus_path(n_rows, args.seed, args.input_format)
+        start = time.perf_counter()
+        write_corpus(n_rows, path, args.seed)
+        print(f"合成数据 {path}（{time.perf_counter() - start:.1f} 秒）")
+        # 每个规模在独立的新进程中运行，峰值内存与缓存状态互不影响
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            run = executor.submit(benchmark_size, n_rows, path, args.profile, args.n_jobs,
+                                  not args.no_streaming, args.verbose, args.trace_memory).result()
+        results['runs'].append(run)
+        _print_run(run)
+
+    output_path = args.output or os.path.join(
+        RESULTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{results['environment']['git_commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2, default=str)
+    print(f"\n✅ 基准结果已保存: {output_path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print("\n" + compare_results(json.load(f), results))
+
+
+if __name__ == '__main__':
+    main()
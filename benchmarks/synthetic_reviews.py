@@ -0,0 +1,101 @@
+# benchmarks/synthetic_reviews.py (版本 1.0 - 由真实关键词词库生成可复现的合成评论数据)
+
+import os
+import random
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analysis_config import BASE_FEATURE_KEYWORDS, BASE_CLASSIFICATION_RULES
+
+# 评分分布（参照电商评论的常见形态：五星居多，一星次之）
+RATING_WEIGHTS = {5: 0.58, 4: 0.16, 3: 0.08, 2: 0.06, 1: 0.12}
+# 每条评论提及的特征关键词个数的泊松均值，以及带有用户画像线索（角色/性别/年龄/用途/动机关键词）的概率
+FEATURE_MENTIONS_PER_REVIEW = 0.9
+CLASSIFICATION_CUE_RATE = 0.3
+ASINS = ['B0SYNTH001', 'B0SYNTH002', 'B0SYNTH003', 'B0SYNTH004', 'B0SYNTH005', 'B0SYNTH006']
+DATE_RANGE = ('2021-01-01', '2024-12-31')
+
+_FILLER = {
+    'positive': ["Love these pens.", "Great product overall.", "Would definitely buy again.", "Really happy with this purchase.",
+                 "The colors are beautiful.", "Works perfectly for my projects.", "Excellent value for the money."],
+    'neutral': ["They arrived on Tuesday.", "I bought the set last month.", "It is a set of markers.", "Used them for a week so far.",
+                "The box had a lot of pens in it."],
+    'negative': ["Not what I expected.", "Terrible experience overall.", "Very disappointed with this set.", "Would not recommend.",
+                 "The quality is poor.", "Returned it after a week."],
+}
+_FEATURE_TEMPLATES = ["I noticed {}.", "Honestly, {}.", "{}!", "What stood out: {}.", "In short, {}."]
+_CUE_TEMPLATES = ["As a {}, I use these a lot.", "Bought these for {}.", "I'm a {} and these help.", "Got them because of {}."]
+
+
+def _phrase_pools() -> Dict[str, List[str]]:
+    """按正面/负面/中性拆分特征关键词；子主题名以“正面-”“负面-”开头。"""
+    pools = {'positive': [], 'negative': [], 'neutral': []}
+    for sub_topics in BASE_FEATURE_KEYWORDS.values():
+        for sub_topic, phrases in sub_topics.items():
+            key = 'positive' if sub_topic.startswith('正面') else 'negative' if sub_topic.startswith('负面') else 'neutral'
+            pools[key].extend(phrases)
+    return pools
+
+
+def generate_reviews(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    生成 n_rows 条合成评论（Content / Rating / Asin / Date 四列），同一 seed 的结果完全相同。
+    评论由与评分相符的普通句子和嵌入其中的真实特征关键词、用户画像关键词组成：
+    高分评论更多提及正面子主题，低分评论更多提及负面子主题；日期逐年增多，约 1% 的评论缺少日期。
+    """
+    rng = np.random.default_rng(seed)
+    r = random.Random(seed)
+    pools = _phrase_pools()
+    cues = [phrase for rules in BASE_CLASSIFICATION_RULES.values() for phrases in rules.values() for phrase in phrases]
+
+    ratings = rng.choice(list(RATING_WEIGHTS), size=n_rows, p=list(RATING_WEIGHTS.values()))
+    mentions = rng.poisson(FEATURE_MENTIONS_PER_REVIEW, size=n_rows)
+    filler_counts = rng.integers(1, 5, size=n_rows)
+    has_cue = rng.random(n_rows) < CLASSIFICATION_CUE_RATE
+
+    contents = []
+    for rating, n_mentions, n_filler, cue in zip(ratings, mentions, filler_counts, has_cue):
+        tone = 'positive' if rating >= 4 else 'negative' if rating <= 2 else 'neutral'
+        # 提及的子主题与评分大体一致，但保留少量“好评中的抱怨 / 差评中的肯定”
+        positive_share = {'positive': 0.85, 'neutral': 0.5, 'negative': 0.15}[tone]
+        sentences = [r.choice(_FILLER[tone]) for _ in range(n_filler)]
+        for _ in range(n_mentions):
+            pool = pools['positive'] if r.random() < positive_share else pools['negative']
+            sentences.insert(r.randrange(len(sentences) + 1), r.choice(_FEATURE_TEMPLATES).format(r.choice(pool)))
+        if cue:
+            sentences.insert(0, r.choice(_CUE_TEMPLATES).format(r.choice(cues)))
+        contents.append(' '.join(sentences))
+
+    # 日期：评论量逐年增长（三角分布偏向近期）
+    start, end = (pd.Timestamp(d) for d in DATE_RANGE)
+    days = rng.triangular(0, (end - start).days, (end - start).days, size=n_rows).astype(int)
+    dates = pd.Series(start + pd.to_timedelta(days, unit='D'))
+    dates[rng.random(n_rows) < 0.01] = pd.NaT
+
+    return pd.DataFrame({
+        'Content': contents,
+        'Rating': ratings,
+        'Asin': rng.choice(ASINS, size=n_rows),
+        'Date': dates,
+    })
+
+
+def write_corpus(n_rows: int, path: str, seed: int = 0) -> str:
+    """生成并写出合成评论文件（按扩展名写为 Excel / CSV / Parquet）；文件已存在时直接复用。"""
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    df = generate_reviews(n_rows, seed)
+    extension = os.path.splitext(path)[1].lower()
+    # 先写临时文件再改名，中断的生成不会留下不完整的数据文件
+    tmp_path = f"{path}.tmp{extension}"
+    if extension == '.xlsx':
+        df.to_excel(tmp_path, index=False)
+    elif extension == '.csv':
+        df.to_csv(tmp_path, index=False)
+    else:
+        df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,267 @@
+# diagnostics_engine.py (版本 1.0 - 单次分组的分时段深度诊断引擎)
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def run_report_tasks(tasks: List[Callable[[], Dict]], max_workers: int = 1) -> List[Dict]:
+    """
+    【V10.8 报告调度器】并发执行一组彼此独立、只读共享数据的报告任务，结果顺序与任务顺序严格一致。
+    各任务只读取同一份 NumPy 数组（线程间天然共享，无需复制或序列化），NumPy 的计数/求和会释放 GIL。
+    max_workers <= 1 时按顺序串行执行。
+    """
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [task() for task in tasks]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = [executor.submit(task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+class DiagnosticBase:
+    """
+    【V10.7 诊断数据底座】
+    对一个已完成预计算的 DataFrame，一次性取出深度诊断所需的数值数组：
+    特征提及矩阵、特征情感矩阵、评分、以及“评论 × 子主题”命中矩阵。
+    各个细分群体只保存指向这些数组的行号，不再复制包含长文本列的 DataFrame。
+    """
+
+    def __init__(self, analyzer, frame: pd.DataFrame):
+        self.frame = frame
+        features = list(analyzer.config.get('feature_keywords', {}).keys())
+        self.features = [f for f in features if f'feature_{f}' in frame.columns]
+        self.feature_cols = [f'feature_{f}' for f in self.features]
+        self.mentions = frame[self.feature_cols].to_numpy()
+        self.sentiments = frame[[f'sentiment_{f}' for f in self.features]].to_numpy()
+        self.ratings = frame[analyzer.config['rating_column']].to_numpy()
+        self.hits = analyzer._hit_matrix_for(frame)
+        self._factorized = {}
+        self._lock = threading.Lock()
+
+    def factorized(self, column: str):
+        """按需对分类列做一次因子化编码（空值编码为 -1），供所有群体的取值计数复用（线程安全）。"""
+        with self._lock:
+            if column not in self._factorized:
+                self._factorized[column] = pd.factorize(self.frame[column])
+            return self._factorized[column]
+
+    def segment(self, positions: np.ndarray, total_size: Optional[int] = None) -> 'Segment':
+        return Segment(self, positions, len(self.frame) if total_size is None else total_size)
+
+
+class Segment:
+    """
+    【V10.9 群体视图】
+    一个细分群体：只持有底座数据中的行号（按原始顺序排列），不复制任何列；
+    取值计数、均值、子主题统计等都直接在所需的那一列/数组上按行号计算。
+    total_size 为计算“占总评论数比例”时所用的分母（例如所在时间段的评论数）。
+    """
+
+    def __init__(self, base: DiagnosticBase, positions: np.ndarray, total_size: int):
+        self.base = base
+        self.positions = positions
+        self.size = len(positions)
+        self.total_size = total_size
+
+    @classmethod
+    def from_mask(cls, base: DiagnosticBase, mask, total_size: Optional[int] = None) -> 'Segment':
+        """由与底座数据等长的布尔掩码（ndarray 或 Series）创建群体视图。"""
+        positions = np.flatnonzero(np.asarray(mask, dtype=bool))
+        return cls(base, positions, len(base.frame) if total_size is None else total_size)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def empty(self) -> bool:
+        return self.size == 0
+
+    def has_column(self, column: str) -> bool:
+        return column in self.base.frame.columns
+
+    def column_values(self, column: str) -> np.ndarray:
+        """只取出某一列中属于该群体的值。"""
+        return self.base.frame[column].to_numpy()[self.positions]
+
+    def mean(self, column: str) -> float:
+        return float(np.nanmean(self.column_values(column).astype(float))) if self.size else float('nan')
+
+    def value_counts(self, column: str) -> pd.Series:
+        """
+        与对群体 DataFrame 调用 value_counts() 的结果完全相同（含并列计数的先后顺序），
+        但只在整数编码上计数：各取值先按在群体中首次出现的顺序排列，再交给 pandas 按计数降序排序。
+        """
+        codes, uniques = self.base.factorized(column)
+        segment_codes = codes[self.positions]
+        segment_codes = segment_codes[segment_codes >= 0]
+        if len(segment_codes) == 0:
+            return pd.Series([], dtype=np.int64)
+        present, first_seen = np.unique(segment_codes, return_index=True)
+        present = present[np.argsort(first_seen, kind='stable')]
+        counts = np.bincount(segment_codes, minlength=len(uniques))[present]
+        return pd.Series(counts, index=uniques.take(present)).sort_values(ascending=False)
+
+    def feature_mention_rates(self) -> pd.Series:
+        """各特征在该群体中的提及率（与对群体 DataFrame 的特征列求均值相同）。"""
+        sums = self.base.mentions[self.positions].sum(axis=0, dtype=np.float64)
+        return pd.Series(sums / self.size, index=self.base.feature_cols)
+
+    def feature_sentiment_counts(self) -> Dict[str, tuple]:
+        """返回 {特征: (提及数, 正面数, 负面数)}。"""
+        mentions = self.base.mentions[self.positions].sum(axis=0)
+        sentiments = self.base.sentiments[self.positions]
+        positives = (sentiments == 1).sum(axis=0)
+        negatives = (sentiments == -1).sum(axis=0)
+        return {feature: (mentions[i], positives[i], negatives[i]) for i, feature in enumerate(self.base.features)}
+
+    def feature_correlation(self) -> pd.DataFrame:
+        return pd.DataFrame(self.base.mentions[self.positions], columns=self.base.feature_cols).corr()
+
+    def sorted_feature_pairs(self) -> List[tuple]:
+        """
+        返回 [(特征列1, 特征列2, 相关系数), ...]，顺序与 corr().unstack().sort_values(ascending=False) 相同，
+        但避免了对多级索引 Series 做 unstack/排序的开销。
+        """
+        corr_matrix = self.feature_correlation()
+        columns = corr_matrix.columns
+        n_cols = len(columns)
+        # unstack 后外层为列、内层为行，即按列优先展开
+        values = corr_matrix.to_numpy().ravel(order='F')
+        order = pd.Series(values).sort_values(ascending=False).index.to_numpy()
+        return [(columns[k // n_cols], columns[k % n_cols], values[k]) for k in order]
+
+    def sub_topic_counts(self) -> np.ndarray:
+        return self.base.hits[self.positions].sum(axis=0)
+
+    def rating_subset(self, min_rating: float = None, max_rating: float = None) -> 'Segment':
+        """按评分进一步筛选（如 >=4 的好评、<=3 的差评），返回新的子群体。"""
+        ratings = self.base.ratings[self.positions]
+        keep = np.ones(self.size, dtype=bool)
+        if min_rating is not None:
+            keep &= ratings >= min_rating
+        if max_rating is not None:
+            keep &= ratings <= max_rating
+        return Segment(self.base, self.positions[keep], self.total_size)
+
+
+class PeriodDiagnosticsEngine:
+    """
+    【V10.7 分时段诊断引擎】
+    取代“为全部时间、每一年、每一季度分别复制 DataFrame 并从头运行全部深度诊断”的循环。
+    先把每条评论展开为 (时间段, 细分群体, 评论行号) 的成员关系长表，只排序一次，
+    各 (时间段, 群体) 即为长表中连续的一段行号；随后直接在这些行号上计算所有计数、比例与子主题统计，
+    输出与逐时段循环完全相同的 drill_down_reports_by_period 结构。
+    """
+
+    def __init__(self, analyzer, frame: pd.DataFrame, min_period_size: int = 10, user_attribute: str = 'User_Role',
+                 max_workers: int = 1):
+        self.analyzer = analyzer
+        self.frame = frame
+        self.min_period_size = min_period_size
+        self.max_workers = max_workers
+        self.user_attribute = user_attribute
+        self.base = DiagnosticBase(analyzer, frame)
+
+    def _period_columns(self, period_keys: List[str]) -> List[np.ndarray]:
+        """为每条评论给出其所属的时间段编号：全部时间一列，年份与季度各一列（不属于任何时间段记为 -1）。"""
+        period_ids = {key: i for i, key in enumerate(period_keys)}
+        n_rows = len(self.frame)
+        columns = []
+        if '_ALL_' in period_ids:
+            columns.append(np.full(n_rows, period_ids['_ALL_'], dtype=np.int64))
+        if 'Year' in self.frame.columns:
+            years = self.frame['Year'].map(lambda y: period_ids.get(str(int(y)), -1) if pd.notna(y) else -1)
+            columns.append(years.to_numpy(dtype=np.int64))
+        if 'Quarter' in self.frame.columns:
+            quarters = self.frame['Quarter'].map(lambda q: period_ids.get(q, -1) if isinstance(q, str) and 'Q' in q else -1)
+            columns.append(quarters.to_numpy(dtype=np.int64))
+        return columns
+
+    def _segment_memberships(self):
+        """
+        返回 (评论行号, 群体编号) 两个数组，以及用户群体编号 → 取值 的映射。
+        特征群体编号为 2*特征序号(+1 表示负面)，用户群体编号排在所有特征群体之后。
+        """
+        n_features = len(self.base.features)
+        pos_rows, pos_features = np.nonzero((self.base.mentions == 1) & (self.base.sentiments == 1))
+        neg_rows, neg_features = np.nonzero((self.base.mentions == 1) & (self.base.sentiments == -1))
+
+        user_codes, user_values = pd.factorize(self.frame[self.user_attribute], use_na_sentinel=False)
+        # 取值为空的评论不会与任何群体取值相等（与 df[col] == value 的语义一致），不计入成员
+        valid_users = pd.notna(np.asarray(user_values, dtype=object))[user_codes]
+        user_rows = np.flatnonzero(valid_users)
+
+        rows = np.concatenate([pos_rows, neg_rows, user_rows])
+        segments = np.concatenate([
+            2 * pos_features, 2 * neg_features + 1, 2 * n_features + user_codes[user_rows]
+        ]).astype(np.int64)
+        return rows, segments, user_codes, list(user_values)
+
+    def run(self, time_periods: Dict[str, str]) -> Dict[str, List[Dict]]:
+        print("\n\n" + "#"*70 + "\n####  正在执行【单次分组的分时段深度诊断】...  ####\n" + "#"*70)
+        period_keys = list(time_periods.keys())
+        period_columns = self._period_columns(period_keys)
+        period_sizes = np.zeros(len(period_keys), dtype=np.int64)
+        for column in period_columns:
+            valid = column >= 0
+            period_sizes += np.bincount(column[valid], minlength=len(period_keys))
+
+        # 1. 一次性构建 (时间段, 群体, 行号) 长表并排序
+        rows, segments, user_codes, user_values = self._segment_memberships()
+        member_periods, member_segments, member_rows = [], [], []
+        for column in period_columns:
+            periods = column[rows]
+            valid = periods >= 0
+            member_periods.append(periods[valid])
+            member_segments.append(segments[valid])
+            member_rows.append(rows[valid])
+        member_periods = np.concatenate(member_periods) if member_periods else np.empty(0, dtype=np.int64)
+        member_segments = np.concatenate(member_segments) if member_segments else np.empty(0, dtype=np.int64)
+        member_rows = np.concatenate(member_rows) if member_rows else np.empty(0, dtype=np.int64)
+        order = np.lexsort((member_rows, member_segments, member_periods))
+        member_periods, member_segments, member_rows = member_periods[order], member_segments[order], member_rows[order]
+
+        # 2. 每个 (时间段, 群体) 对应排序后长表中的一段连续行号
+        boundaries = np.flatnonzero((np.diff(member_periods) != 0) | (np.diff(member_segments) != 0)) + 1
+        starts = np.concatenate([[0], boundaries]) if len(member_rows) else np.empty(0, dtype=np.int64)
+        ends = np.concatenate([boundaries, [len(member_rows)]]) if len(member_rows) else np.empty(0, dtype=np.int64)
+        groups = {(int(member_periods[s]), int(member_segments[s])): member_rows[s:e] for s, e in zip(starts, ends)}
+
+        # 3. 为每个时间段按固定顺序登记报告任务（顺序与逐时段循环一致），再统一调度执行
+        n_features = len(self.base.features)
+        empty = np.empty(0, dtype=np.int64)
+        profiler = self.analyzer.profiler  # 逐份报告记录耗时
+        tasks_by_period = {}
+        for period_id, period_key in enumerate(period_keys):
+            period_size = int(period_sizes[period_id])
+            if period_size < self.min_period_size: continue
+
+            tasks = []
+            for feature in self.analyzer.config.get('feature_keywords', {}).keys():
+                if feature not in self.base.features: continue
+                feature_id = self.base.features.index(feature)
+                for offset, sentiment in enumerate(('positive', 'negative')):
+                    positions = groups.get((period_id, 2 * feature_id + offset), empty)
+                    task = partial(self.analyzer._build_feature_drill_down, feature, sentiment, self.base.segment(positions, period_size))
+                    tasks.append(profiler.wrap(f'{period_key}/{feature}:{sentiment}', task, rows=len(positions)))
+
+            # 用户群体按其在该时间段中首次出现的顺序排列（与 df[col].unique() 一致）
+            period_mask = np.zeros(len(self.frame), dtype=bool)
+            for column in period_columns:
+                period_mask |= column == period_id
+            period_user_codes = pd.unique(user_codes[period_mask])
+            for code in period_user_codes:
+                positions = groups.get((period_id, 2 * n_features + int(code)), empty)
+                task = partial(self.analyzer._build_user_drill_down, user_values[code], self.base.segment(positions, period_size))
+                tasks.append(profiler.wrap(f'{period_key}/{self.user_attribute}:{user_values[code]}', task, rows=len(positions)))
+            tasks_by_period[period_key] = tasks
+
+        all_tasks = [task for tasks in tasks_by_period.values() for task in tasks]
+        all_reports = iter(run_report_tasks(all_tasks, self.max_workers))
+        reports_by_period = {period_key: [next(all_reports) for _ in tasks] for period_key, tasks in tasks_by_period.items()}
+        print(f"✅ 分时段深度诊断完成：共 {len(reports_by_period)} 个时间段，{len(all_tasks)} 份报告。")
+        return reports_by_period
@@ -0,0 +1,135 @@
+# keyword_matcher.py (版本 1.1 - 多模式关键词匹配引擎，支持按词元编号匹配)
+
+import re
+from typing import List, Dict, Tuple, FrozenSet
+
+# 原始评论的分词规则：与正则 \b 单词边界保持一致——连续的单词字符为一个词元，
+# 其余非空白字符（如 ' 与 -）各自独立成为一个词元。
+_RAW_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# 前缀树中用于保存“命中编号”的哨兵键（词元本身永远是字符串，不会与之冲突）
+_HITS = None
+
+
+class KeywordMatcher:
+    """
+    【V10.0 多模式匹配引擎】
+    在分析器初始化时一次性编译所有“特征关键词”与“分类规则”，构建基于词元的前缀树（Trie）自动机。
+    每条文本只需扫描一遍，即可同时得到全部命中的 (特征, 子主题) 与全部命中的分类类别，
+    从而取代在各个分析环节中反复拼接、编译、执行的 r'\\b(...)\\b' 正则表达式。
+    """
+
+    # 匹配规则（分词方式、大小写处理、全词匹配）的版本号；规则变化时递增，使增量库中依赖匹配结果的旧列作废
+    MATCHER_VERSION = 'trie-v1'
+
+    def __init__(self, feature_keywords: Dict, classification_rules: Dict = None):
+        self.feature_keywords = feature_keywords or {}
+        self.classification_rules = classification_rules or {}
+
+        # 1. 为所有 (特征, 子主题) 按配置顺序编号，并构建匹配“预处理文本”的前缀树
+        self.sub_topic_keys: List[Tuple[str, str]] = []
+        self._sub_topic_ids: Dict[Tuple[str, str], int] = {}
+        self._feature_sub_topic_ids: Dict[str, List[int]] = {}
+        self._sub_topic_trie: Dict = {}
+        for feature, sub_topics in self.feature_keywords.items():
+            ids = self._feature_sub_topic_ids.setdefault(feature, [])
+            for sub_topic, keywords in sub_topics.items():
+                key_id = len(self.sub_topic_keys)
+                self.sub_topic_keys.append((feature, sub_topic))
+                self._sub_topic_ids[(feature, sub_topic)] = key_id
+                ids.append(key_id)
+                for keyword in keywords:
+                    # 预处理文本已是空格分隔的小写词元
+                    self._insert(self._sub_topic_trie, keyword.lower().split(), key_id)
+
+        # 2. 为所有 (分类维度, 类别) 按配置顺序编号，并构建匹配“原始评论”的前缀树
+        self.category_keys: List[Tuple[str, str]] = []
+        self._dimension_category_ids: Dict[str, List[int]] = {}
+        self._category_trie: Dict = {}
+        for dimension, categories in self.classification_rules.items():
+            ids = self._dimension_category_ids.setdefault(dimension, [])
+            for category, keywords in categories.items():
+                key_id = len(self.category_keys)
+                self.category_keys.append((dimension, category))
+                ids.append(key_id)
+                for keyword in keywords:
+                    self._insert(self._category_trie, _RAW_TOKEN_PATTERN.findall(keyword.lower()), key_id)
+
+    @staticmethod
+    def _insert(trie: Dict, tokens: List[str], key_id: int):
+        """将一个关键词（词元序列）插入前缀树，并在终点记录其所属编号。"""
+        if not tokens:
+            return
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(_HITS, set()).add(key_id)
+
+    @staticmethod
+    def _scan(trie: Dict, tokens: List[str]) -> FrozenSet[int]:
+        """从每个词元位置出发沿前缀树前进，收集所有命中的编号（允许重叠匹配）。"""
+        hits = set()
+        n_tokens = len(tokens)
+        for start in range(n_tokens):
+            node = trie.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                found = node.get(_HITS)
+                if found:
+                    hits.update(found)
+                if position >= n_tokens:
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        return frozenset(hits)
+
+    # --- 扫描接口 ---
+    def scan_sub_topics(self, processed_text: str) -> FrozenSet[int]:
+        """扫描一条“预处理文本”，返回命中的全部子主题编号。"""
+        if not isinstance(processed_text, str) or not processed_text:
+            return frozenset()
+        return self._scan(self._sub_topic_trie, processed_text.split())
+
+    def sub_topic_trie_for(self, vocabulary_index: Dict[str, int]) -> Dict:
+        """
+        将子主题前缀树中的词元替换为词表编号，供 scan_token_ids 直接在词元编号上匹配。
+        含有词表外词元的关键词在该语料中不可能命中，翻译时直接剪除。
+        """
+        def translate(node: Dict) -> Dict:
+            translated = {}
+            for token, child in node.items():
+                if token is _HITS:
+                    translated[_HITS] = child
+                    continue
+                token_id = vocabulary_index.get(token)
+                if token_id is not None:
+                    translated[token_id] = translate(child)
+            return translated
+        return translate(self._sub_topic_trie)
+
+    def scan_token_ids(self, id_trie: Dict, token_ids) -> FrozenSet[int]:
+        """扫描一条以词元编号表示的预处理文本（id_trie 来自 sub_topic_trie_for），返回命中的全部子主题编号。"""
+        return self._scan(id_trie, list(token_ids))
+
+    def scan_categories(self, raw_text) -> FrozenSet[int]:
+        """扫描一条原始评论（不区分大小写），返回命中的全部分类类别编号。"""
+        return self._scan(self._category_trie, _RAW_TOKEN_PATTERN.findall(str(raw_text).lower()))
+
+    def scan_document(self, processed_text: str, raw_text) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+        """一次性扫描一条评论，同时返回 (子主题命中编号, 分类类别命中编号)。"""
+        return self.scan_sub_topics(processed_text), self.scan_categories(raw_text)
+
+    # --- 查询接口 ---
+    def sub_topic_ids(self, feature: str) -> List[int]:
+        """返回某个特征下全部子主题的编号（保持配置顺序）。"""
+        return self._feature_sub_topic_ids.get(feature, [])
+
+    def sub_topic_id(self, feature: str, sub_topic: str) -> int:
+        return self._sub_topic_ids[(feature, sub_topic)]
+
+    def classify(self, category_hits: FrozenSet[int], dimension: str, default_value: str) -> str:
+        """按配置顺序返回第一个命中的类别（“先匹配者优先”），均未命中时返回默认值。"""
+        for key_id in self._dimension_category_ids.get(dimension, []):
+            if key_id in category_hits:
+                return self.category_keys[key_id][1]
+        return default_value
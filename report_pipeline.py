@@ -0,0 +1,266 @@
+# report_pipeline.py (版本 1.1 - 与界面无关的报告生成流程：核心分析 → 分类 → 分时段诊断 → 仪表盘数据 → CSV/HTML；多文件批量生成)
+
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from analysis_config import DEFAULT_CLASSIFICATIONS, CACHE_SETTING_KEYS, REPORT_CACHE_DIR, REPORT_CACHE_MAX_BYTES
+from review_analyzer_core import ReviewAnalyzer
+from review_cache import ResultCache, fingerprint, hash_bytes
+
+# 批量报告未指定画像、配置中也没有记录时使用的画像（与 ReviewAnalyzer 的默认值相同：只使用基础词库）
+DEFAULT_PRODUCT_TYPE = "standard"
+
+
+def _format_crosstab_for_html(df: pd.DataFrame, index_name: str) -> Dict:
+    df_reset = df.reset_index()
+    for col in df_reset.columns:
+        if col != index_name: df_reset[col] = df_reset[col].map('{:.1f}%'.format)
+    return {"headers": df_reset.columns.tolist(), "rows": df_reset.values.tolist()}
+
+
+def _preference_crosstab(frame: pd.DataFrame, index_col: str) -> pd.DataFrame:
+    # 分类类型的交叉表按类别顺序排列；转回普通对象列，保持按标签排序的行列顺序
+    return pd.crosstab(index=frame[index_col].astype(object), columns=frame['Product_Category'].astype(object), normalize='index')
+
+
+def build_time_periods(frame: pd.DataFrame, date_col: str) -> Dict[str, str]:
+    """
+    生成“全部时间 + 每一年 + 每一季度”的时间维度（均按时间倒序），
+    并把日期列转为日期类型、把 Year / Quarter 列直接按索引写回 frame（无日期的评论为空值），不复制整表。
+    """
+    time_periods = {"_ALL_": "全部时间"}
+    if date_col in frame.columns:
+        frame[date_col] = pd.to_datetime(frame[date_col], errors='coerce')
+        dated = frame.loc[frame[date_col].notna(), date_col]
+        if not dated.empty:
+            years = dated.dt.year
+            quarters = dated.dt.to_period('Q').astype(str)
+            for year in sorted(years.unique(), reverse=True):
+                time_periods[str(year)] = f"{year}年 全年"
+            for quarter in sorted(quarters.unique(), reverse=True):
+                time_periods[quarter] = f"{quarter.replace('Q', '年 第')}季度"
+            frame['Year'] = years
+            frame['Quarter'] = quarters
+    return time_periods
+
+
+def analyze_reviews(analyzer, progress: Optional[Callable[[str], None]] = None) -> Tuple[pd.DataFrame, Dict]:
+    """
+    对已创建的分析器执行完整的报告计算流程（即 Streamlit 应用中的步骤 2~6），返回 (处理后的 DataFrame, 仪表盘数据)。
+    progress: 接收各步骤说明文字的回调（应用中为 status.write），默认打印到控制台。
+    核心分析失败时抛出 ValueError。
+    """
+    progress = progress or print
+    progress("步骤 2/8: 正在运行核心分析引擎...")
+    # 增量评论库在分类完成后一次写回
+    processed_df = analyzer.run_analysis(persist_store=False)
+
+    if processed_df is None:
+        raise ValueError("核心分析失败，未能生成DataFrame。请检查输入文件。")
+
+    # 执行所有分类
+    progress("步骤 3/8: 正在执行用户画像分类...")
+    analyzer.classify_all(DEFAULT_CLASSIFICATIONS)
+    # 核心分析与分类结果一次写入增量评论库（没有新结果时不重写）
+    analyzer.persist_review_store()
+    # 逐行计算已全部完成：压缩标记/得分列的数值类型，并把标签列转为分类类型
+    analyzer.compact_memory()
+
+    # 生成时间维度
+    progress("步骤 4/8: 正在生成时间维度...")
+    date_col = analyzer.config['date_column']
+    with analyzer.profiler.stage('build_time_periods', rows=len(processed_df)):
+        time_periods = build_time_periods(processed_df, date_col)
+
+    # 对全部时间、每一年、每一季度一次性执行深度诊断（评论数少于10条的时间段跳过）
+    progress("步骤 5/8: 正在执行深度诊断分析...")
+    drill_down_reports_by_period = analyzer.run_period_diagnostics(processed_df, time_periods, min_period_size=10)
+    analyzer.df = processed_df
+
+    # 宏观分析和准备最终数据包
+    progress("步骤 6/8: 正在准备仪表盘数据...")
+    feature_report = analyzer.generate_feature_analysis_report()
+
+    role_preference_percentage = _preference_crosstab(processed_df, 'User_Role') * 100
+    gender_preference_percentage = _preference_crosstab(processed_df, 'Gender') * 100
+    age_group_preference_percentage = _preference_crosstab(processed_df, 'Age_Group') * 100
+
+    rating_counts = processed_df['Rating'].value_counts().sort_index()
+    monthly_reviews = processed_df.set_index(date_col).resample('M').size() if date_col in processed_df.columns and not processed_df[date_col].isnull().all() else pd.Series()
+
+    dashboard_data = {
+        "totalReviews": len(processed_df),
+        "avgRating": f"{processed_df['Rating'].mean():.2f}",
+        "positiveRate": f"{(processed_df[processed_df['Rating'] >= 4].shape[0] / len(processed_df) * 100):.1f}%",
+        "ratingDistribution": {"labels": [f"{i}星" for i in rating_counts.index], "data": rating_counts.values.tolist()},
+        "reviewTrend": {"labels": [str(x.to_period('M')) for x in monthly_reviews.index], "data": monthly_reviews.values.tolist()} if not monthly_reviews.empty else {},
+        "sentimentAnalysis": {"labels": processed_df['Sentiment_Category'].value_counts().index.tolist(), "data": processed_df['Sentiment_Category'].value_counts().values.tolist()},
+        "userRoles": {"labels": processed_df['User_Role'].value_counts().index.tolist(), "data": processed_df['User_Role'].value_counts().values.tolist()},
+        "genderDistribution": {"labels": processed_df['Gender'].value_counts().index.tolist(), "data": processed_df['Gender'].value_counts().values.tolist()},
+        "ageGroupDistribution": {"labels": processed_df['Age_Group'].value_counts().index.tolist(), "data": processed_df['Age_Group'].value_counts().values.tolist()},
+        "usageAnalysis": {"labels": processed_df['Usage'].value_counts().index.tolist(), "data": processed_df['Usage'].value_counts().values.tolist()},
+        "purchaseMotivation": {"labels": processed_df['Motivation'].value_counts().index.tolist(), "data": processed_df['Motivation'].value_counts().values.tolist()},
+        "rolePreferences": _format_crosstab_for_html(role_preference_percentage, 'User_Role'),
+        "genderPreferences": _format_crosstab_for_html(gender_preference_percentage, 'Gender'),
+        "ageGroupPreferences": _format_crosstab_for_html(age_group_preference_percentage, 'Age_Group'),
+        "featureSentimentStats": feature_report.get('feature_sentiment_stats', {}),
+        "featureMentionRates": feature_report.get('rating_group_mention_rates', {}),
+        "highRatingWordCloudData": [{"text": word, "size": count} for word, count in feature_report.get('word_frequencies', {}).get('high_rating_words', [])],
+        "lowRatingWordCloudData": [{"text": word, "size": count} for word, count in feature_report.get('word_frequencies', {}).get('low_rating_words', [])],
+        "drillDownTimePeriods": time_periods,
+        "drillDownReports": drill_down_reports_by_period
+    }
+    return processed_df, dashboard_data
+
+
+def write_report_files(analyzer, dashboard_data: Dict, progress: Optional[Callable[[str], None]] = None):
+    """保存处理后的 CSV 并导出 HTML 报告（步骤 7~8），路径取自 output_filepath / report_output_path。"""
+    progress = progress or print
+    progress("步骤 7/8: 正在生成CSV数据文件...")
+    analyzer.save_results()
+    progress("步骤 8/8: 正在生成HTML报告文件...")
+    analyzer.export_to_html(dashboard_data)
+
+
+def result_cache_key(analyzer, product_type: str, file_hash: str) -> str:
+    """相同文件 + 相同(合并后)关键词 + 相同画像 + 相同分类规则 + 相同设置 → 同一个结果缓存键。"""
+    config = analyzer.config
+    return ResultCache.make_key(
+        file_hash=file_hash,
+        keywords_hash=fingerprint(config['feature_keywords']),
+        profile=product_type,
+        rules_hash=fingerprint(config['classification_rules']),
+        settings_hash=fingerprint({k: config[k] for k in CACHE_SETTING_KEYS}),
+    )
+
+
+def _report_paths(inputs: List[str], output_dir: str) -> List[Tuple[str, str, str]]:
+    """为每个输入文件生成 (输入, CSV 路径, HTML 路径)；不同目录下的同名文件依次加序号区分。"""
+    jobs, used = [], {}
+    for input_path in inputs:
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        used[stem] = used.get(stem, 0) + 1
+        if used[stem] > 1:
+            stem = f"{stem}_{used[stem]}"
+        jobs.append((input_path, os.path.join(output_dir, f"{stem}_processed_data.csv"), os.path.join(output_dir, f"{stem}_report.html")))
+    return jobs
+
+
+def _new_summary(input_path: str, output_filepath: str, report_output_path: str, error: Optional[str] = None) -> Dict:
+    return {'input': input_path, 'csv': output_filepath, 'html': report_output_path,
+            'rows': 0, 'seconds': 0.0, 'cached': False, 'error': error}
+
+
+def _failed_summaries(jobs: List[Tuple[str, str, str]], error: str) -> List[Dict]:
+    """分析器无法创建（如缺少 NLTK 数据包）时，为每个文件记录同一个错误，而不是中断整个批量任务。"""
+    print(f"❌ 报告生成失败: {error}")
+    return [_new_summary(*job, error=error) for job in jobs]
+
+
+def generate_report(analyzer, product_type: str, input_path: str, output_filepath: str, report_output_path: str,
+                    result_cache_dir: Optional[str] = REPORT_CACHE_DIR) -> Dict:
+    """
+    用一个（可能已处理过其他文件的）分析器为单个输入文件生成 CSV 与 HTML 报告。
+    出错时不抛出异常，而是在返回的摘要中记录 error，使批量任务中的其他文件不受影响。
+    返回 {'input', 'csv', 'html', 'rows', 'seconds', 'cached', 'error'}。
+    """
+    name = os.path.basename(input_path)
+    progress = lambda message: print(f"[{name}] {message}")
+    summary = _new_summary(input_path, output_filepath, report_output_path)
+    start = time.perf_counter()
+    analyzer.reset()
+    analyzer.config.update(input_filepath=input_path, output_filepath=output_filepath, report_output_path=report_output_path)
+    try:
+        result_cache, cache_key, cached_result = None, None, None
+        if result_cache_dir:
+            result_cache = ResultCache(result_cache_dir, REPORT_CACHE_MAX_BYTES)
+            with open(input_path, 'rb') as f:
+                cache_key = result_cache_key(analyzer, product_type, hash_bytes(f.read()))
+            cached_result = result_cache.load(cache_key)
+
+        if cached_result is not None:
+            progress("检测到相同文件与配置的历史分析结果，直接复用缓存...")
+            processed_df, dashboard_data = cached_result
+            analyzer.df = processed_df
+            summary['cached'] = True
+        else:
+            processed_df, dashboard_data = analyze_reviews(analyzer, progress=progress)
+            if result_cache is not None:
+                # 缓存导出用的完整列：命中缓存时没有词元语料，无法再还原精简内存模式释放的 Processed_Text
+                result_cache.store(cache_key, analyzer.export_frame(), dashboard_data)
+
+        write_report_files(analyzer, dashboard_data, progress=progress)
+        summary['rows'] = len(processed_df)
+    except Exception as e:
+        summary['error'] = f"{type(e).__name__}: {e}"
+        print(f"[{name}] ❌ 报告生成失败: {summary['error']}")
+    finally:
+        # 释放本文件的数据，只保留预热好的分析器
+        analyzer.reset()
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+# 批量模式下每个工作进程内常驻的、已预热的分析器（NLTK 资源、关键词匹配引擎、词形与极性缓存只初始化一次）
+_worker_analyzer = None
+# 工作进程中创建分析器失败时的错误信息；初始化函数抛出异常会使整个进程池失效，因此只记录下来，由各文件的摘要报告
+_worker_error = None
+
+
+def _init_report_worker(config: Dict, product_type: str):
+    global _worker_analyzer, _worker_error
+    try:
+        _worker_analyzer = ReviewAnalyzer(config=copy.deepcopy(config), product_type=product_type)
+    except Exception as e:
+        _worker_error = f"分析器初始化失败: {type(e).__name__}: {e}"
+
+
+def _generate_in_worker(product_type: str, job: Tuple[str, str, str], result_cache_dir: Optional[str]) -> Dict:
+    if _worker_analyzer is None:
+        return _new_summary(*job, error=_worker_error)
+    return generate_report(_worker_analyzer, product_type, *job, result_cache_dir=result_cache_dir)
+
+
+def build_report(config: Dict, inputs: List[str], product_type: Optional[str] = None, output_dir: str = '.', max_workers: int = 1,
+                 result_cache_dir: Optional[str] = REPORT_CACHE_DIR) -> List[Dict]:
+    """
+    【批量报告】不经过 Streamlit，为多个输入文件分别执行与 app.py 相同的全部步骤，
+    在 output_dir 中为每个文件写出 <文件名>_processed_data.csv 与 <文件名>_report.html。
+    - config: 分析配置（通常由 analysis_config.build_analysis_config 生成），其中的输入/输出路径会按文件替换；
+    - product_type: 产品画像；未指定时取 config['product_type']（build_analysis_config 会记下所用画像），
+      配置中也没有时使用 DEFAULT_PRODUCT_TYPE；
+    - max_workers > 1 时在进程池中并发处理多个文件，每个工作进程只创建一个分析器并在各文件之间复用；
+      NLP 预处理、深度诊断与词频统计在各工作进程内串行执行，避免进程池嵌套与线程超额。
+    - result_cache_dir: 结果缓存目录，为 None 时不读写结果缓存。
+    各工作进程共用增量评论库与极性缓存目录时，保存采用“后写入者为准”，只影响缓存复用率，不影响报告结果。
+    返回与 inputs 顺序一致的摘要列表（见 generate_report）。分析器无法创建或工作进程意外退出时不抛出异常，
+    受影响的文件在摘要中记录 error。
+    """
+    product_type = product_type or config.get('product_type') or DEFAULT_PRODUCT_TYPE
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = _report_paths(inputs, output_dir)
+    if max_workers <= 1 or len(jobs) <= 1:
+        try:
+            analyzer = ReviewAnalyzer(config=copy.deepcopy(config), product_type=product_type)
+        except Exception as e:
+            return _failed_summaries(jobs, f"分析器初始化失败: {type(e).__name__}: {e}")
+        return [generate_report(analyzer, product_type, *job, result_cache_dir=result_cache_dir) for job in jobs]
+    # 并发已在文件之间展开，各工作进程内的诊断与词频统计改为单线程，避免线程数超出 CPU 核心数
+    config = dict(config, diagnostic_workers=1, frequency_workers=1)
+    summaries = []
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs)), initializer=_init_report_worker,
+                             initargs=(config, product_type)) as executor:
+        futures = [executor.submit(_generate_in_worker, product_type, job, result_cache_dir) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                summaries.append(future.result())
+            except BrokenProcessPool as e:
+                # 工作进程意外退出（如内存不足被系统终止）：进程池随之失效，尚未完成的文件均记录为失败
+                summaries.append(_new_summary(*job, error=f"工作进程异常退出: {type(e).__name__}: {e}"))
+    return summaries
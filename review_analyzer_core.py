@@ -1,19 +1,45 @@
 
 # review_analyzer_core.py (版本 2.0 - 适配“基础+覆写”逻辑)
 
-import nltk
 import pandas as pd
 import numpy as np
-from textblob import TextBlob
 from typing import List, Dict, Any
 import json
 import re
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.stem import WordNetLemmatizer
-from collections import Counter
 from collections.abc import Mapping
 import copy
+from functools import partial
+from keyword_matcher import KeywordMatcher
+from token_corpus import TokenCorpus
+from word_frequency import FrequencyCounter, corpus_frequencies
+from review_cache import ReviewStore, PolarityCache, fingerprint, DEFAULT_POLARITY_CACHE_SIZE, DEFAULT_REVIEW_STORE_SIZE
+from review_io import (
+    iter_review_chunks, read_reviews, read_reviews_with_columns, detect_input_format,
+    DEFAULT_STREAM_CHUNK_SIZE, DEFAULT_CONVERSION_MAX_BYTES,
+)
+from streaming_report import StreamingReportAccumulator
+from diagnostics_engine import DiagnosticBase, Segment, PeriodDiagnosticsEngine, run_report_tasks
+from stage_profiler import StageProfiler, profiled_stage
+from text_processing import (
+    ParallelTextMapper, get_normalizer, preprocess_chunk, phrase_chunk, split_sentences_chunk, polarity_chunk,
+    DEFAULT_LEMMA_CACHE_SIZE, POLARITY_SCORER_VERSION
+)
+
+class AnalyzerResources:
+    """
+    【V11.4 可共享的分析器资源】
+    只取决于画像与规则配置、与具体评论数据无关的组件：合并后的关键词词库、编译好的关键词匹配引擎、
+    文本规范化组件（NLTK 资源已检查并加载）以及极性缓存。
+    这些组件在分析过程中只读（极性缓存内部加锁），可由多个分析器在多个线程中同时使用，
+    例如 Streamlit 应用中的所有会话共享同一份资源。通过 ReviewAnalyzer.build_resources 构建。
+    """
+
+    def __init__(self, feature_keywords: Dict, matcher: KeywordMatcher, normalizer, polarity_cache: PolarityCache):
+        self.feature_keywords = feature_keywords
+        self.matcher = matcher
+        self.normalizer = normalizer
+        self.polarity_cache = polarity_cache
+
 
 class ReviewAnalyzer:
     """
@@ -21,14 +47,61 @@ class ReviewAnalyzer:
     它封装了完整的分析流程，通过配置驱动，易于扩展和复用。 (V6.1 引擎)
     """
 
-    def __init__(self, config: Dict, product_type: str = "standard"):
+    # 文本预处理与整体情感算法的版本号；算法变化时递增，使增量库中的旧文本结果作废
+    TEXT_PIPELINE_VERSION = 'text-v1'
+    # compact_memory 转为分类类型的低基数标签列
+    CATEGORICAL_COLUMNS = ['User_Role', 'Gender', 'Age_Group', 'Usage', 'Motivation', 'Product_Category', 'Sentiment_Category']
+
+    def __init__(self, config: Dict, product_type: str = "standard", n_jobs: int = 1, resources: 'AnalyzerResources' = None):
         """
         【V9.1 基础+覆写版】
         初始化分析器。此版本专门设计用于处理“基础”关键词和特定产品画像的“覆写”规则。
+        - n_jobs: NLP预处理（分词、分句、TextBlob情感）使用的进程数；1为串行，-1为使用全部CPU核心。
+        - config['diagnostic_workers']: 深度诊断报告并发执行的线程数（默认1，即串行）。
+        - config['polarity_cache_size'] / config['polarity_cache_path']: 极性缓存的条目上限与持久化目录（不指定目录时只在本次分析内有效）。
+        - config['lean_memory']: 精简内存模式；不常驻小写内容列 Content_Clean（按需临时生成），
+          分析完成后预处理文本只以词元编号语料（self.token_corpus）保存。导出的 CSV 由 export_frame() 补回这些列，与普通模式相同。
+        - config['word_cloud_ngram_range'] / config['word_cloud_top_k']: 词云统计的短语长度范围（默认只统计单词；短语逐句统计并保留停用词）与保留条目数（默认全部）；
+          config['frequency_workers']: 词频分块统计的线程数（默认1）。
+        - config['profile_memory']: 用 tracemalloc 记录各阶段自身的内存峰值 peak_memory_delta_mb（会拖慢分析；关闭时只记录进程内存高水位的增量）；
+          各阶段的耗时、CPU 时间、峰值内存增量与行数见 stage_report()。
+        - resources: 由 build_resources 预先构建、可在多个分析器之间共享的资源（合并后的词库、匹配引擎、NLP 组件、极性缓存）；
+          提供时跳过词库合并、匹配引擎编译与 NLTK 资源检查，创建分析器几乎没有开销。
         """
         self.config = config
         self.df = None
+        self.profiler = StageProfiler(trace_memory=self.config.get('profile_memory', False))
         self.product_type = product_type
+        lemma_cache_size = self.config.get('lemma_cache_size', DEFAULT_LEMMA_CACHE_SIZE)
+        self._text_mapper = ParallelTextMapper(n_jobs=n_jobs, lemma_cache_size=lemma_cache_size)
+        self.n_jobs = self._text_mapper.n_jobs
+        self.diagnostic_workers = self.config.get('diagnostic_workers', 1)
+        self.lean_memory = self.config.get('lean_memory', False)
+        self._hit_matrix = None      # 评论 × 子主题 的布尔命中矩阵
+        self._feature_matrix = None  # 评论 × 特征 的布尔提及矩阵
+        self._hit_index = None       # 命中矩阵行号 ↔ DataFrame 索引
+        self._category_hits = None
+        self._overall_mention_rates = None  # 全体评论中各特征的提及率（特征提升度的基准）
+        self._full_df = None                # 核心分析完成时的全时段 DataFrame（引用，不复制）
+        self.token_corpus = None            # 预处理文本的词元编号语料（词表 + CSR 数组）
+        self._phrase_corpus = None          # 词云短语统计用的短语文本语料（按需构建）
+        self._processed_text_position = None  # 精简内存模式释放 Processed_Text 前该列的位置（导出时按此补回）
+        self._input_column_names = None  # 输入数据的全部列名（按文件中的顺序）
+        self._passthrough_columns = None # 分析用不到、读取时未载入的输入列（导出时补回）
+        self._passthrough = None         # 按需补读的上述列
+        self._review_store = None        # 增量模式下的评论派生结果库
+        self._review_fingerprints = None
+        self._diagnostic_data = None     # 深度诊断使用的数值数组底座
+
+        if resources is not None:
+            print(f"正在为【{self.product_type}】产品创建分析器（复用已加载的词库、匹配引擎与NLP资源）...")
+            # 词库按分析器各自复制一份：共享资源被多个会话同时使用，任何一个分析器修改自己的配置都不应影响其他会话
+            self.config['feature_keywords'] = copy.deepcopy(resources.feature_keywords)
+            self.matcher = resources.matcher
+            self.normalizer = resources.normalizer
+            self._polarity_cache = resources.polarity_cache
+            self.resources = resources
+            return
 
         print(f"正在为【{self.product_type}】产品创建一个专属分析器...")
 
@@ -42,8 +115,34 @@ class ReviewAnalyzer:
         self.config['feature_keywords'] = final_keywords
         print("✅ 专属关键词词库已生成并注入配置！后续所有分析将使用此定制规则。")
 
-        # 4. 执行NLTK资源初始化
+        # 4. 将最终词库与分类规则一次性编译为多模式匹配引擎，供所有分析环节共享
+        self.matcher = KeywordMatcher(final_keywords, self.config.get('classification_rules', {}))
+
+        # 5. 执行NLTK资源初始化，并一次性加载可复用的文本规范化组件（停用词表、词形还原器与词形缓存）
         self._initialize_nltk_resources()
+        self.normalizer = get_normalizer(lemma_cache_size)
+        self._polarity_cache = PolarityCache(
+            self.config.get('polarity_cache_size', DEFAULT_POLARITY_CACHE_SIZE),
+            self.config.get('polarity_cache_path'), POLARITY_SCORER_VERSION
+        )
+        self.resources = AnalyzerResources(final_keywords, self.matcher, self.normalizer, self._polarity_cache)
+
+    @staticmethod
+    def resources_key(config: Dict, product_type: str) -> str:
+        """
+        共享资源的指纹：画像、基础词库、全部画像覆写规则、分类规则以及词形/极性缓存设置都相同的配置，
+        可以共用同一份 AnalyzerResources。
+        """
+        return fingerprint([
+            product_type, config.get('base_keywords', {}), config.get('profiles', {}), config.get('classification_rules', {}),
+            config.get('lemma_cache_size', DEFAULT_LEMMA_CACHE_SIZE),
+            config.get('polarity_cache_size', DEFAULT_POLARITY_CACHE_SIZE), config.get('polarity_cache_path'),
+        ])
+
+    @classmethod
+    def build_resources(cls, config: Dict, product_type: str = "standard") -> 'AnalyzerResources':
+        """构建一份可共享的分析器资源（不修改传入的 config）。"""
+        return cls(dict(config), product_type).resources
 
     def _load_all_keywords(self):
         """
@@ -93,6 +192,8 @@ class ReviewAnalyzer:
 
     def _initialize_nltk_resources(self):
         """一次性检查并下载所有需要的NLTK数据包。"""
+        import nltk  # 延迟导入：只读取缓存结果或复用共享资源时不必加载 NLTK
+
         print("正在检查NLTK资源...")
         required_packages = {'tokenizers/punkt': 'punkt', 'corpora/stopwords': 'stopwords', 'corpora/wordnet': 'wordnet'}
         for path, package_id in required_packages.items():
@@ -105,19 +206,124 @@ class ReviewAnalyzer:
 
     def _preprocess_text(self, text: str) -> str:
         """执行完整的文本预处理：小写、去特殊字符、分词、去停用词、词形还原。"""
-        if not isinstance(text, str): return ""
-        text = text.lower()
-        text = re.sub(r'[^a-zA-Z\s]', ' ', text)
-        tokens = word_tokenize(text)
-        stop_words = set(stopwords.words('english'))
-        lemmatizer = WordNetLemmatizer()
-        lemmatized_tokens = [
-            lemmatizer.lemmatize(word) for word in tokens
-            if word not in stop_words and len(word) > 2
+        return self.normalizer.normalize(text)
+
+    def lemma_cache_info(self) -> Dict[str, Any]:
+        """返回词形还原缓存的命中/未命中统计（并行模式下仅统计主进程内的调用）。"""
+        return self.normalizer.cache_info()
+
+    def _index_keyword_hits(self):
+        """
+        【V10.1 命中矩阵索引】对当前数据集的每条评论只扫描一次：
+        - 子主题命中存为“评论 × 子主题”布尔矩阵，另按特征归并出“评论 × 特征”提及矩阵；
+        - 分类类别命中按评论缓存，供所有分类维度复用。
+        之后“哪些评论提及了子主题X”只需对矩阵的列做掩码求和，无需再扫描文本。
+        """
+        content_col = self.config['content_column']
+        # 预处理文本编码为词元编号语料，子主题匹配直接在编号上进行
+        self.token_corpus = TokenCorpus.from_texts(self.df['Processed_Text'], self.df.index)
+        id_trie = self.matcher.sub_topic_trie_for(self.token_corpus.vocabulary_index)
+        scanned = [
+            (self.matcher.scan_token_ids(id_trie, self.token_corpus.row_ids(position).tolist()), self.matcher.scan_categories(raw))
+            for position, raw in enumerate(self.df[content_col])
         ]
-        return ' '.join(lemmatized_tokens)
+        self._hit_matrix = self._build_hit_matrix([hits[0] for hits in scanned])
+        self._feature_matrix = self._build_feature_matrix(self._hit_matrix)
+        self._hit_index = self.df.index
+        self._overall_mention_rates = pd.Series(
+            self._feature_matrix.mean(axis=0), index=[f'feature_{f}' for f in self.config.get('feature_keywords', {}).keys()]
+        )
+        self._diagnostic_data = None
+        self._category_hits = pd.Series([hits[1] for hits in scanned], index=self.df.index, dtype=object)
+
+    def _build_hit_matrix(self, sub_topic_hits) -> np.ndarray:
+        """将每条评论的子主题命中编号集合转换为“评论 × 子主题”布尔矩阵。"""
+        sub_topic_hits = list(sub_topic_hits)
+        matrix = np.zeros((len(sub_topic_hits), len(self.matcher.sub_topic_keys)), dtype=bool)
+        lengths = [len(hits) for hits in sub_topic_hits]
+        if sum(lengths) > 0:
+            rows = np.repeat(np.arange(len(sub_topic_hits)), lengths)
+            cols = np.fromiter((key_id for hits in sub_topic_hits for key_id in hits), dtype=np.intp, count=sum(lengths))
+            matrix[rows, cols] = True
+        return matrix
+
+    def _build_feature_matrix(self, hit_matrix: np.ndarray) -> np.ndarray:
+        """按特征归并子主题列：某特征下任一子主题命中，即视为提及该特征。"""
+        features = list(self.config.get('feature_keywords', {}).keys())
+        feature_matrix = np.zeros((hit_matrix.shape[0], len(features)), dtype=bool)
+        for position, feature in enumerate(features):
+            ids = self.matcher.sub_topic_ids(feature)
+            if ids:
+                feature_matrix[:, position] = hit_matrix[:, ids].any(axis=1)
+        return feature_matrix
+
+    @property
+    def hit_matrix_columns(self) -> List[str]:
+        """命中矩阵各列对应的 “特征 » 子主题” 名称。"""
+        return [f"{feature} » {sub_topic}" for feature, sub_topic in self.matcher.sub_topic_keys]
+
+    def _hit_rows_for(self, frame: pd.DataFrame):
+        """返回 frame 中各评论在命中矩阵中的行号；若有评论不在索引内则返回 None。"""
+        if self._hit_matrix is None or not self._hit_index.is_unique:
+            return None
+        rows = self._hit_index.get_indexer(frame.index)
+        return rows if (rows >= 0).all() else None
+
+    def _hit_matrix_for(self, frame: pd.DataFrame) -> np.ndarray:
+        """返回 frame 对应的“评论 × 子主题”命中矩阵，优先从预计算矩阵中按行取出。"""
+        rows = self._hit_rows_for(frame)
+        if rows is not None:
+            return self._hit_matrix[rows]
+        return self._build_hit_matrix(self._processed_texts(frame).map(self.matcher.scan_sub_topics))
+
+    def _processed_texts(self, frame: pd.DataFrame) -> pd.Series:
+        """返回 frame 的预处理文本：优先取现有列，精简内存模式下由词元语料还原。"""
+        if 'Processed_Text' in frame.columns:
+            return frame['Processed_Text']
+        positions = self.token_corpus.positions_of(frame.index) if self.token_corpus is not None else None
+        if positions is not None:
+            return pd.Series(self.token_corpus.texts(positions), index=frame.index, dtype=object)
+        return pd.Series(self._text_mapper.map(preprocess_chunk, frame[self.config['content_column']]), index=frame.index, dtype=object)
+
+    def _phrase_texts(self, frame: pd.DataFrame) -> pd.Series:
+        """返回 frame 中每条评论的短语文本（按句切分、保留停用词），供词云短语统计使用。"""
+        return pd.Series(self._text_mapper.map(phrase_chunk, frame[self.config['content_column']]), index=frame.index, dtype=object)
+
+    def _phrase_corpus_for(self, frame: pd.DataFrame) -> TokenCorpus:
+        """返回覆盖 frame 全部评论的短语文本语料；只在首次需要（或现有语料不覆盖这些评论）时构建。"""
+        if self._phrase_corpus is None or self._phrase_corpus.positions_of(frame.index) is None:
+            try:
+                self._phrase_corpus = TokenCorpus.from_texts(self._phrase_texts(frame), frame.index)
+            finally:
+                self._text_mapper.close()
+        return self._phrase_corpus
+
+    def _category_hits_for(self, frame: pd.DataFrame) -> pd.Series:
+        """返回 frame 中每条评论命中的分类类别编号集合，优先复用预计算的扫描结果。"""
+        if self._category_hits is not None and frame.index.isin(self._category_hits.index).all():
+            return self._category_hits.loc[frame.index]
+        return frame[self.config['content_column']].map(self.matcher.scan_categories)
 
+    def _count_sub_topic_hits(self, frame: pd.DataFrame) -> np.ndarray:
+        """统计 frame 中每个子主题被多少条评论提及（命中矩阵的列求和，按子主题编号索引）。"""
+        return self._hit_matrix_for(frame).sum(axis=0)
 
+
+    def _build_sentence_table(self, texts: pd.Series) -> pd.DataFrame:
+        """
+        将评论拆分为“句子表”：每行一个句子，列为 (review_id, sentence_idx, raw, processed)。
+        完全相同的句子只预处理一次。
+        """
+        sentences = pd.Series(self._text_mapper.map(split_sentences_chunk, texts), index=texts.index, dtype=object)
+        exploded = sentences.explode().dropna()
+        table = pd.DataFrame({'review_id': exploded.index, 'raw': exploded.to_numpy(dtype=object)})
+        table['sentence_idx'] = table.groupby('review_id', sort=False).cumcount()
+        unique_sentences = pd.unique(table['raw'])
+        processed = dict(zip(unique_sentences, self._text_mapper.map(preprocess_chunk, unique_sentences)))
+        table['processed'] = table['raw'].map(processed)
+        return table[['review_id', 'sentence_idx', 'raw', 'processed']]
+
+    @profiled_stage()
     def _precompute_feature_sentiments(self):
         """
         【V8.2 黄金最终版：“解耦”引擎】
@@ -134,73 +340,83 @@ class ReviewAnalyzer:
         rating_col = self.config['rating_column']
 
         if 'Processed_Text' not in self.df.columns:
-            self.df['Processed_Text'] = self.df[content_col].apply(self._preprocess_text)
+            self.df['Processed_Text'] = self._map_unseen('Processed_Text', partial(self._text_mapper.map, preprocess_chunk), self.df[content_col])
 
-        # --- 步骤一：矢量化、全词匹配的“特征提及”判断 ---
+        # --- 步骤一：多模式匹配引擎一次扫描，得到所有“特征提及” ---
         print(" - 步骤 1/2: 正在高效、精准地判断所有特征提及...")
-        for feature, sub_topics in feature_keywords_config.items():
-            all_keywords = [kw for kws in sub_topics.values() for kw in kws]
-            # 使用全词匹配 r'\b(word1|word2)\b'
-            keyword_pattern = r'\b(' + '|'.join(list(set([re.escape(kw) for kw in all_keywords]))) + r')\b'
-            self.df[f'feature_{feature}'] = self.df['Processed_Text'].str.contains(keyword_pattern, regex=True, na=False).astype(int)
+        self._index_keyword_hits()
+        for position, feature in enumerate(feature_keywords_config.keys()):
+            self.df[f'feature_{feature}'] = self._feature_matrix[:, position].astype(int)
 
         # --- 步骤二：逐句分析、精准“情感归因” ---
         print(" - 步骤 2/2: 正在对已提及的特征进行句子级情感归因...")
 
-        # 先初始化所有情感得分列
+        # 先初始化所有情感得分列；增量模式下，关键词定义未变的特征直接复用历史得分
+        pending_mentions = {}
         for feature in feature_keywords_config.keys():
-            self.df[f'sentiment_score_{feature}'] = 0.0
-
-        # 筛选出至少提及一个特征的评论，只对这些评论进行慢速的逐句分析
-        mention_cols = [f'feature_{f}' for f in feature_keywords_config.keys()]
-        reviews_with_mentions = self.df[self.df[mention_cols].sum(axis=1) > 0]
-
-        for index, row in reviews_with_mentions.iterrows():
-            review_text = row[content_col]
-            if not isinstance(review_text, str) or pd.isna(review_text):
-                continue
-
-            sentences = sent_tokenize(review_text)
-
-            for feature, sub_topics in feature_keywords_config.items():
-                # 只分析该条评论确实提及了的特征
-                if row[f'feature_{feature}'] == 1:
-                    feature_sentiments = []
-                    for sentence in sentences:
-                        processed_sentence = self._preprocess_text(sentence)
-                        sentence_polarity = 0
-                        strong_sentiment_found = False
-
-                        # 优先匹配情感化子主题
-                        for sub_topic, keywords in sub_topics.items():
-                            if not keywords: continue
-                            pattern = r'\b(' + '|'.join([re.escape(kw) for kw in keywords]) + r')\b'
-                            if re.search(pattern, processed_sentence, re.IGNORECASE):
-                                if sub_topic.startswith('正面'):
-                                    sentence_polarity = 1.0
-                                    strong_sentiment_found = True
-                                    break
-                                elif sub_topic.startswith('负面'):
-                                    sentence_polarity = -1.0
-                                    strong_sentiment_found = True
-                                    break
-
-                        # 如果没有强情感词，再对中性词句子进行情感分析
-                        if not strong_sentiment_found:
-                            for sub_topic, keywords in sub_topics.items():
-                                if sub_topic.startswith(('正面', '负面')): continue
-                                if not keywords: continue
-                                pattern = r'\b(' + '|'.join([re.escape(kw) for kw in keywords]) + r')\b'
-                                if re.search(pattern, processed_sentence, re.IGNORECASE):
-                                    sentence_polarity = TextBlob(sentence).sentiment.polarity
-                                    break
-
-                        if sentence_polarity != 0:
-                            feature_sentiments.append(sentence_polarity)
-
-                    if feature_sentiments:
-                        avg_sentiment = sum(feature_sentiments) / len(feature_sentiments)
-                        self.df.loc[index, f'sentiment_score_{feature}'] = avg_sentiment
+            score_col = f'sentiment_score_{feature}'
+            self.df[score_col] = 0.0
+            reusable = self._stored_group_mask(f'feature:{feature}')
+            if reusable.any():
+                stored_scores = self._review_store.lookup_column(self._review_fingerprints.reindex(self.df.index), score_col)
+                self.df.loc[reusable, score_col] = stored_scores[reusable].astype(float)
+            # 需要重新归因的 = 提及了该特征 且 没有可复用的历史得分
+            pending_mentions[feature] = (self.df[f'feature_{feature}'] == 1) & ~reusable
+
+        # 筛选出至少有一个特征待归因的评论，只对这些评论进行句子级分析
+        needs_attribution = pd.concat(pending_mentions.values(), axis=1).any(axis=1)
+        mentioned_texts = self.df.loc[needs_attribution, content_col]
+        mentioned_texts = mentioned_texts[mentioned_texts.map(lambda text: isinstance(text, str))]
+
+        # 2.1 一次性构建“句子表”，并将所有句子扫描为“句子 × 子主题”命中矩阵
+        # 句子表只在本方法内使用（局部变量），归因结束即随之释放
+        sentence_table = self._build_sentence_table(mentioned_texts)
+        sentence_hit_matrix = self._build_hit_matrix(sentence_table['processed'].map(self.matcher.scan_sub_topics))
+        review_ids = sentence_table['review_id'].to_numpy()
+
+        # 2.2 按特征矢量化地判定每个句子的情感极性
+        sentence_polarities = {}
+        needs_textblob = np.zeros(len(sentence_table), dtype=bool)
+        for feature, sub_topics in feature_keywords_config.items():
+            ids = self.matcher.sub_topic_ids(feature)
+            if not ids or not pending_mentions[feature].any(): continue
+            # 只分析该条评论确实提及了、且尚无历史结果的特征
+            feature_mentioned = pending_mentions[feature].reindex(review_ids).to_numpy(dtype=bool)
+            signs = np.array([1.0 if st.startswith('正面') else -1.0 if st.startswith('负面') else 0.0 for st in sub_topics.keys()])
+            block = sentence_hit_matrix[:, ids]
+
+            # 优先匹配情感化子主题：按配置顺序取第一个命中的“正面/负面”子主题
+            polar_block = block[:, signs != 0]
+            has_polar = polar_block.any(axis=1)
+            polarity = np.zeros(len(sentence_table))
+            if polar_block.shape[1] > 0:
+                polarity = np.where(has_polar, signs[signs != 0][polar_block.argmax(axis=1)], 0.0)
+
+            # 如果没有强情感词，但命中了中性子主题，则需要对该句子进行情感分析
+            neutral_only = block[:, signs == 0].any(axis=1) & ~has_polar & feature_mentioned
+            needs_textblob |= neutral_only
+            sentence_polarities[feature] = (polarity, neutral_only, feature_mentioned)
+
+        # 2.3 每个需要的句子只计算一次 TextBlob 极性（重复句子共享结果）
+        textblob_polarity = np.zeros(len(sentence_table))
+        if needs_textblob.any():
+            raw_sentences = sentence_table['raw'].to_numpy()[needs_textblob]
+            unique_sentences = pd.unique(raw_sentences)
+            unique_scores = dict(zip(unique_sentences, self._score_polarities(unique_sentences)))
+            textblob_polarity[needs_textblob] = [unique_scores[sentence] for sentence in raw_sentences]
+
+        # 2.4 汇总为长表 (review_id, feature, polarity)，用 groupby 求每条评论、每个特征的平均情感
+        long_frames = []
+        for feature, (polarity, neutral_only, feature_mentioned) in sentence_polarities.items():
+            polarity = np.where(neutral_only, textblob_polarity, polarity)
+            valid = feature_mentioned & (polarity != 0)
+            if valid.any():
+                long_frames.append(pd.DataFrame({'review_id': review_ids[valid], 'feature': feature, 'polarity': polarity[valid]}))
+        if long_frames:
+            mean_scores = pd.concat(long_frames, ignore_index=True).groupby(['review_id', 'feature'], sort=False)['polarity'].mean().unstack('feature')
+            for feature in mean_scores.columns:
+                scores = mean_scores[feature].dropna()
+                self.df.loc[scores.index, f'sentiment_score_{feature}'] = scores.to_numpy()
 
         # --- 最后一步：根据情感得分，生成最终的情感标签 (1, 0, -1) ---
         for feature in feature_keywords_config.keys():
@@ -210,43 +426,121 @@ class ReviewAnalyzer:
             choices = [1, -1]
             self.df[sentiment_col] = np.select(conditions, choices, default=0)
 
+        if not self.lean_memory:
+            # 普通模式常驻 Processed_Text 字符串列，词元语料只用于构建命中矩阵，不再重复保存一份；
+            # 精简内存模式则保留词元语料，分析完成后取代 Processed_Text 字符串列
+            self.token_corpus = None
         print("✅ 情感引擎预计算完成！")
 
 
+    def _input_columns(self) -> List[str]:
+        """读取输入时需要保留的列：配置中指定的内容/评分/型号/日期列，以及 extra_input_columns 中的附加列。"""
+        columns = [self.config['content_column'], self.config['rating_column'],
+                   self.config.get('model_column', 'Asin'), self.config.get('date_column', 'Date')]
+        return columns + [col for col in self.config.get('extra_input_columns', []) if col not in columns]
+
+    @profiled_stage()
     def _load_and_clean_data(self):
-        """内部方法：加载并执行基础数据清洗。"""
+        """
+        内部方法：加载并执行基础数据清洗。
+        输入可以是 Excel、CSV、Parquet 或 Arrow IPC（按扩展名或 config['input_format'] 判断），
+        并且只读取分析所需的列，其余输入列在导出时补回（见 export_frame）；
+        配置了 excel_conversion_dir 时，Excel 工作簿只解析一次，之后复用其 Parquet 副本（副本目录总大小不超过 excel_conversion_max_bytes）。
+        """
         try:
             filepath = self.config['input_filepath']
             print(f"正在从 '{filepath}' 加载数据...")
-            self.df = pd.read_excel(filepath)
-            content_col, rating_col = self.config['content_column'], self.config['rating_column']
-            self.df = self.df.dropna(subset=[content_col, rating_col])
-            self.df['Content_Clean'] = self.df[content_col].astype(str).str.lower()
-            self.df[rating_col] = pd.to_numeric(self.df[rating_col], errors='coerce')
-            self.df = self.df.dropna(subset=[rating_col])
+            input_format = detect_input_format(filepath, self.config.get('input_format'))
+            conversion_dir = self.config.get('excel_conversion_dir')
+            # 不经 Parquet 副本的 Excel 每次都要完整解析工作表：裁剪列省不下解析时间，导出时补读其余列反而要再解析一遍，因此读取全部列
+            columns = None if input_format == 'excel' and not conversion_dir else self._input_columns()
+            raw_df, self._input_column_names = read_reviews_with_columns(
+                filepath, input_format, columns, conversion_dir,
+                self.config.get('excel_conversion_max_bytes', DEFAULT_CONVERSION_MAX_BYTES)
+            )
+            self._passthrough_columns = [col for col in self._input_column_names if col not in raw_df.columns]
+            self._passthrough = None
+            self.df = self._clean_frame(raw_df)
             print("数据加载和基础清洗完成。")
             return True
         except FileNotFoundError:
             print(f"错误: 文件 '{self.config['input_filepath']}' 未找到。")
             return False
         except KeyError as e:
-            print(f"错误: 配置文件中的列名 {e} 在Excel文件中未找到。")
+            print(f"错误: 配置文件中的列名 {e} 在输入文件中未找到。")
             return False
 
+    def _clean_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """基础清洗：去除内容或评分缺失的行，生成小写内容列（精简内存模式下不生成），并将评分转为数值。"""
+        content_col, rating_col = self.config['content_column'], self.config['rating_column']
+        df = df.dropna(subset=[content_col, rating_col])
+        columns = {rating_col: pd.to_numeric(df[rating_col], errors='coerce')}
+        if not self.lean_memory:
+            columns['Content_Clean'] = df[content_col].astype(str).str.lower()
+        df = df.assign(**columns)
+        return df.dropna(subset=[rating_col])
+
+    def _clean_content(self) -> pd.Series:
+        """返回小写内容列；精简内存模式下不常驻于 DataFrame，而是按需临时生成。"""
+        if 'Content_Clean' in self.df.columns:
+            return self.df['Content_Clean']
+        return self.df[self.config['content_column']].astype(str).str.lower()
+
+    @profiled_stage()
     def analyze_sentiment(self):
         """对清洗后的内容进行情感分析。"""
         print("正在进行情感分析...")
-        self.df['Sentiment'] = self.df['Content_Clean'].apply(lambda text: TextBlob(text).sentiment.polarity)
+        self.df['Sentiment'] = self._map_unseen('Sentiment', self._score_polarities, self._clean_content())
         self.df['Sentiment_Category'] = pd.cut(self.df['Sentiment'], bins=self.config['sentiment_bins'], labels=self.config['sentiment_labels'])
         print("情感分析完成。")
 
+    def _score_polarities(self, texts) -> List[float]:
+        """经由极性缓存计算情感极性：只有缓存中没有的文本才交给进程池打分。"""
+        return self._polarity_cache.score(list(texts), partial(self._text_mapper.map, polarity_chunk))
+
+    def polarity_cache_info(self) -> Dict[str, Any]:
+        """返回极性缓存的命中统计，便于据此调整 polarity_cache_size。"""
+        return self._polarity_cache.cache_info()
+
+    def reset(self):
+        """
+        【V11.3 分析器复用】清空上一份数据的处理结果与阶段记录，
+        保留已编译的匹配引擎、NLP 组件（停用词表、词形缓存）、增量评论库与极性缓存，使同一个分析器可以接着处理下一份输入。
+        """
+        self.df = None
+        self._hit_matrix = self._feature_matrix = self._hit_index = self._category_hits = None
+        self._overall_mention_rates = None
+        self._full_df = None
+        self.token_corpus = self._phrase_corpus = None
+        self._processed_text_position = None
+        self._input_column_names = self._passthrough_columns = self._passthrough = None
+        self._review_fingerprints = None
+        self._diagnostic_data = None
+        self.profiler.reset()
+
+    def stage_report(self) -> Dict[str, List[Dict]]:
+        """
+        返回各阶段的性能记录：{'stages': [...], 'tasks': [...]}。
+        每条记录包含 stage、wall_seconds、cpu_seconds、peak_memory_delta_mb（仅 profile_memory 时）、new_high_water_mark_mb、rows；
+        stages 为按执行顺序（含嵌套深度 depth）的分析阶段，tasks 为逐份深度诊断报告。
+        """
+        return self.profiler.report()
+
+    def stage_report_json(self, **kwargs) -> str:
+        """以 JSON 字符串返回 stage_report()。"""
+        return self.profiler.to_json(**kwargs)
+
+    @profiled_stage()
     def extract_keywords(self):
         """根据配置的关键词列表提取关键词。"""
         print("正在提取关键词...")
+        if self.config['keywords']:
+            clean_content = self._clean_content()
         for keyword in self.config['keywords']:
-            self.df[f'has_{keyword}'] = self.df['Content_Clean'].str.contains(keyword, regex=False).astype(int)
+            self.df[f'has_{keyword}'] = clean_content.str.contains(keyword, regex=False).astype(int)
         print("关键词提取完成。")
 
+    @profiled_stage()
     def categorize_products(self):
         """根据ASIN进行产品分类。"""
         print("正在根据ASIN进行产品分类...")
@@ -258,35 +552,56 @@ class ReviewAnalyzer:
     # (请用此版本完整替换旧的 classify_by_rules 函数)
     def classify_by_rules(self, new_column_name: str, classification_key: str, default_value: str = "其他"):
         """
-        【V6.5 升级版】一个通用的、由配置驱动的分类方法。
-        - 使用正则表达式和单词边界(\b)实现全词匹配，避免子字符串误判。
+        【V10.0 匹配引擎版】一个通用的、由配置驱动的分类方法。
+        - 复用多模式匹配引擎的全词匹配结果（与单词边界\b语义一致），避免子字符串误判。
+        - 同一条评论的分类命中只扫描一次，多个分类维度共享。
+        需要同时生成多个分类维度时，请使用 classify_all。
         """
-        print(f"正在使用【全词匹配】模式进行 '{new_column_name}' 分类...")
-
-        rules = self.config.get('classification_rules', {}).get(classification_key, {})
-        if not rules:
-            print(f"警告: 在配置中未找到 '{classification_key}' 的分类规则。将所有条目设为默认值 '{default_value}'。")
+        self.classify_all([(new_column_name, classification_key, default_value)])
 
-        target_col = self.config['content_column']
-
-        # 【核心修改】为每个分类预编译一个高效的正则表达式
-        # 例如，'男性'的模式会变成 r'\b(man|men|boy|...)\b'
-        compiled_rules = {
-            category: re.compile(r'\b(' + '|'.join(keywords) + r')\b', re.IGNORECASE)
-            for category, keywords in rules.items()
-        }
+    @profiled_stage()
+    def classify_all(self, dimensions: List) -> pd.DataFrame:
+        """
+        【V10.7 多维度一次分类】
+        dimensions: [(新列名, 规则键, 默认值), ...]。
+        每条评论只扫描一次，得到其命中的全部类别；各维度按规则中类别的先后顺序“先命中者优先”。
+        评论的命中组合种类远少于评论条数（大多数评论什么也不命中），
+        因此对每种命中组合只判定一次所有维度，再按组合编号整列展开。
+        返回由各分类结果列组成的 DataFrame。
+        """
+        dimensions = [tuple(dimension) for dimension in dimensions]
+        print(f"正在使用【全词匹配】模式一次性进行 {len(dimensions)} 个维度的分类: {', '.join(d[0] for d in dimensions)}...")
+
+        pending = []
+        for new_column_name, classification_key, default_value in dimensions:
+            rules = self.config.get('classification_rules', {}).get(classification_key, {})
+            if not rules:
+                print(f"警告: 在配置中未找到 '{classification_key}' 的分类规则。将所有条目设为默认值 '{default_value}'。")
+
+            # 增量模式下，分类结果以“匹配规则版本 + 该维度规则 + 默认值”为指纹保存，规则不变的历史评论直接复用
+            stored = None
+            if self._review_store is not None:
+                group = f'classification:{new_column_name}'
+                self._review_store.ensure_group(group, fingerprint([KeywordMatcher.MATCHER_VERSION, rules, default_value]), [new_column_name])
+                stored = self._review_store.lookup_column(self._review_fingerprints.reindex(self.df.index), new_column_name)
+
+            if stored is not None and stored.notna().all():
+                self.df[new_column_name] = stored
+            else:
+                pending.append((new_column_name, classification_key, default_value, stored))
 
-        def classifier(text: str) -> str:
-            # 这里不再需要 .lower()，因为 re.IGNORECASE 会处理大小写
-            text = str(text)
-            for category, pattern in compiled_rules.items():
-                if pattern.search(text):
-                    return category
-            return default_value
+        if pending:
+            category_hits = self._category_hits_for(self.df)
+            codes, unique_hits = pd.factorize(category_hits)
+            for new_column_name, classification_key, default_value, stored in pending:
+                labels = np.array([self.matcher.classify(hits, classification_key, default_value) for hits in unique_hits], dtype=object)
+                classified = pd.Series(labels[codes], index=self.df.index)
+                self.df[new_column_name] = classified if stored is None else stored.fillna(classified)
 
-        self.df[new_column_name] = self.df[target_col].apply(classifier)
-        print(f"'{new_column_name}' 分类完成。")
+        print("多维度分类完成。")
+        return self.df[[dimension[0] for dimension in dimensions]]
 
+    @profiled_stage()
     def generate_feature_analysis_report(self) -> Dict:
         """生成一个关于产品特征的、包含四大部分的完整分析报告。"""
         print("\n正在生成产品优缺点综合分析报告...")
@@ -317,15 +632,30 @@ class ReviewAnalyzer:
             low_mentions = low_ratings_df[f'feature_{feature}'].sum()
             rating_group_mention_rates['low_ratings'][feature] = (low_mentions / len(low_ratings_df) * 100) if len(low_ratings_df) > 0 else 0
 
-        def extract_frequent_words(texts: pd.Series, min_frequency=5):
-            if texts.empty or texts.isnull().all(): return []
-            word_freq = Counter(texts.str.cat(sep=' ').split())
-            frequent_words = [(word, count) for word, count in word_freq.items() if count >= min_frequency]
-            return sorted(frequent_words, key=lambda x: x[1], reverse=True)
+        ngram_range = tuple(self.config.get('word_cloud_ngram_range', (1, 1)))
+        top_k = self.config.get('word_cloud_top_k')
+
+        stop_words = self.normalizer.stop_words
+        # 短语（如 "dried out"）取自保留停用词、按句切分的短语文本，全部评论只构建一次
+        phrase_corpus = self._phrase_corpus_for(self.df) if ngram_range[1] >= 2 else None
+
+        def extract_frequent_words(frame: pd.DataFrame, min_frequency=5):
+            phrase_positions = phrase_corpus.positions_of(frame.index) if phrase_corpus is not None else None
+            # 词元语料覆盖这些评论时，直接在词元编号上分块并行计数，无需拼接与重新切分文本
+            positions = self.token_corpus.positions_of(frame.index) if self.token_corpus is not None else None
+            if positions is not None:
+                return corpus_frequencies(self.token_corpus, positions, min_frequency, ngram_range, top_k,
+                                          max_workers=self.config.get('frequency_workers', 1),
+                                          phrase_corpus=phrase_corpus, phrase_positions=phrase_positions, stop_words=stop_words)
+            counter = FrequencyCounter(ngram_range, stop_words)
+            counter.update_texts(frame['Processed_Text'])
+            if phrase_corpus is not None:
+                counter.update_phrase_texts(phrase_corpus.texts(phrase_positions))
+            return counter.most_common(min_frequency, top_k)
 
         word_frequencies = {
-            'high_rating_words': extract_frequent_words(high_ratings_df.get('Processed_Text'), min_frequency=5),
-            'low_rating_words': extract_frequent_words(low_ratings_df.get('Processed_Text'), min_frequency=5)
+            'high_rating_words': extract_frequent_words(high_ratings_df, min_frequency=5),
+            'low_rating_words': extract_frequent_words(low_ratings_df, min_frequency=5)
         }
 
         print("✅ 产品优缺点报告生成完毕。")
@@ -335,14 +665,108 @@ class ReviewAnalyzer:
             'word_frequencies': word_frequencies
         }
 
-    def run_analysis(self):
-        """按顺序执行完整的核心分析流程。"""
+    def _open_review_store(self):
+        """
+        【V10.4 增量模式】若配置了 incremental_store_path，则为当前数据集的每条评论计算指纹，
+        并打开评论派生结果库。之后各NLP阶段只处理库中没有结果的评论。
+        库中最多保留 config['incremental_store_size'] 条评论，超出时淘汰最久未出现的评论。
+        """
+        store_path = self.config.get('incremental_store_path')
+        if not store_path:
+            self._review_store = None
+            self._review_fingerprints = None
+            return
+
+        # 同一个分析器接着处理下一份输入时，已打开的同一个库直接复用，不重复读盘
+        if self._review_store is None or self._review_store.store_dir != store_path:
+            self._review_store = ReviewStore(store_path, self.config.get('incremental_store_size', DEFAULT_REVIEW_STORE_SIZE))
+        self._review_fingerprints = ReviewStore.review_fingerprints(
+            self.df, self.config.get('model_column', 'Asin'), self.config.get('date_column', 'Date'), self.config['content_column']
+        )
+        self._review_store.ensure_group('text', self.TEXT_PIPELINE_VERSION, ['Processed_Text', 'Sentiment'])
+        reusable = int(self._stored_group_mask('text').sum())
+        print(f"增量模式: 共 {len(self.df)} 条评论，其中 {reusable} 条可复用历史结果，{len(self.df) - reusable} 条需要重新分析。")
+
+        # 每个特征按其合并后的关键词定义（保持子主题顺序）单独取指纹：
+        # 只修改了某一个特征的关键词时，仅该特征的提及与情感列需要重新计算。
+        # 提及与归因还依赖预处理、匹配规则与极性打分算法，它们的版本号一并纳入指纹
+        algorithm_versions = [self.TEXT_PIPELINE_VERSION, KeywordMatcher.MATCHER_VERSION, POLARITY_SCORER_VERSION]
+        changed_features = []
+        for feature, sub_topics in self.config.get('feature_keywords', {}).items():
+            group = f'feature:{feature}'
+            group_fingerprint = fingerprint(algorithm_versions + [list(sub_topics.items())])
+            if not self._review_store.ensure_group(group, group_fingerprint, [f'feature_{feature}', f'sentiment_score_{feature}', f'sentiment_{feature}']):
+                changed_features.append(feature)
+        if changed_features and reusable:
+            print(f"增量模式: 以下特征的关键词定义有变化或为新增，将重新计算: {', '.join(changed_features)}")
+
+    def _stored_group_mask(self, group: str) -> pd.Series:
+        """返回与 self.df 对齐的布尔掩码：哪些评论的某个列组可从增量库中直接复用。"""
+        if self._review_store is None:
+            return pd.Series(False, index=self.df.index)
+        return self._review_store.group_available(self._review_fingerprints.reindex(self.df.index), group)
+
+    def _map_unseen(self, column: str, compute, source: pd.Series):
+        """对增量库中已有 column 结果的评论直接复用，其余评论才交给 compute 批量计算。"""
+        stored = None
+        if self._review_store is not None:
+            stored = self._review_store.lookup_column(self._review_fingerprints.reindex(source.index), column)
+        if stored is None:
+            return compute(source)
+
+        values = stored.copy()
+        missing = np.flatnonzero(stored.isna().to_numpy())
+        if len(missing) > 0:
+            values.iloc[missing] = compute(source.iloc[missing])
+        return values.to_numpy()
+
+    def persist_review_store(self):
+        """
+        将当前数据集中所有受增量库管理的派生列（含分类结果）按评论指纹写回增量库，并保存到磁盘。
+        应在全部逐行结果都已生成后调用一次；没有新评论、也没有重新计算过的结果时不会重写库文件。
+        """
+        if self._review_store is None or self.df is None:
+            return
+        fingerprints = self._review_fingerprints.reindex(self.df.index).dropna()
+        frame = self.df.loc[fingerprints.index]
+        derived = {}
+        for col in self._review_store.tracked_columns():
+            if col in frame.columns:
+                derived[col] = frame[col]
+            elif col == 'Processed_Text':
+                # 精简内存模式已释放该列，由词元语料还原
+                derived[col] = self._processed_texts(frame)
+        self._review_store.update(fingerprints, pd.DataFrame(derived, index=frame.index))
+        self._review_store.save()
+
+    def run_analysis(self, persist_store: bool = True):
+        """
+        按顺序执行完整的核心分析流程。
+        persist_store=False 时不写回增量评论库：调用方在之后的逐行步骤（如 classify_all）完成后，自行调用一次 persist_review_store。
+        """
         if self._load_and_clean_data():
-            self.analyze_sentiment()
-            self.extract_keywords()
-            self.categorize_products()
-            self._precompute_feature_sentiments()
-            self.full_df = self.df.copy() # 创建一个完整的“数据快照”
+            self._open_review_store()
+            try:
+                self.analyze_sentiment()
+                self.extract_keywords()
+                self.categorize_products()
+                self._precompute_feature_sentiments()
+            finally:
+                # 释放NLP预处理使用的工作进程
+                self._text_mapper.close()
+            if persist_store:
+                self.persist_review_store()
+            self._polarity_cache.save()
+            if self.lean_memory and self.token_corpus is not None and 'Processed_Text' in self.df.columns:
+                # 预处理文本已以词元编号语料保存（写回增量库时也由语料还原）；释放字符串列
+                print(f"精简内存模式: 预处理文本改以词元编号语料保存（词表 {len(self.token_corpus.vocabulary)} 个词，{self.token_corpus.nbytes / 1024 ** 2:.1f} MB）。")
+                self._processed_text_position = self.df.columns.get_loc('Processed_Text')
+                del self.df['Processed_Text']
+            self._full_df = self.df
+            cache_info = self.lemma_cache_info()
+            print(f"词形还原缓存: 命中 {cache_info['hits']} 次, 未命中 {cache_info['misses']} 次 (命中率 {cache_info['hit_rate']:.1%})")
+            cache_info = self.polarity_cache_info()
+            print(f"极性缓存: 命中 {cache_info['hits']} 次, 未命中 {cache_info['misses']} 次 (命中率 {cache_info['hit_rate']:.1%})")
             print("\n✅ 核心分析流程全部完成！")
             return self.df
         else:
@@ -351,29 +775,215 @@ class ReviewAnalyzer:
 
 
 
+    def run_streaming_analysis(self, chunk_size: int = None, classifications: List = None,
+                               count_columns: List[str] = None) -> Dict:
+        """
+        【V10.5 流式分析】面向百万行级别的评论导出文件。
+        按数据块读取输入（Excel 使用 openpyxl 只读模式，CSV/Parquet/Arrow 使用分块读取器），
+        对每个数据块依次执行全部逐行阶段（情感、关键词、产品分类、特征情感预计算、规则分类），
+        随即把该块的计数累加进报告统计、逐行结果追加写入 output_filepath，然后释放该块。
+        峰值内存只取决于 chunk_size，而与数据总量无关。
+        流式模式不使用增量评论库（incremental_store_path 被忽略）：评论库整体常驻内存，逐块写回会使其随数据总量增长，
+        且每次写回都要复制整个库。极性缓存有条目上限，照常使用。
+        - classifications: [(新列名, 规则键, 默认值), ...]，对每个数据块执行的分类维度。
+        - count_columns: 需要统计取值分布的列，默认统计情感类别、产品系列与各分类结果列。
+        返回 {'rows', 'feature_report', 'distributions'}；出错时返回 None。
+        """
+        chunk_size = chunk_size or self.config.get('stream_chunk_size', DEFAULT_STREAM_CHUNK_SIZE)
+        classifications = list(classifications or [])
+        if count_columns is None:
+            count_columns = ['Sentiment_Category', 'Product_Category'] + [args[0] for args in classifications]
+        accumulator = StreamingReportAccumulator(self.config.get('feature_keywords', {}), count_columns,
+                                                 tuple(self.config.get('word_cloud_ngram_range', (1, 1))),
+                                                 self.config.get('word_cloud_top_k'), self.normalizer.stop_words)
+        output_path = self.config.get('output_filepath')
+        filepath = self.config['input_filepath']
+        print(f"正在以流式模式从 '{filepath}' 读取数据（每块 {chunk_size} 行）...")
+        self._review_store = None
+        self._review_fingerprints = None
+        if self.config.get('incremental_store_path'):
+            print("流式模式不读写增量评论库，所有评论都将重新分析。")
+
+        rows_read = 0
+        chunk_number = 0
+        try:
+            # 数据块大小有限，直接读取全部输入列，逐块导出的 CSV 与一次性分析相同地保留所有输入列
+            for chunk in iter_review_chunks(filepath, chunk_size, self.config.get('input_format')):
+                # 为每个数据块分配全局唯一的行号，使其与一次性读入时的索引一致
+                chunk.index = pd.RangeIndex(rows_read, rows_read + len(chunk))
+                rows_read += len(chunk)
+                self.df = self._clean_frame(chunk)
+                if self.df.empty:
+                    continue
+                chunk_number += 1
+                print(f"\n--- 正在处理第 {chunk_number} 个数据块（累计读取 {rows_read} 行）---")
+
+                self.analyze_sentiment()
+                self.extract_keywords()
+                self.categorize_products()
+                self._precompute_feature_sentiments()
+                if classifications:
+                    self.classify_all(classifications)
+
+                accumulator.update(self.df, self._phrase_texts(self.df) if accumulator.counts_phrases else None)
+                if output_path:
+                    # 与 save_results 相同经由 export_frame 导出，流式与一次性分析的 CSV 列完全一致
+                    first = chunk_number == 1
+                    self.export_frame().to_csv(output_path, mode='w' if first else 'a', header=first, index=False,
+                                   encoding='utf-8-sig' if first else 'utf-8')
+        except FileNotFoundError:
+            print(f"错误: 文件 '{filepath}' 未找到。")
+            return None
+        except KeyError as e:
+            print(f"错误: 配置文件中的列名 {e} 在输入文件中未找到。")
+            return None
+        finally:
+            self._text_mapper.close()
+            # 释放最后一个数据块及其命中矩阵
+            self.df = None
+            self._hit_matrix = self._feature_matrix = self._hit_index = self._category_hits = None
+            self.token_corpus = None
+
+        self._polarity_cache.save()
+        print(f"\n✅ 流式分析完成：共处理 {accumulator.total_rows} 条有效评论（{chunk_number} 个数据块）。")
+        return {
+            'rows': accumulator.total_rows,
+            'feature_report': accumulator.feature_analysis_report(),
+            'distributions': accumulator.distributions(),
+        }
+
+    @profiled_stage()
+    def compact_memory(self) -> Dict[str, int]:
+        """
+        【V10.7 内存压缩】在逐行分析与分类全部完成后调用，缩小处理后 DataFrame 的内存占用：
+        - 特征提及/关键词标记（0/1）→ int8：与 bool 同为每值 1 字节，且保持 ==1 比较与导出 CSV 中的 0/1 不变；
+        - 特征情感（-1/0/1）→ int8，特征情感得分 → float32；
+        - 分类结果与产品系列 → pandas 分类类型（类别按首次出现顺序排列，value_counts 的并列顺序不变）。
+        打印压缩前后的内存占用，并返回 {'before_bytes', 'after_bytes'}。
+        """
+        if self.df is None:
+            return {'before_bytes': 0, 'after_bytes': 0}
+        before = int(self.df.memory_usage(deep=True).sum())
+        features = [f for f in self.config.get('feature_keywords', {}) if f'feature_{f}' in self.df.columns]
+
+        dtypes = {}
+        for feature in features:
+            dtypes[f'feature_{feature}'] = np.int8
+            dtypes[f'sentiment_{feature}'] = np.int8
+            dtypes[f'sentiment_score_{feature}'] = np.float32
+        for keyword in self.config.get('keywords', []):
+            dtypes[f'has_{keyword}'] = np.int8
+        for col, dtype in dtypes.items():
+            if col in self.df.columns:
+                self.df[col] = self.df[col].to_numpy().astype(dtype)
+        for col in self.CATEGORICAL_COLUMNS:
+            if col in self.df.columns and not isinstance(self.df[col].dtype, pd.CategoricalDtype):
+                values = self.df[col]
+                self.df[col] = pd.Categorical(values, categories=values.dropna().unique())
+
+        # 诊断底座缓存的是压缩前的数组，需要重新构建
+        self._diagnostic_data = None
+        after = int(self.df.memory_usage(deep=True).sum())
+        print(f"内存压缩: {before / 1024 ** 2:.1f} MB → {after / 1024 ** 2:.1f} MB（节省 {(1 - after / before) if before else 0:.1%}）")
+        return {'before_bytes': before, 'after_bytes': after}
+
+    @property
+    def full_df(self) -> pd.DataFrame:
+        """
+        兼容旧接口：核心分析完成时的全时段 DataFrame。
+        不再另存快照副本，而是保留对同一对象的引用：之后的分类与类型压缩原地作用于它，
+        按时段把 self.df 换成子集时仍返回全部评论。尚未运行核心分析（如直接载入缓存结果）时返回 self.df。
+        """
+        return self._full_df if self._full_df is not None else self.df
+
+    def export_frame(self) -> pd.DataFrame:
+        """
+        返回用于导出（CSV、结果缓存）的 DataFrame，列及其顺序与普通模式相同：
+        精简内存模式下不常驻的 Processed_Text 由词元语料还原、放回原位置，
+        小写内容列 Content_Clean 在此临时生成（位于原始输入列之后、Sentiment 之前）；
+        读取时未载入的其余输入列在此补读，所有输入列按文件中的顺序排在最前。
+        self.df 本身不变。
+        """
+        frame = self.df
+        if 'Processed_Text' not in frame.columns and self._processed_text_position is not None:
+            frame = frame.copy(deep=False)
+            frame.insert(self._processed_text_position, 'Processed_Text', self._processed_texts(frame))
+        if 'Content_Clean' not in frame.columns:
+            frame = frame.copy(deep=False)
+            position = frame.columns.get_loc('Sentiment') if 'Sentiment' in frame.columns else len(frame.columns)
+            frame.insert(position, 'Content_Clean', self._clean_content())
+        if self._passthrough_columns:
+            frame = self._with_passthrough_columns(frame)
+        return frame
+
+    def _with_passthrough_columns(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """补回读取时未载入的输入列（首次导出时从输入文件中只读取这些列），并把输入列按文件中的顺序排在最前。"""
+        if self._passthrough is None:
+            self._passthrough = read_reviews(self.config['input_filepath'], self.config.get('input_format'), self._passthrough_columns,
+                                             self.config.get('excel_conversion_dir'),
+                                             self.config.get('excel_conversion_max_bytes', DEFAULT_CONVERSION_MAX_BYTES))
+        extra = [col for col in self._passthrough_columns if col not in frame.columns]
+        frame = pd.concat([frame, self._passthrough.loc[frame.index, extra]], axis=1)
+        input_columns = [col for col in self._input_column_names if col in frame.columns]
+        leading = set(input_columns)
+        return frame[input_columns + [col for col in frame.columns if col not in leading]]
+
+    @profiled_stage()
     def save_results(self):
-        """将处理后的DataFrame保存到CSV文件。"""
+        """将处理后的DataFrame保存到CSV文件（列与普通模式相同，见 export_frame）。"""
         if self.df is not None:
             output_path = self.config['output_filepath']
             print(f"\n正在将结果保存至 '{output_path}'...")
-            self.df.to_csv(output_path, index=False, encoding='utf-8-sig')
+            self.export_frame().to_csv(output_path, index=False, encoding='utf-8-sig')
             print("结果保存成功。")
 
-    def _analyze_segment_details(self, segment_df: pd.DataFrame, segment_name: str) -> Dict:
-        if segment_df.empty: return {"error": "数据不足"}
+    def _diagnostic_base(self) -> DiagnosticBase:
+        """返回当前 self.df 的诊断数据底座（特征/情感/评分/命中矩阵数组），同一个 DataFrame 只构建一次。"""
+        if self._diagnostic_data is None or self._diagnostic_data.frame is not self.df:
+            self._diagnostic_data = DiagnosticBase(self, self.df)
+        return self._diagnostic_data
+
+    def segment(self, mask) -> Segment:
+        """以布尔掩码（与 self.df 等长）创建一个不复制数据的群体视图。"""
+        return Segment.from_mask(self._diagnostic_base(), mask)
+
+    def _as_segment(self, segment) -> Segment:
+        """
+        兼容旧接口：群体既可以是 Segment，也可以是从 self.df 中筛选出的 DataFrame。
+        后者按索引映射回 self.df 的行号；无法映射时（例如外部构造的 DataFrame）为其单独构建底座。
+        """
+        if isinstance(segment, Segment):
+            return segment
+        base = self._diagnostic_base() if self.df is not None else None
+        if base is not None and self.df.index.is_unique:
+            positions = self.df.index.get_indexer(segment.index)
+            if (positions >= 0).all():
+                return Segment(base, positions, len(self.df))
+        return DiagnosticBase(self, segment).segment(np.arange(len(segment)))
+
+    def _analyze_segment_details(self, segment: Segment, segment_name: str) -> Dict:
+        if segment.size == 0: return {"error": "数据不足"}
+        mention_rates = segment.feature_mention_rates()
+        correlated_cols = [f'feature_{f}' for f in self.config['feature_keywords'] if f not in segment_name and f'feature_{f}' in mention_rates.index]
         return {
-            "review_count": len(segment_df),
-            "percentage_of_total": f"{(len(segment_df) / len(self.df)) * 100:.2f}%",
-            "user_profile": {"role_distribution": segment_df['User_Role'].value_counts().to_dict(), "usage_distribution": segment_df['Usage'].value_counts().to_dict()},
-            "product_preference": segment_df['Product_Category'].value_counts().to_dict(),
-            "correlated_feature_mentions": {k.replace('feature_', ''): v for k, v in (segment_df[[f'feature_{f}' for f in self.config['feature_keywords'] if f not in segment_name]].mean() * 100).round(2).sort_values(ascending=False).to_dict().items()}
+            "review_count": segment.size,
+            "percentage_of_total": f"{(segment.size / segment.total_size) * 100:.2f}%",
+            "user_profile": {"role_distribution": segment.value_counts('User_Role').to_dict(), "usage_distribution": segment.value_counts('Usage').to_dict()},
+            "product_preference": segment.value_counts('Product_Category').to_dict(),
+            "correlated_feature_mentions": {k.replace('feature_', ''): v for k, v in (mention_rates[correlated_cols] * 100).round(2).sort_values(ascending=False).to_dict().items()}
         }
 
 
 
     def deep_dive_feature_analysis(self, feature_name: str, sentiment: str) -> Dict:
         """【V5.2 升级版】: 返回分析结果字典，而不是打印。"""
-        sentiment_map, sentiment_text = ({'positive': 1, 'negative': -1}, "正面评价" if sentiment == 'positive' else "负面评价")
+        sentiment_map = {'positive': 1, 'negative': -1}
+        segment = self.segment((self.df[f'feature_{feature_name}'] == 1) & (self.df[f'sentiment_{feature_name}'] == sentiment_map[sentiment]))
+        return self._build_feature_drill_down(feature_name, sentiment, segment)
+
+    def _build_feature_drill_down(self, feature_name: str, sentiment: str, segment: Segment) -> Dict:
+        """根据一个“特征 + 情感”细分群体组装特征深度诊断报告（供单次调用与分时段诊断引擎共用）。"""
+        sentiment_text = "正面评价" if sentiment == 'positive' else "负面评价"
 
         report = {
             "type": "feature_drill_down",
@@ -381,20 +991,19 @@ class ReviewAnalyzer:
             "data": {}
         }
 
-        segment_df = self.df[(self.df[f'feature_{feature_name}'] == 1) & (self.df[f'sentiment_{feature_name}'] == sentiment_map[sentiment])].copy()
-        segment_size = len(segment_df)
+        segment_size = segment.size
 
         if segment_size < 3:
             report["insufficient_data"] = True
             return report
 
-        macro_report = self._analyze_segment_details(segment_df, feature_name)
+        macro_report = self._analyze_segment_details(segment, feature_name)
 
         report["data"]["summary"] = f"共找到 {macro_report['review_count']} 条相关评论, 占总评论数的 {macro_report['percentage_of_total']}。"
         roles_dist = macro_report['user_profile']['role_distribution']
         usages_dist = macro_report['user_profile']['usage_distribution']
-        gender_dist = segment_df['Gender'].value_counts().to_dict()
-        age_dist = segment_df['Age_Group'].value_counts().to_dict()
+        gender_dist = segment.value_counts('Gender').to_dict()
+        age_dist = segment.value_counts('Age_Group').to_dict()
         report["data"]["user_profile"] = {
             "roles": {role: f"{count}次 ({(count / segment_size) * 100:.1f}%)" for role, count in sorted(roles_dist.items(), key=lambda item: item[1], reverse=True)[:5]},
             "usages": {usage: f"{count}次 ({(count / segment_size) * 100:.1f}%)" for usage, count in sorted(usages_dist.items(), key=lambda item: item[1], reverse=True)[:5]},
@@ -403,6 +1012,7 @@ class ReviewAnalyzer:
         }
         report["data"]["product_preferences"] = {product: f"{count}次 ({(count / segment_size) * 100:.1f}%)" for product, count in sorted(macro_report['product_preference'].items(), key=lambda item: item[1], reverse=True)[:3]}
 
+        sub_topic_counts = segment.sub_topic_counts()
         sub_topic_analysis = {}
         feature_sub_topics = self.config['feature_keywords'].get(feature_name, {})
         for sub_topic, keywords in feature_sub_topics.items():
@@ -411,8 +1021,7 @@ class ReviewAnalyzer:
           if sentiment == 'positive' and sub_topic.startswith('负面'):
             continue
           if not keywords: continue
-          pattern = r'\b(' + '|'.join([re.escape(kw) for kw in keywords]) + r')\b'
-          count = segment_df['Processed_Text'].str.contains(pattern, regex=True, na=False).sum()
+          count = sub_topic_counts[self.matcher.sub_topic_id(feature_name, sub_topic)]
           if count > 0:
             sub_topic_analysis[sub_topic] = f"{count} 次 ({(count / segment_size) * 100:.1f}%)"
         report["data"]["main_reasons"] = sub_topic_analysis
@@ -423,8 +1032,8 @@ class ReviewAnalyzer:
             sub_needs = {}
             other_feature_sub_topics = self.config['feature_keywords'].get(other_feature, {})
             for sub_topic, keywords in other_feature_sub_topics.items():
-                pattern = r'\b(' + '|'.join([re.escape(kw) for kw in keywords]) + r')\b'
-                count = segment_df['Processed_Text'].str.contains(pattern, regex=True).sum()
+                if not keywords: continue
+                count = sub_topic_counts[self.matcher.sub_topic_id(other_feature, sub_topic)]
                 if count > 0:
                     sub_needs[sub_topic] = f"{count} 次 ({(count / segment_size) * 100:.1f}%)"
             if sub_needs:
@@ -436,106 +1045,83 @@ class ReviewAnalyzer:
 
 
 
-    def analyze_top_praises(self, segment_df: pd.DataFrame, top_n: int = 5) -> Dict:
-        """
-        【新增功能】
-        分析并返回被赞扬次数最多的N个具体原因。
-        此函数逻辑与 analyze_top_complaints 完全对应，仅分析高分评论。
-        """
-        if segment_df.empty:
-            return {}
-
-        positive_reviews_df = segment_df[segment_df[self.config['rating_column']] >= 4].copy()
-        total_positive_reviews = len(positive_reviews_df)
-
-        if total_positive_reviews == 0:
-            return {}
-
-        praise_counts = {}
-
+    def _rank_sub_topics(self, sub_topic_counts: np.ndarray, total_reviews: int, excluded_prefix: str, top_n: int) -> Dict:
+        """按命中次数对全部子主题排序（排除指定情感前缀），返回前 N 个及其占比。"""
+        ranked_counts = {}
         for feature, sub_topics in self.config.get('feature_keywords', {}).items():
             for sub_topic, keywords in sub_topics.items():
-                if sub_topic.startswith('负面'):
+                if sub_topic.startswith(excluded_prefix):
                     continue
                 if not keywords: continue
-                pattern = r'\b(' + '|'.join([re.escape(kw) for kw in keywords]) + r')\b'
-                count = int(positive_reviews_df['Processed_Text'].str.contains(pattern, regex=True, na=False).sum())
+                count = int(sub_topic_counts[self.matcher.sub_topic_id(feature, sub_topic)])
 
                 if count > 0:
-                    praise_key = f"{feature} » {sub_topic}"
-                    praise_counts[praise_key] = count
+                    ranked_counts[f"{feature} » {sub_topic}"] = count
 
-        if not praise_counts:
+        if not ranked_counts:
             return {}
 
-        sorted_praises = sorted(praise_counts.items(), key=lambda item: item[1], reverse=True)
-
-        formatted_praises = {}
-        for key, count in sorted_praises[:top_n]:
-            percentage = (count / total_positive_reviews) * 100
-            formatted_praises[key] = f"{count} 次 ({percentage:.1f}%)"
+        sorted_counts = sorted(ranked_counts.items(), key=lambda item: item[1], reverse=True)
 
-        return formatted_praises
+        formatted = {}
+        for key, count in sorted_counts[:top_n]:
+            percentage = (count / total_reviews) * 100
+            formatted[key] = f"{count} 次 ({percentage:.1f}%)"
 
+        return formatted
 
-    def analyze_top_complaints(self, segment_df: pd.DataFrame, top_n: int = 5) -> Dict:
+    def analyze_top_praises(self, segment, top_n: int = 5) -> Dict:
         """
-        【V5.10 最终格式统一版】
-        直接分析并返回被抱怨次数最多的N个具体原因。
-        输出的字符串格式与“最满意点”完全一致，包含次数和比例。
+        【新增功能】
+        分析并返回被赞扬次数最多的N个具体原因。
+        此函数逻辑与 analyze_top_complaints 完全对应，仅分析高分评论。
+        segment 可以是 Segment 群体视图，也可以是从 self.df 中筛选出的 DataFrame。
         """
-        if segment_df.empty:
+        segment = self._as_segment(segment)
+        if segment.empty:
             return {}
 
-        negative_reviews_df = segment_df[segment_df[self.config['rating_column']] <= 3].copy()
-        total_negative_reviews = len(negative_reviews_df)
-
-        if total_negative_reviews == 0:
+        positive_reviews = segment.rating_subset(min_rating=4)
+        if positive_reviews.empty:
             return {}
+        return self._rank_sub_topics(positive_reviews.sub_topic_counts(), positive_reviews.size, '负面', top_n)
 
-        complaint_counts = {}
 
-        for feature, sub_topics in self.config.get('feature_keywords', {}).items():
-            for sub_topic, keywords in sub_topics.items():
-                if sub_topic.startswith('正面'):
-                    continue
-                if not keywords: continue
-                pattern = r'\b(' + '|'.join([re.escape(kw) for kw in keywords]) + r')\b'
-                count = int(negative_reviews_df['Processed_Text'].str.contains(pattern, regex=True, na=False).sum())
-
-                if count > 0:
-                    complaint_key = f"{feature} » {sub_topic}"
-                    complaint_counts[complaint_key] = count
-
-        if not complaint_counts:
+    def analyze_top_complaints(self, segment, top_n: int = 5) -> Dict:
+        """
+        【V5.10 最终格式统一版】
+        直接分析并返回被抱怨次数最多的N个具体原因。
+        输出的字符串格式与“最满意点”完全一致，包含次数和比例。
+        segment 可以是 Segment 群体视图，也可以是从 self.df 中筛选出的 DataFrame。
+        """
+        segment = self._as_segment(segment)
+        if segment.empty:
             return {}
 
-        sorted_complaints = sorted(complaint_counts.items(), key=lambda item: item[1], reverse=True)
-
-        formatted_complaints = {}
-        for key, count in sorted_complaints[:top_n]:
-            percentage = (count / total_negative_reviews) * 100
-            formatted_complaints[key] = f"{count} 次 ({percentage:.1f}%)"
-
-        return formatted_complaints
+        negative_reviews = segment.rating_subset(max_rating=3)
+        if negative_reviews.empty:
+            return {}
+        return self._rank_sub_topics(negative_reviews.sub_topic_counts(), negative_reviews.size, '正面', top_n)
 
 
 
 # ▼▼▼▼▼ “特征提升度”分析 (Feature Lift Analysis) ▼▼▼▼▼
-    def _calculate_feature_lift(self, segment_df: pd.DataFrame) -> Dict:
-        """计算指定用户群体中，各个特征相对于全体用户的“提升度”。"""
+    def _calculate_feature_lift(self, segment) -> Dict:
+        """计算指定用户群体（Segment 或 DataFrame）中，各个特征相对于全体用户的“提升度”。"""
+        return self._feature_lift_from_rates(self._as_segment(segment).feature_mention_rates())
 
-        lift_scores = {}
-        all_feature_cols = [col for col in self.df.columns if col.startswith('feature_')]
+    def _feature_lift_from_rates(self, segment_mention_rates: pd.Series) -> Dict:
+        """由群体内各特征的提及率，计算其相对于全体用户的“提升度”。"""
 
-        # 1. 计算每个特征在【全体用户】中的平均提及率
-        overall_mention_rates = self.full_df[all_feature_cols].mean()
+        lift_scores = {}
+        all_feature_cols = [f'feature_{f}' for f in self.config.get('feature_keywords', {}).keys()]
 
-        # 2. 计算每个特征在【当前群体】中的平均提及率
-        segment_mention_rates = segment_df[all_feature_cols].mean()
+        # 1. 每个特征在【全体用户】中的平均提及率（建立命中矩阵时已缓存）
+        overall_mention_rates = self._overall_mention_rates
 
         for feature_col in all_feature_cols:
             overall_rate = overall_mention_rates[feature_col]
+            # 2. 当前群体中的平均提及率
             segment_rate = segment_mention_rates[feature_col]
 
             # 3. 计算提升度 (群体提及率 / 总体提及率)
@@ -558,38 +1144,42 @@ class ReviewAnalyzer:
         - 确保输出的数据结构完全对称，便于网页端统一处理。
         - 这是最理想、最强大的分析模式。
         """
+        segment = self.segment(self.df[attribute_column] == segment_value)
+        return self._build_user_drill_down(segment_value, segment)
+
+    def _build_user_drill_down(self, segment_value: str, segment: Segment) -> Dict:
+        """根据一个用户群体组装用户深度诊断报告（供单次调用与分时段诊断引擎共用）。"""
         report = {
             "type": "user_drill_down",
             "title": f"用户群体深度诊断: 【{segment_value}】",
             "data": {}
         }
 
-        segment_df = self.df[self.df[attribute_column] == segment_value].copy()
-        segment_size = len(segment_df)
+        segment_size = segment.size
         if segment_size < 3:
             report["insufficient_data"] = True
             return report
 
         # --- 模块1: 群体概览 (Overview) ---
-        report["data"]["summary"] = f"共找到 {segment_size} 条相关评论, 占总评论数的 {(segment_size / len(self.df)) * 100:.2f}%."
+        report["data"]["summary"] = f"共找到 {segment_size} 条相关评论, 占总评论数的 {(segment_size / segment.total_size) * 100:.2f}%."
 
         motivations = {}
-        if 'Motivation' in segment_df.columns:
-            motivation_dist = segment_df['Motivation'].value_counts()
+        if segment.has_column('Motivation'):
+            motivation_dist = segment.value_counts('Motivation')
             for motivation, count in motivation_dist.head(3).items():
                 motivations[motivation] = f"{count}次 ({(count / segment_size) * 100:.1f}%)"
 
         products = {}
-        product_pref = segment_df['Product_Category'].value_counts()
+        product_pref = segment.value_counts('Product_Category')
         for product, count in product_pref.head(3).items():
             products[product] = f"{count}次 ({(count / segment_size) * 100:.1f}%)"
 
 
         # 计算并添加该用户群体的性别构成
-        gender_dist = segment_df['Gender'].value_counts().to_dict()
+        gender_dist = segment.value_counts('Gender').to_dict()
 
         # 计算并添加该用户群体的年龄段构成
-        age_dist = segment_df['Age_Group'].value_counts().to_dict()
+        age_dist = segment.value_counts('Age_Group').to_dict()
 
         report['data']['overview'] = {"motivations": motivations,
                         "products": products,
@@ -599,12 +1189,8 @@ class ReviewAnalyzer:
 
         # --- 模块2: 核心需求 (Core Needs) ---
         feature_sentiments = {}
-        all_features = self.config.get('feature_keywords', {}).keys()
-        for feature in all_features:
-            total_mentions = segment_df[f'feature_{feature}'].sum()
+        for feature, (total_mentions, positive_mentions, negative_mentions) in segment.feature_sentiment_counts().items():
             if total_mentions == 0: continue
-            positive_mentions = (segment_df[f'sentiment_{feature}'] == 1).sum()
-            negative_mentions = (segment_df[f'sentiment_{feature}'] == -1).sum()
             feature_sentiments[feature] = {
                 'mention_rate': (total_mentions / segment_size) * 100,
                 'positive_ratio': (positive_mentions / total_mentions) * 100 if total_mentions > 0 else 0,
@@ -616,15 +1202,10 @@ class ReviewAnalyzer:
 
         # --- 模块3: 关联需求 (Correlated Needs) ---
         report['data']['correlated_needs'] = {}
-        all_feature_cols = [f'feature_{f}' for f in self.config.get('feature_keywords', {}).keys()]
-        existing_feature_cols = [col for col in all_feature_cols if col in segment_df.columns]
-        if len(existing_feature_cols) > 1:
-            corr_matrix = segment_df[existing_feature_cols].corr()
-            corr_pairs = corr_matrix.unstack()
-            sorted_pairs = corr_pairs.sort_values(ascending=False)
-            top_pairs = sorted_pairs[sorted_pairs.index.get_level_values(0) != sorted_pairs.index.get_level_values(1)]
+        if len(segment.base.feature_cols) > 1:
+            top_pairs = [(f1, f2, corr) for f1, f2, corr in segment.sorted_feature_pairs() if f1 != f2]
             unique_pairs = {}
-            for (f1, f2), corr in top_pairs.items():
+            for f1, f2, corr in top_pairs:
                 pair_key = tuple(sorted((f1.replace('feature_', ''), f2.replace('feature_', ''))))
                 if pair_key not in unique_pairs:
                     if corr > 0.05:
@@ -637,16 +1218,16 @@ class ReviewAnalyzer:
         report['data']['deep_dive_reasons'] = {}
 
         # 4.1【最满意点】直接调用 analyze_top_praises，生成全局排行榜
-        top_praises_data = self.analyze_top_praises(segment_df, top_n=10)
+        top_praises_data = self.analyze_top_praises(segment, top_n=10)
         if top_praises_data:
             report['data']['deep_dive_reasons']['最满意点: 【综合优点 Top 10】'] = top_praises_data
 
         # 4.2【最不满意点】的逻辑保持不变，它已经是全局排行榜
-        top_complaints_data = self.analyze_top_complaints(segment_df, top_n=10)
+        top_complaints_data = self.analyze_top_complaints(segment, top_n=10)
         if top_complaints_data:
             report['data']['deep_dive_reasons']['最不满意点: 【综合痛点 Top 10】'] = top_complaints_data
 
-        lift_analysis_results = self._calculate_feature_lift(segment_df)
+        lift_analysis_results = self._calculate_feature_lift(segment)
         report['data']['signature_needs_lift'] = lift_analysis_results
 
         return report
@@ -654,33 +1235,44 @@ class ReviewAnalyzer:
 
 
 
+    @profiled_stage()
     def run_comprehensive_user_diagnostics(self) -> List[Dict]:
         """【V5.2 升级版】: 收集并返回所有用户群体的诊断报告。"""
         print("\n\n" + "#"*70)
         print("####  正在执行【基于用户属性的自动化深度诊断】...  ####")
         print("#"*70)
 
-        all_reports = []
+        tasks = []
         attributes_to_analyze = ['User_Role']
+        self._diagnostic_base()  # 在分发任务前构建共享的数组底座
         for column in attributes_to_analyze:
             segments = self.df[column].unique()
             for segment in segments:
-                report = self.deep_dive_user_segment_analysis(attribute_column=column, segment_value=segment)
-                all_reports.append(report)
-        return all_reports
+                tasks.append(self.profiler.wrap(f'{column}:{segment}', partial(self.deep_dive_user_segment_analysis, attribute_column=column, segment_value=segment)))
+        return run_report_tasks(tasks, self.diagnostic_workers)
 
+    @profiled_stage()
     def run_comprehensive_feature_diagnostics(self) -> List[Dict]:
         """【V5.2 升级版】: 收集并返回所有特征的诊断报告。"""
         print("\n\n" + "#"*70 + "\n####  正在执行【全特征自动化深度诊断分析】...  ####\n" + "#"*70)
-        all_reports = []
+        tasks = []
+        self._diagnostic_base()  # 在分发任务前构建共享的数组底座
         for feature in self.config.get('feature_keywords', {}).keys():
-            report_pos = self.deep_dive_feature_analysis(feature, sentiment='positive')
-            all_reports.append(report_pos)
-            report_neg = self.deep_dive_feature_analysis(feature, sentiment='negative')
-            all_reports.append(report_neg)
-        return all_reports
+            for sentiment in ('positive', 'negative'):
+                tasks.append(self.profiler.wrap(f'{feature}:{sentiment}', partial(self.deep_dive_feature_analysis, feature, sentiment=sentiment)))
+        return run_report_tasks(tasks, self.diagnostic_workers)
 
 
+    @profiled_stage()
+    def run_period_diagnostics(self, frame: pd.DataFrame, time_periods: Dict[str, str], min_period_size: int = 10) -> Dict[str, List[Dict]]:
+        """
+        【V10.7】对全部时间、每一年、每一季度一次性生成特征与用户群体的深度诊断报告，
+        结果与“逐时段复制 DataFrame 后分别运行 run_comprehensive_* ”完全相同。
+        frame 需包含 Year / Quarter 列（不属于任何年份/季度的评论只计入全部时间）。
+        """
+        return PeriodDiagnosticsEngine(self, frame, min_period_size, max_workers=self.diagnostic_workers).run(time_periods)
+
+    @profiled_stage()
     def export_to_html(self, dashboard_data: Dict):
         """
         将分析数据注入HTML模板，并生成最终的报告网页。
@@ -0,0 +1,367 @@
+# review_cache.py (版本 1.1 - 分析结果磁盘缓存 + 极性缓存)
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, List, Callable
+
+import pandas as pd
+
+DEFAULT_POLARITY_CACHE_SIZE = 200_000
+DEFAULT_REVIEW_STORE_SIZE = 500_000
+
+
+def fingerprint(obj: Any) -> str:
+    """为任意可JSON序列化的配置对象生成稳定的哈希指纹（与字典键顺序无关）。"""
+    payload = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def hash_bytes(data: bytes) -> str:
+    """计算文件内容的哈希值。"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _json_default(obj):
+    # numpy 标量转为对应的 Python 数值，保证缓存读回后类型不变
+    if hasattr(obj, 'item'):
+        return obj.item()
+    return str(obj)
+
+
+class ResultCache:
+    """
+    【V10.3 结果缓存】
+    以 (文件内容哈希, 合并后关键词配置哈希, 产品画像, 分类规则哈希, 其他分析设置哈希) 为键，
+    将处理后的 DataFrame 以列式 Parquet 格式、仪表盘数据以 JSON 格式保存到磁盘。
+    同一份文件在相同配置下再次分析时，直接读取缓存，跳过整个分析流程。
+    缓存总大小超过上限时，按最近使用时间淘汰最旧的条目。
+    """
+
+    DATA_FILE = 'processed.parquet'
+    DASHBOARD_FILE = 'dashboard.json'
+
+    def __init__(self, cache_dir: str = '.report_cache', max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(file_hash: str, keywords_hash: str, profile: str, rules_hash: str, settings_hash: str = '') -> str:
+        return fingerprint([file_hash, keywords_hash, profile, rules_hash, settings_hash])
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict]]:
+        """读取缓存条目；不存在或已损坏时返回 None。"""
+        entry_dir = self._entry_dir(key)
+        data_path = os.path.join(entry_dir, self.DATA_FILE)
+        dashboard_path = os.path.join(entry_dir, self.DASHBOARD_FILE)
+        if not (os.path.exists(data_path) and os.path.exists(dashboard_path)):
+            return None
+        try:
+            df = pd.read_parquet(data_path)
+            with open(dashboard_path, 'r', encoding='utf-8') as f:
+                dashboard_data = json.load(f)
+        except Exception as e:
+            print(f"警告: 缓存条目 '{key}' 读取失败，将重新分析: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+        # 更新访问时间，用于按最近使用淘汰
+        os.utime(entry_dir, None)
+        return df, dashboard_data
+
+    def store(self, key: str, df: pd.DataFrame, dashboard_data: Dict) -> bool:
+        """写入缓存条目，随后按大小上限淘汰旧条目。写入失败不会影响分析流程。"""
+        entry_dir = self._entry_dir(key)
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}-{threading.get_ident()}-{int(time.time() * 1000)}"
+        try:
+            os.makedirs(tmp_dir, exist_ok=True)
+            df.to_parquet(os.path.join(tmp_dir, self.DATA_FILE))
+            with open(os.path.join(tmp_dir, self.DASHBOARD_FILE), 'w', encoding='utf-8') as f:
+                json.dump(dashboard_data, f, ensure_ascii=False, default=_json_default)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except Exception as e:
+            print(f"警告: 写入结果缓存失败（不影响本次报告）: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+        self._evict()
+        return True
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def _evict(self):
+        """缓存总大小超过上限时，从最久未使用的条目开始删除。"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isdir(path) and '.tmp-' not in name:
+                entries.append((os.path.getmtime(path), self._dir_size(path), path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+class ReviewStore:
+    """
+    【V10.4 增量评论库】
+    以“评论指纹”（ASIN + 日期 + 内容哈希）为键，持久化每条评论的派生列
+    （预处理文本、情感得分、特征提及/情感、分类结果等）。
+    派生列按“列组”管理，每个列组记录其所依赖配置的指纹；配置变化时，该列组的旧结果自动作废。
+    下次分析累计导出的数据时，只有从未见过的评论需要重新经过NLP各阶段，其余直接从库中读取。
+    库中的评论按最近一次写回的先后排列；条数超过 max_rows 时，淘汰最久没有出现在分析数据中的评论。
+    """
+
+    DATA_FILE = 'reviews.parquet'
+    META_FILE = 'meta.json'
+
+    def __init__(self, store_dir: str, max_rows: int = DEFAULT_REVIEW_STORE_SIZE):
+        self.store_dir = store_dir
+        self.max_rows = max_rows
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.frame = pd.DataFrame()
+        self.meta = {'groups': {}}
+        self.dirty = False  # 自加载以来是否有需要写盘的变化（新评论、重新计算的结果、列组变化或淘汰）
+        self._load()
+
+    @staticmethod
+    def review_fingerprints(df: pd.DataFrame, asin_col: str, date_col: str, content_col: str) -> pd.Series:
+        """为每条评论生成稳定的指纹：ASIN + 日期 + 评论内容的哈希。"""
+        def column_values(col):
+            return df[col].astype(str) if col in df.columns else pd.Series('', index=df.index)
+        keys = column_values(asin_col) + '\x1f' + column_values(date_col) + '\x1f' + column_values(content_col)
+        return keys.map(lambda key: hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest())
+
+    def _load(self):
+        data_path = os.path.join(self.store_dir, self.DATA_FILE)
+        meta_path = os.path.join(self.store_dir, self.META_FILE)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return
+        try:
+            self.frame = pd.read_parquet(data_path).tail(self.max_rows)
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+            print(f"已加载增量评论库: {len(self.frame)} 条历史评论的派生结果。")
+        except Exception as e:
+            print(f"警告: 增量评论库读取失败，将重新计算所有评论: {e}")
+            self.frame = pd.DataFrame()
+            self.meta = {'groups': {}}
+
+    def ensure_group(self, group: str, config_fingerprint: str, columns) -> bool:
+        """
+        登记一个列组；若其依赖的配置指纹发生变化，则作废该列组的全部历史结果。
+        返回该列组的历史结果是否仍然有效（首次登记或配置变化时返回 False）。
+        """
+        groups = self.meta.setdefault('groups', {})
+        previous = groups.get(group)
+        still_valid = previous is not None and previous.get('fingerprint') == config_fingerprint
+        if previous is not None and not still_valid:
+            stale = [col for col in previous.get('columns', []) if col in self.frame.columns]
+            if stale:
+                print(f"增量评论库: 列组 '{group}' 的配置已变化，作废 {len(stale)} 个历史列。")
+                self.frame = self.frame.drop(columns=stale)
+        groups[group] = {'fingerprint': config_fingerprint, 'columns': list(columns)}
+        if not still_valid:
+            self.dirty = True
+        return still_valid
+
+    def lookup_column(self, fingerprints: pd.Series, column: str) -> Optional[pd.Series]:
+        """按指纹取出某个已保存的派生列，结果与 fingerprints 的索引对齐（未见过的评论为空值）。"""
+        if column not in self.frame.columns:
+            return None
+        stored = self.frame[column].reindex(fingerprints.to_numpy())
+        stored.index = fingerprints.index
+        return stored
+
+    def group_available(self, fingerprints: pd.Series, group: str) -> pd.Series:
+        """返回布尔掩码：哪些评论的某个列组已完整保存、可直接复用。"""
+        columns = self.meta.get('groups', {}).get(group, {}).get('columns', [])
+        if not columns or not all(col in self.frame.columns for col in columns):
+            return pd.Series(False, index=fingerprints.index)
+        stored = self.frame[columns].reindex(fingerprints.to_numpy())
+        return pd.Series(stored.notna().all(axis=1).to_numpy(), index=fingerprints.index)
+
+    def tracked_columns(self):
+        return [col for group in self.meta.get('groups', {}).values() for col in group.get('columns', [])]
+
+    def update(self, fingerprints: pd.Series, derived: pd.DataFrame):
+        """将本次计算得到的派生列按指纹写回（同一指纹以最新结果为准）。"""
+        derived = derived.copy()
+        derived.index = fingerprints.to_numpy()
+        derived = derived[~derived.index.duplicated(keep='last')]
+        if self._has_new_values(derived):
+            self.dirty = True
+        if self.frame.empty:
+            self.frame = derived
+        else:
+            existing = self.frame.reindex(derived.index)
+            for col in derived.columns:
+                existing[col] = derived[col]
+            # 本次写回的评论移到末尾，库中的行序即“最近一次出现”的先后
+            remaining = self.frame.drop(index=derived.index, errors='ignore')
+            self.frame = pd.concat([remaining, existing])
+        self._evict()
+
+    def _has_new_values(self, derived: pd.DataFrame) -> bool:
+        """derived 中是否有库里没有的评论、列或值（复用的历史结果与库中相同，不算变化）。"""
+        if self.frame.empty:
+            return not derived.empty
+        if not derived.index.isin(self.frame.index).all():
+            return True
+        for col in derived.columns:
+            if col not in self.frame.columns:
+                return True
+            if (self.frame[col].reindex(derived.index).isna() & derived[col].notna()).any():
+                return True
+        return False
+
+    def _evict(self):
+        """评论条数超过上限时，从最久没有写回的评论开始淘汰。"""
+        excess = len(self.frame) - self.max_rows
+        if excess > 0:
+            print(f"增量评论库: 超过 {self.max_rows} 条上限，淘汰 {excess} 条最久未出现的评论。")
+            self.frame = self.frame.iloc[excess:]
+            self.dirty = True
+
+    def save(self):
+        """将库写回磁盘；自上次加载或保存以来没有任何变化时跳过，避免每次分析都重写整个库。"""
+        if not self.dirty:
+            print("增量评论库没有新的结果，跳过保存。")
+            return
+        tmp_path = os.path.join(self.store_dir, f"{self.DATA_FILE}.tmp-{os.getpid()}-{threading.get_ident()}")
+        try:
+            self.frame.to_parquet(tmp_path)
+            os.replace(tmp_path, os.path.join(self.store_dir, self.DATA_FILE))
+            with open(os.path.join(self.store_dir, self.META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(self.meta, f, ensure_ascii=False, indent=2)
+            self.dirty = False
+            print(f"增量评论库已保存: 共 {len(self.frame)} 条评论。")
+        except Exception as e:
+            print(f"警告: 保存增量评论库失败（不影响本次分析）: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class PolarityCache:
+    """
+    【V10.7 极性缓存】
+    以文本内容的哈希为键缓存情感极性。电商评论中大量存在完全相同的整条评论与句子
+    （如 "Great product!"、"Love them"），相同内容只需打分一次。
+    缓存有条目上限，超出时按最近使用淘汰；指定 cache_dir 时可跨次分析持久化，
+    打分算法版本（version）变化时旧缓存自动作废。
+    可被多个线程中的分析器共享：查表与写入在锁内进行，打分本身在锁外执行。
+    """
+
+    DATA_FILE = 'polarity.parquet'
+    META_FILE = 'meta.json'
+
+    def __init__(self, max_entries: int = DEFAULT_POLARITY_CACHE_SIZE, cache_dir: Optional[str] = None, version: str = ''):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.version = version
+        self._entries = OrderedDict()  # 内容哈希 → 极性，按最近使用排序
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.cache_dir:
+            self._load()
+
+    @staticmethod
+    def content_key(text: str) -> str:
+        return hashlib.blake2b(str(text).encode('utf-8'), digest_size=16).hexdigest()
+
+    def _load(self):
+        data_path = os.path.join(self.cache_dir, self.DATA_FILE)
+        meta_path = os.path.join(self.cache_dir, self.META_FILE)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != self.version:
+                print("极性缓存: 打分算法版本已变化，作废历史缓存。")
+                return
+            frame = pd.read_parquet(data_path).tail(self.max_entries)
+            self._entries = OrderedDict(zip(frame['key'], frame['polarity'].astype(float)))
+            print(f"已加载极性缓存: {len(self._entries)} 条历史文本的情感极性。")
+        except Exception as e:
+            print(f"警告: 极性缓存读取失败，将重新计算: {e}")
+            self._entries = OrderedDict()
+
+    def score(self, texts, compute: Callable[[List[str]], List[float]]) -> List[float]:
+        """
+        返回 texts 的极性；缓存中没有的文本（同一批次中的重复文本只算一次）交给 compute 批量计算。
+        """
+        entries = self._entries
+        results = [None] * len(texts)
+        pending = {}  # 内容哈希 → (文本, [位置...])
+        keys = [self.content_key(text) for text in texts]
+        with self._lock:
+            for position, (key, text) in enumerate(zip(keys, texts)):
+                if key in entries:
+                    entries.move_to_end(key)
+                    results[position] = entries[key]
+                    self.hits += 1
+                elif key in pending:
+                    pending[key][1].append(position)
+                    self.hits += 1
+                else:
+                    pending[key] = (text, [position])
+                    self.misses += 1
+
+        if pending:
+            scores = compute([text for text, _ in pending.values()])
+            with self._lock:
+                for (key, (_, positions)), score in zip(pending.items(), scores):
+                    entries[key] = score
+                    for position in positions:
+                        results[position] = score
+                while len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+        return results
+
+    def cache_info(self) -> Dict[str, Any]:
+        """返回命中、未命中次数、当前条目数与命中率。"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'max_size': self.max_entries,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def save(self):
+        if not self.cache_dir:
+            return
+        tmp_path = os.path.join(self.cache_dir, f"{self.DATA_FILE}.tmp-{os.getpid()}-{threading.get_ident()}")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with self._lock:
+                frame = pd.DataFrame({'key': list(self._entries.keys()), 'polarity': list(self._entries.values())})
+            frame.to_parquet(tmp_path)
+            os.replace(tmp_path, os.path.join(self.cache_dir, self.DATA_FILE))
+            with open(os.path.join(self.cache_dir, self.META_FILE), 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version}, f)
+        except Exception as e:
+            print(f"警告: 保存极性缓存失败（不影响本次分析）: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
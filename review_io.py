@@ -0,0 +1,264 @@
+# review_io.py (版本 1.2 - 多格式评论数据读取：Excel/CSV/Parquet/Arrow，支持列裁剪、分块流式读取与有上限的 Excel 转换缓存)
+
+import io
+import os
+from typing import Iterator, Optional, List, Tuple
+
+import pandas as pd
+
+from review_cache import hash_bytes
+
+# pyarrow（以及 Excel 分块读取用的 openpyxl）只在对应格式的读取函数内导入：只读取 CSV、
+# 或只创建分析器时不必为其付出导入开销。benchmarks/import_time.py 检查入口模块在导入时没有加载它们。
+
+DEFAULT_STREAM_CHUNK_SIZE = 50_000
+DEFAULT_CONVERSION_MAX_BYTES = 1024 ** 3
+
+# 文件扩展名 → 输入格式
+_EXTENSION_FORMATS = {
+    '.xlsx': 'excel', '.xlsm': 'excel',
+    '.csv': 'csv',
+    '.parquet': 'parquet', '.pq': 'parquet',
+    '.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow',
+}
+
+
+def detect_input_format(source, input_format: Optional[str] = None) -> str:
+    """
+    判断输入数据的格式。优先使用显式指定的 input_format，否则根据文件名扩展名推断；
+    无法推断时（例如上传得到的内存缓冲区）沿用原有行为，按 Excel 处理。
+    """
+    if input_format:
+        return input_format.lower()
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    extension = os.path.splitext(str(name))[1].lower()
+    return _EXTENSION_FORMATS.get(extension, 'excel')
+
+
+def _column_filter(columns: Optional[List[str]]):
+    """将需要的列名列表转为 usecols 可用的过滤函数；文件中不存在的列直接忽略，交由后续清洗报错。"""
+    if not columns:
+        return None
+    wanted = set(columns)
+    return lambda name: name in wanted
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _iter_excel_chunks(source, chunk_size: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """以 openpyxl 只读模式逐行读取第一个工作表，每 chunk_size 行组成一个 DataFrame。"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        # 与 pd.read_excel 保持一致：空表头命名为 "Unnamed: i"
+        names = [name if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+        keep = _column_filter(columns)
+        positions = [i for i, name in enumerate(names) if keep is None or keep(name)]
+        names = [names[i] for i in positions]
+        buffer = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append([row[i] if i < len(row) else None for i in positions])
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame.from_records(buffer, columns=names)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=names)
+    finally:
+        workbook.close()
+
+
+def _iter_parquet_chunks(source, chunk_size: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    import pyarrow.parquet as pq
+
+    # 总是显式指定列：不读取 pandas 写入的索引列，逐块结果与一次性读取的列相同
+    names = _parquet_names(source)
+    selected = _select(names, columns) if columns else names
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size, columns=selected):
+        yield batch.to_pandas()
+
+
+def _arrow_batches(source):
+    """逐批读取 Arrow IPC 文件（兼容 file 与 stream 两种格式）。"""
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    try:
+        reader = ipc.open_file(source)
+        return (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        _rewind(source)
+        return iter(ipc.open_stream(source))
+
+
+def _project_arrow(data, columns: Optional[List[str]]):
+    if not columns:
+        return data
+    return data.select([name for name in data.schema.names if name in set(columns)])
+
+
+def _iter_arrow_chunks(source, chunk_size: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """按 chunk_size 重新切分 Arrow IPC 的记录批次。"""
+    for batch in _arrow_batches(source):
+        batch = _project_arrow(batch, columns)
+        for offset in range(0, batch.num_rows, chunk_size):
+            yield batch.slice(offset, chunk_size).to_pandas()
+
+
+def iter_review_chunks(source, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE, input_format: Optional[str] = None,
+                       columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    【V10.5 流式读取】按行分块读取评论数据，内存占用只与 chunk_size 有关，而与文件总行数无关。
+    支持 Excel（openpyxl 只读模式）、CSV（分块读取器）、Parquet（按批次读取）与 Arrow IPC。
+    指定 columns 时只读取这些列。
+    """
+    input_format = detect_input_format(source, input_format)
+    if input_format == 'excel':
+        yield from _iter_excel_chunks(source, chunk_size, columns)
+    elif input_format == 'csv':
+        yield from pd.read_csv(source, chunksize=chunk_size, usecols=_column_filter(columns))
+    elif input_format == 'parquet':
+        yield from _iter_parquet_chunks(source, chunk_size, columns)
+    elif input_format == 'arrow':
+        yield from _iter_arrow_chunks(source, chunk_size, columns)
+    else:
+        raise ValueError(f"不支持的输入格式: '{input_format}'")
+
+
+def _read_source_bytes(source) -> bytes:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    data = source.read()
+    _rewind(source)
+    return data
+
+
+def _evict_conversions(conversion_dir: str, max_bytes: int):
+    """Parquet 副本的总大小超过上限时，从最久未使用的副本开始删除（与结果缓存相同的淘汰策略）。"""
+    entries = []
+    for name in os.listdir(conversion_dir):
+        path = os.path.join(conversion_dir, name)
+        if name.endswith('.parquet') and os.path.isfile(path):
+            try:
+                entries.append((os.path.getmtime(path), os.path.getsize(path), path))
+            except OSError:
+                pass
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def _read_excel_via_parquet(source, columns: Optional[List[str]], conversion_dir: str,
+                            max_bytes: int = DEFAULT_CONVERSION_MAX_BYTES) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Excel 工作簿首次读取后，将整个工作表另存为 Parquet 副本；
+    此后再次分析同一份工作簿（按内容哈希识别）时直接从该副本读取所需的列，跳过缓慢的 openpyxl 解析。
+    副本目录的总大小不超过 max_bytes，超出时按最近使用时间淘汰最旧的副本。
+    """
+    data = _read_source_bytes(source)
+    parquet_path = os.path.join(conversion_dir, f"{hash_bytes(data)}.parquet")
+    if os.path.exists(parquet_path):
+        try:
+            names = _parquet_names(parquet_path)
+            df = pd.read_parquet(parquet_path, columns=_select(names, columns))
+            # 更新访问时间，用于按最近使用淘汰
+            os.utime(parquet_path, None)
+            print("检测到该工作簿已转换过，直接读取其 Parquet 副本。")
+            return df, names
+        except Exception as e:
+            print(f"警告: Parquet 副本读取失败，将重新解析 Excel: {e}")
+
+    df = pd.read_excel(io.BytesIO(data))
+    tmp_path = f"{parquet_path}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(conversion_dir, exist_ok=True)
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, parquet_path)
+        print(f"已将工作簿转换为 Parquet 副本，后续分析将直接复用: '{parquet_path}'")
+        _evict_conversions(conversion_dir, max_bytes)
+    except Exception as e:
+        # 例如同一列中混有数字与文本、无法写为 Parquet 时，仅跳过转换，不影响本次分析
+        print(f"警告: 工作簿转换为 Parquet 失败（不影响本次分析）: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    names = df.columns.tolist()
+    return df[_select(names, columns) or names], names
+
+
+def _parquet_names(source) -> List[str]:
+    """只读取元数据，返回 Parquet 文件的全部数据列名（不含 pandas 保存的索引列，如 __index_level_0__）。"""
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(source)
+    _rewind(source)
+    index_columns = {column for column in (schema.pandas_metadata or {}).get('index_columns', []) if isinstance(column, str)}
+    return [name for name in schema.names if name not in index_columns]
+
+
+def _select(names: List[str], columns: Optional[List[str]]) -> Optional[List[str]]:
+    """按文件中的列顺序，返回 names 中需要读取的列；columns 为空时返回 None（读取全部列）。"""
+    if not columns:
+        return None
+    wanted = set(columns)
+    return [name for name in names if name in wanted]
+
+
+def read_reviews_with_columns(source, input_format: Optional[str] = None, columns: Optional[List[str]] = None,
+                              conversion_dir: Optional[str] = None,
+                              conversion_max_bytes: int = DEFAULT_CONVERSION_MAX_BYTES) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    与 read_reviews 相同，另外返回输入数据的全部列名（按文件中的顺序）。
+    只读取了部分列时，调用方可据此在导出时补回其余的输入列。
+    """
+    input_format = detect_input_format(source, input_format)
+    _rewind(source)
+    if input_format == 'excel':
+        if conversion_dir:
+            return _read_excel_via_parquet(source, columns, conversion_dir, conversion_max_bytes)
+        df = pd.read_excel(source, usecols=_column_filter(columns))
+        _rewind(source)
+        names = df.columns.tolist() if not columns else pd.read_excel(source, nrows=0).columns.tolist()
+        return df, names
+    if input_format == 'csv':
+        df = pd.read_csv(source, usecols=_column_filter(columns))
+        _rewind(source)
+        names = df.columns.tolist() if not columns else pd.read_csv(source, nrows=0).columns.tolist()
+        return df, names
+    if input_format == 'parquet':
+        names = _parquet_names(source)
+        return pd.read_parquet(source, columns=_select(names, columns)), names
+    if input_format == 'arrow':
+        import pyarrow as pa
+
+        table = pa.Table.from_batches(list(_arrow_batches(source)))
+        return _project_arrow(table, columns).to_pandas(), table.schema.names
+    raise ValueError(f"不支持的输入格式: '{input_format}'")
+
+
+def read_reviews(source, input_format: Optional[str] = None, columns: Optional[List[str]] = None,
+                 conversion_dir: Optional[str] = None, conversion_max_bytes: int = DEFAULT_CONVERSION_MAX_BYTES) -> pd.DataFrame:
+    """
+    【V10.6 多格式读取】一次性读取评论数据，支持 Excel、CSV、Parquet 与 Arrow IPC（Feather V2）。
+    - columns: 只读取这些列（列式格式只解码所需列，CSV/Excel 也只保留所需列）。
+    - conversion_dir: 若指定，Excel 输入在首次读取后转存为 Parquet 副本，之后的分析直接复用；
+      副本目录的总大小不超过 conversion_max_bytes，超出时淘汰最久未使用的副本。
+    """
+    return read_reviews_with_columns(source, input_format, columns, conversion_dir, conversion_max_bytes)[0]
@@ -0,0 +1,144 @@
+# stage_profiler.py (版本 1.1 - 分析各阶段的耗时 / CPU / 峰值内存 / 行数记录；区分阶段内存峰值与进程内存高水位)
+
+import functools
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource  # 仅 Unix 可用；Windows 下不记录进程峰值内存
+except ImportError:
+    resource = None
+
+
+def max_rss_mb() -> Optional[float]:
+    """进程迄今为止的常驻内存峰值（MB）。"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 计，macOS 以字节计
+    return max_rss / 1024 ** 2 if sys.platform == 'darwin' else max_rss / 1024
+
+
+class StageProfiler:
+    """
+    【V11.2 阶段性能记录】
+    为分析流程的每个阶段记录一条结构化数据：
+    - wall_seconds: 墙钟耗时；
+    - cpu_seconds: 本进程所有线程的 CPU 时间（NLP 工作进程中的耗时不计入）；
+    - peak_memory_delta_mb: 该阶段内 Python 分配的内存峰值比阶段开始时高出多少 MB。
+      由 tracemalloc 统计（每个阶段开始时 reset_peak），只在 trace_memory=True 时记录，否则为 None：
+      跟踪内存分配会明显拖慢分析，仅用于排查；
+    - new_high_water_mark_mb: 该阶段把进程常驻内存的历史最高点（ru_maxrss）推高了多少 MB。
+      开销可以忽略，始终记录（Windows 下为 None）；但只有刷新了进程历史最高点的阶段才会大于 0，
+      并不是该阶段自身的内存峰值；
+    - rows: 阶段结束时处理的行数。
+    阶段可以嵌套（外层阶段的峰值包含内层阶段）。诊断报告等在线程池中执行的任务由 wrap 单独记录，
+    其 CPU 时间为所在线程的 CPU 时间，不记录内存。
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.records: List[Dict] = []
+        self.task_records: List[Dict] = []
+        self._lock = threading.Lock()
+        self._peak_stack: List[int] = []  # tracemalloc 模式下各层外层阶段已观测到的峰值
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+            self.task_records = []
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        """记录一个阶段；with 语句得到的记录字典可在阶段内补写 rows。"""
+        record = {'stage': name, 'wall_seconds': None, 'cpu_seconds': None, 'peak_memory_delta_mb': None,
+                  'new_high_water_mark_mb': None, 'rows': rows, 'depth': len(self._peak_stack)}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peak_stack:
+                self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+            tracemalloc.reset_peak()
+            start_memory = current
+        start_high_water = max_rss_mb()
+        self._peak_stack.append(0)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall_start
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            inner_peak = self._peak_stack.pop()
+            if self.trace_memory:
+                peak = max(tracemalloc.get_traced_memory()[1], inner_peak)
+                record['peak_memory_delta_mb'] = max(peak - start_memory, 0) / 1024 ** 2
+                if self._peak_stack:
+                    self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+                tracemalloc.reset_peak()
+            if start_high_water is not None:
+                record['new_high_water_mark_mb'] = max_rss_mb() - start_high_water
+            with self._lock:
+                self.records.append(record)
+
+    def wrap(self, name: str, task: Callable[[], Dict], rows: Optional[int] = None) -> Callable[[], Dict]:
+        """包装一个（可能在线程池中执行的）报告任务，执行时记录其耗时与线程 CPU 时间。"""
+        def timed_task():
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                return task()
+            finally:
+                record = {'stage': name, 'wall_seconds': time.perf_counter() - wall_start,
+                          'cpu_seconds': time.thread_time() - cpu_start, 'peak_memory_delta_mb': None,
+                          'new_high_water_mark_mb': None, 'rows': rows}
+                with self._lock:
+                    self.task_records.append(record)
+        return timed_task
+
+    def summary(self) -> List[Dict]:
+        """按阶段名汇总（流式分析中每个数据块都会重复各阶段）：耗时、CPU 与行数求和，内存取最大值，顺序为首次出现顺序。"""
+        totals = {}
+        for record in self.records:
+            total = totals.get(record['stage'])
+            if total is None:
+                totals[record['stage']] = dict(record, calls=1)
+                continue
+            total['calls'] += 1
+            for key in ('wall_seconds', 'cpu_seconds', 'rows'):
+                if record[key] is not None:
+                    total[key] = (total[key] or 0) + record[key]
+            for key in ('peak_memory_delta_mb', 'new_high_water_mark_mb'):
+                if record[key] is not None:
+                    total[key] = max(total[key] or 0, record[key])
+        return list(totals.values())
+
+    def report(self) -> Dict[str, List[Dict]]:
+        with self._lock:
+            return {'stages': [dict(r) for r in self.records], 'tasks': [dict(r) for r in self.task_records]}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.report(), ensure_ascii=False, **kwargs)
+
+
+def profiled_stage(name: Optional[str] = None):
+    """
+    分析器方法的装饰器：把整个方法作为一个阶段记录到 self.profiler，
+    行数取方法结束时 self.df 的行数。
+    """
+    def decorator(method):
+        stage_name = name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.profiler.stage(stage_name) as record:
+                result = method(self, *args, **kwargs)
+                if record['rows'] is None and self.df is not None:
+                    record['rows'] = len(self.df)
+            return result
+        return wrapper
+    return decorator
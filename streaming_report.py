@@ -0,0 +1,94 @@
+# streaming_report.py (版本 1.2 - 分块增量汇总的报告统计；词云短语按句统计)
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from word_frequency import FrequencyCounter
+
+
+class StreamingReportAccumulator:
+    """
+    【V10.5 增量汇总】
+    流式分析时，每处理完一个数据块就把该块的计数累加进来，处理完所有数据块后
+    再生成与 generate_feature_analysis_report 结构完全相同的报告。
+    只保存计数器，不保留任何逐行数据，因此内存占用与数据总量无关。
+    """
+
+    def __init__(self, feature_keywords: Dict, count_columns: List[str] = None,
+                 ngram_range: Tuple[int, int] = (1, 1), top_k: Optional[int] = None, stop_words: Iterable[str] = ()):
+        self.top_k = top_k
+        self.features = list(feature_keywords.keys())
+        self.count_columns = list(count_columns or [])
+        self.total_rows = 0
+        self.mentions = Counter()
+        self.positive_mentions = Counter()
+        self.negative_mentions = Counter()
+        self.rating_group_rows = Counter()
+        self.rating_group_mentions = {'high_ratings': Counter(), 'low_ratings': Counter()}
+        self.word_counts = {key: FrequencyCounter(ngram_range, stop_words) for key in ('high_rating_words', 'low_rating_words')}
+        self.value_counts = {col: Counter() for col in self.count_columns}
+
+    @property
+    def counts_phrases(self) -> bool:
+        """词云是否统计短语；是则 update 需要同时传入该块的短语文本。"""
+        return self.word_counts['high_rating_words'].counts_phrases
+
+    def update(self, chunk: pd.DataFrame, phrase_texts: Optional[pd.Series] = None):
+        """累加一个已完成逐行分析的数据块；phrase_texts 为与 chunk 同索引的短语文本（统计短语时需要）。"""
+        self.total_rows += len(chunk)
+        high_ratings = chunk['Rating'] >= 4
+        low_ratings = chunk['Rating'] <= 3
+        self.rating_group_rows['high_ratings'] += int(high_ratings.sum())
+        self.rating_group_rows['low_ratings'] += int(low_ratings.sum())
+
+        for feature in self.features:
+            if f'feature_{feature}' not in chunk.columns: continue
+            mentioned = chunk[f'feature_{feature}']
+            self.mentions[feature] += int(mentioned.sum())
+            self.positive_mentions[feature] += int((chunk[f'sentiment_{feature}'] == 1).sum())
+            self.negative_mentions[feature] += int((chunk[f'sentiment_{feature}'] == -1).sum())
+            self.rating_group_mentions['high_ratings'][feature] += int(mentioned[high_ratings].sum())
+            self.rating_group_mentions['low_ratings'][feature] += int(mentioned[low_ratings].sum())
+
+        # 词频按数据块顺序累加，计数器的插入顺序与整表统计时一致
+        for key, mask in (('high_rating_words', high_ratings), ('low_rating_words', low_ratings)):
+            if 'Processed_Text' in chunk.columns:
+                self.word_counts[key].update_texts(chunk.loc[mask, 'Processed_Text'])
+            if phrase_texts is not None:
+                self.word_counts[key].update_phrase_texts(phrase_texts[mask])
+
+        for col in self.count_columns:
+            if col in chunk.columns:
+                self.value_counts[col].update(chunk[col].astype(str).tolist())
+
+    def feature_analysis_report(self, min_frequency: int = 5) -> Dict:
+        """生成与 generate_feature_analysis_report 结构相同的报告。"""
+        feature_sentiment_stats = {}
+        for feature in self.features:
+            total_mentions = self.mentions[feature]
+            if total_mentions > 0:
+                feature_sentiment_stats[feature] = {
+                    'total_mentions': total_mentions,
+                    'positive_ratio': (self.positive_mentions[feature] / total_mentions * 100),
+                    'negative_ratio': (self.negative_mentions[feature] / total_mentions * 100)
+                }
+
+        rating_group_mention_rates = {'high_ratings': {}, 'low_ratings': {}}
+        for group, rates in rating_group_mention_rates.items():
+            n_rows = self.rating_group_rows[group]
+            for feature in self.features:
+                rates[feature] = (self.rating_group_mentions[group][feature] / n_rows * 100) if n_rows > 0 else 0
+
+        word_frequencies = {key: counter.most_common(min_frequency, self.top_k) for key, counter in self.word_counts.items()}
+
+        return {
+            'feature_sentiment_stats': feature_sentiment_stats,
+            'rating_group_mention_rates': rating_group_mention_rates,
+            'word_frequencies': word_frequencies
+        }
+
+    def distributions(self) -> Dict[str, Dict[str, int]]:
+        """返回各统计列（如情感类别、产品系列、用户分类）的取值分布。"""
+        return {col: dict(counts.most_common()) for col, counts in self.value_counts.items()}
@@ -0,0 +1,125 @@
+# tests/baseline_reference.py - 重写前（基线版本）的参考实现，供等价性测试逐条对比
+"""
+以下函数逐字保留了优化之前 ReviewAnalyzer 中的算法（正则全词匹配、逐行 TextBlob、iterrows 逐句归因），
+只去掉了 self 与打印。它们很慢，但语义就是“正确答案”：匹配引擎、矢量化归因与批量极性打分都必须与之一致。
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+
+def lowercase_keywords(feature_keywords: dict) -> dict:
+    """把词库中的关键词转为小写：基线的特征提及区分大小写，对比时两边都使用小写关键词。"""
+    return {feature: {sub_topic: [kw.lower() for kw in keywords] for sub_topic, keywords in sub_topics.items()}
+            for feature, sub_topics in feature_keywords.items()}
+
+
+def preprocess_text(text: str) -> str:
+    """基线 _preprocess_text：小写、去非字母字符、分词、去停用词与短词、词形还原。"""
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    from nltk.tokenize import word_tokenize
+
+    if not isinstance(text, str): return ""
+    text = text.lower()
+    text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+    tokens = word_tokenize(text)
+    stop_words = set(stopwords.words('english'))
+    lemmatizer = WordNetLemmatizer()
+    lemmatized_tokens = [
+        lemmatizer.lemmatize(word) for word in tokens
+        if word not in stop_words and len(word) > 2
+    ]
+    return ' '.join(lemmatized_tokens)
+
+
+def textblob_polarity(text) -> float:
+    """基线 analyze_sentiment 与句子归因中的逐条 TextBlob 极性。"""
+    from textblob import TextBlob
+    return TextBlob(text).sentiment.polarity
+
+
+def feature_mentioned(processed_text: str, sub_topics: dict) -> bool:
+    """基线“特征提及”：在预处理文本上执行 r'\\b(kw1|kw2|...)\\b'（区分大小写）。"""
+    all_keywords = [kw for kws in sub_topics.values() for kw in kws]
+    keyword_pattern = r'\b(' + '|'.join(list(set([re.escape(kw) for kw in all_keywords]))) + r')\b'
+    return bool(re.search(keyword_pattern, processed_text))
+
+
+def classify(text, rules: dict, default_value: str) -> str:
+    """基线 classify_by_rules：每个类别一个不区分大小写的 r'\\b(...)\\b' 正则，按配置顺序先命中者优先。"""
+    compiled_rules = {
+        category: re.compile(r'\b(' + '|'.join(keywords) + r')\b', re.IGNORECASE)
+        for category, keywords in rules.items()
+    }
+    text = str(text)
+    for category, pattern in compiled_rules.items():
+        if pattern.search(text):
+            return category
+    return default_value
+
+
+def attribute_feature_sentiments(df: pd.DataFrame, feature_keywords: dict, content_col: str, polarity=textblob_polarity) -> pd.DataFrame:
+    """
+    基线 _precompute_feature_sentiments：正则判断特征提及，再对提及了特征的评论 iterrows 逐句归因。
+    返回含 feature_* / sentiment_score_* / sentiment_* 列的新 DataFrame。
+    """
+    from nltk.tokenize import sent_tokenize
+
+    df = df.copy()
+    df['Processed_Text'] = df[content_col].apply(preprocess_text)
+    for feature, sub_topics in feature_keywords.items():
+        all_keywords = [kw for kws in sub_topics.values() for kw in kws]
+        keyword_pattern = r'\b(?:' + '|'.join(list(set([re.escape(kw) for kw in all_keywords]))) + r')\b'
+        df[f'feature_{feature}'] = df['Processed_Text'].str.contains(keyword_pattern, regex=True, na=False).astype(int)
+
+    for feature in feature_keywords.keys():
+        df[f'sentiment_score_{feature}'] = 0.0
+
+    mention_cols = [f'feature_{f}' for f in feature_keywords.keys()]
+    reviews_with_mentions = df[df[mention_cols].sum(axis=1) > 0]
+
+    for index, row in reviews_with_mentions.iterrows():
+        review_text = row[content_col]
+        if not isinstance(review_text, str) or pd.isna(review_text):
+            continue
+        sentences = sent_tokenize(review_text)
+        for feature, sub_topics in feature_keywords.items():
+            if row[f'feature_{feature}'] == 1:
+                feature_sentiments = []
+                for sentence in sentences:
+                    processed_sentence = preprocess_text(sentence)
+                    sentence_polarity = 0
+                    strong_sentiment_found = False
+                    for sub_topic, keywords in sub_topics.items():
+                        if not keywords: continue
+                        pattern = r'\b(' + '|'.join([re.escape(kw) for kw in keywords]) + r')\b'
+                        if re.search(pattern, processed_sentence, re.IGNORECASE):
+                            if sub_topic.startswith('正面'):
+                                sentence_polarity = 1.0
+                                strong_sentiment_found = True
+                                break
+                            elif sub_topic.startswith('负面'):
+                                sentence_polarity = -1.0
+                                strong_sentiment_found = True
+                                break
+                    if not strong_sentiment_found:
+                        for sub_topic, keywords in sub_topics.items():
+                            if sub_topic.startswith(('正面', '负面')): continue
+                            if not keywords: continue
+                            pattern = r'\b(' + '|'.join([re.escape(kw) for kw in keywords]) + r')\b'
+                            if re.search(pattern, processed_sentence, re.IGNORECASE):
+                                sentence_polarity = polarity(sentence)
+                                break
+                    if sentence_polarity != 0:
+                        feature_sentiments.append(sentence_polarity)
+                if feature_sentiments:
+                    df.loc[index, f'sentiment_score_{feature}'] = sum(feature_sentiments) / len(feature_sentiments)
+
+    for feature in feature_keywords.keys():
+        score_col = f'sentiment_score_{feature}'
+        conditions = [df[score_col] > 0.05, df[score_col] < -0.05]
+        df[f'sentiment_{feature}'] = np.select(conditions, [1, -1], default=0)
+    return df
@@ -0,0 +1,89 @@
+# tests/conftest.py - 测试公用的夹具：仓库根目录导入路径、NLTK 数据检查、合成评论数据与分析配置
+
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+PROFILE = "霓虹笔专属画像"
+
+
+def _missing_nltk_data():
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    from nltk.tokenize import sent_tokenize, word_tokenize
+
+    try:
+        word_tokenize(sent_tokenize("Great pens. Love them.")[0])
+        stopwords.words('english')
+        WordNetLemmatizer().lemmatize('markers')
+    except LookupError as e:
+        return str(e).strip().splitlines()[0] if str(e).strip() else 'LookupError'
+    return None
+
+
+@pytest.fixture(scope='session')
+def nltk_data():
+    """需要 NLTK 数据包（punkt / stopwords / wordnet）的测试使用；缺少时跳过而不是联网下载。"""
+    missing = _missing_nltk_data()
+    if missing:
+        pytest.skip(f"缺少 NLTK 数据包: {missing}")
+
+
+@pytest.fixture(scope='session')
+def reviews():
+    """300 条可复现的合成评论（Content / Rating / Asin / Date）。"""
+    from benchmarks.synthetic_reviews import generate_reviews
+    return generate_reviews(300, seed=7)
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """
+    返回构建分析配置的函数：与应用相同的规则与设置，但默认不使用任何磁盘缓存，输出写入临时目录。
+    overrides 中的键直接覆盖配置项。
+    """
+    from analysis_config import build_analysis_config
+
+    def build(input_filepath=None, profile=PROFILE, **overrides):
+        config = build_analysis_config(input_filepath, profile, category_mapping={'B0SYNTH001': '系列A', 'B0SYNTH002': '系列B'},
+                                       output_filepath=str(tmp_path / 'processed_data.csv'),
+                                       report_output_path=str(tmp_path / 'final_report.html'), use_caches=False)
+        config.update(overrides)
+        return config
+    return build
+
+
+@pytest.fixture
+def reviews_file(tmp_path, reviews):
+    """把合成评论写成指定格式的文件并返回路径。"""
+    def write(extension='parquet', frame=None):
+        frame = reviews if frame is None else frame
+        path = tmp_path / f'reviews.{extension}'
+        if extension == 'xlsx':
+            frame.to_excel(path, index=False)
+        elif extension == 'csv':
+            frame.to_csv(path, index=False)
+        elif extension in ('arrow', 'feather'):
+            frame.reset_index(drop=True).to_feather(path)
+        else:
+            frame.to_parquet(path, index=False)
+        return str(path)
+    return write
+
+
+
+@pytest.fixture
+def run_analysis(nltk_data, make_config, reviews_file):
+    """对合成评论（或给定的 DataFrame）执行核心分析流程，返回分析器；overrides 覆盖配置项。"""
+    from review_analyzer_core import ReviewAnalyzer
+
+    def run(frame=None, extension='parquet', profile=PROFILE, **overrides):
+        analyzer = ReviewAnalyzer(make_config(reviews_file(extension, frame), profile, **overrides), profile)
+        assert analyzer.run_analysis() is not None
+        return analyzer
+    return run
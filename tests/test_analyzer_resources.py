@@ -0,0 +1,83 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from analysis_config import DEFAULT_CLASSIFICATIONS
+from conftest import PROFILE
+from review_analyzer_core import ReviewAnalyzer
+
+
+@pytest.fixture
+def resources(nltk_data, make_config):
+    return ReviewAnalyzer.build_resources(make_config(), PROFILE)
+
+
+def _analyze(config, resources=None):
+    analyzer = ReviewAnalyzer(config, PROFILE, resources=resources)
+    analyzer.run_analysis()
+    analyzer.classify_all(DEFAULT_CLASSIFICATIONS)
+    analyzer.save_results()
+    return analyzer, open(config['output_filepath'], 'rb').read(), analyzer.generate_feature_analysis_report()
+
+
+def test_shared_resources_give_the_same_results(resources, make_config, reviews_file, tmp_path):
+    path = reviews_file()
+    own, own_csv, own_report = _analyze(make_config(path, output_filepath=str(tmp_path / 'own.csv')))
+    shared, shared_csv, shared_report = _analyze(make_config(path, output_filepath=str(tmp_path / 'shared.csv')), resources)
+    assert shared.matcher is resources.matcher and shared.normalizer is resources.normalizer
+    assert shared.config['feature_keywords'] == own.config['feature_keywords']
+    assert shared_csv == own_csv
+    assert shared_report == own_report
+
+
+def test_build_resources_leaves_the_config_untouched(nltk_data, make_config):
+    config = make_config()
+    before = copy.deepcopy(config)
+    ReviewAnalyzer.build_resources(config, PROFILE)
+    assert config == before and 'feature_keywords' not in config
+
+
+def test_each_analyzer_gets_its_own_keyword_dict(resources, make_config):
+    first = ReviewAnalyzer(make_config(), PROFILE, resources=resources)
+    second = ReviewAnalyzer(make_config(), PROFILE, resources=resources)
+    feature, sub_topics = next(iter(first.config['feature_keywords'].items()))
+    next(iter(sub_topics.values())).append('edited keyword')
+    first.config['feature_keywords']['新特征'] = {'正面-新': ['new']}
+    assert 'edited keyword' not in next(iter(resources.feature_keywords[feature].values()))
+    assert '新特征' not in resources.feature_keywords
+    assert second.config['feature_keywords'] == resources.feature_keywords
+
+
+def test_resources_key_tracks_only_resource_inputs(make_config):
+    config = make_config()
+    key = ReviewAnalyzer.resources_key(config, PROFILE)
+    # 输入/输出路径等与资源无关的设置不影响指纹
+    assert ReviewAnalyzer.resources_key(make_config('other.csv', output_filepath='x.csv', diagnostic_workers=7), PROFILE) == key
+    assert ReviewAnalyzer.resources_key(copy.deepcopy(config), PROFILE) == key
+    rules = copy.deepcopy(config['classification_rules'])
+    rules['User_Role']['新角色'] = ['newcomer']
+    changed = [
+        ReviewAnalyzer.resources_key(config, 'standard'),
+        ReviewAnalyzer.resources_key(dict(config, classification_rules=rules), PROFILE),
+        ReviewAnalyzer.resources_key(dict(config, polarity_cache_size=10), PROFILE),
+        ReviewAnalyzer.resources_key(dict(config, lemma_cache_size=10), PROFILE),
+        ReviewAnalyzer.resources_key(dict(config, base_keywords={}), PROFILE),
+    ]
+    assert key not in changed and len(set(changed)) == len(changed)
+
+
+def test_sessions_can_share_resources_across_threads(resources, make_config, reviews, tmp_path):
+    """多个会话在不同线程中同时使用同一份资源，结果与各自串行运行相同。"""
+    jobs = []
+    for i, frame in enumerate((reviews.head(150), reviews.tail(150), reviews.sample(150, random_state=1))):
+        path = str(tmp_path / f'reviews_{i}.parquet')
+        frame.to_parquet(path)
+        jobs.append((path, str(tmp_path / f'threaded_{i}.csv'), str(tmp_path / f'serial_{i}.csv')))
+
+    def run(path, output):
+        return _analyze(make_config(path, output_filepath=output, diagnostic_workers=1), resources)[1:]
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        threaded = list(executor.map(lambda job: run(job[0], job[1]), jobs))
+    assert threaded == [run(path, serial) for path, _, serial in jobs]
@@ -0,0 +1,88 @@
+import json
+import os
+
+import pytest
+
+import report_pipeline
+from conftest import PROFILE
+from report_pipeline import build_report
+
+
+@pytest.fixture
+def batch_inputs(nltk_data, reviews, tmp_path):
+    """两份不同的评论文件（放在不同目录、同名），以及一个不存在的文件。"""
+    paths = []
+    for name, frame in (('a', reviews.head(150)), ('b', reviews.tail(150))):
+        os.makedirs(tmp_path / name)
+        path = str(tmp_path / name / 'reviews.csv')
+        frame.to_csv(path, index=False)
+        paths.append(path)
+    return paths, str(tmp_path / 'missing.csv')
+
+
+def _outputs(summaries):
+    return [(open(summary['csv'], 'rb').read(), summary['rows']) for summary in summaries]
+
+
+def test_build_report_takes_the_profile_from_config(batch_inputs, make_config, tmp_path, monkeypatch):
+    """build_report(config, inputs) 只传两个参数即可运行：画像取自 build_analysis_config 记下的 product_type。"""
+    monkeypatch.chdir(tmp_path)
+    paths, _ = batch_inputs
+    config = make_config()
+    assert config['product_type'] == PROFILE
+    summaries = build_report(config, paths)
+    assert [summary['error'] for summary in summaries] == [None, None]
+    assert [os.path.basename(summary['html']) for summary in summaries] == ['reviews_report.html', 'reviews_2_report.html']
+    assert all(os.path.exists(summary['html']) and os.path.dirname(summary['csv']) == '.' for summary in summaries)
+
+    explicit = build_report(config, paths, PROFILE, output_dir=str(tmp_path / 'explicit'), result_cache_dir=None)
+    assert _outputs(explicit) == _outputs(summaries)
+
+
+def test_build_report_defaults_the_profile(batch_inputs, make_config, tmp_path, monkeypatch):
+    used = []
+    original = report_pipeline.generate_report
+    def recording_generate_report(analyzer, product_type, *args, **kwargs):
+        used.append((product_type, analyzer.product_type))
+        return original(analyzer, product_type, *args, **kwargs)
+    monkeypatch.setattr(report_pipeline, 'generate_report', recording_generate_report)
+
+    paths, _ = batch_inputs
+    config = make_config()
+    del config['product_type']
+    summaries = build_report(config, paths[:1], output_dir=str(tmp_path / 'out'), result_cache_dir=None)
+    assert summaries[0]['error'] is None
+    assert used == [(report_pipeline.DEFAULT_PRODUCT_TYPE, report_pipeline.DEFAULT_PRODUCT_TYPE)]
+
+
+def test_failed_file_does_not_stop_the_batch(batch_inputs, make_config, tmp_path):
+    paths, missing = batch_inputs
+    summaries = build_report(make_config(), [paths[0], missing, paths[1]], output_dir=str(tmp_path / 'out'), result_cache_dir=None)
+    assert [summary['input'] for summary in summaries] == [paths[0], missing, paths[1]]
+    assert summaries[1]['error'] and summaries[1]['rows'] == 0
+    assert summaries[0]['error'] is None and summaries[2]['error'] is None
+
+
+def test_parallel_batch_matches_serial(batch_inputs, make_config, tmp_path):
+    paths, _ = batch_inputs
+    serial = build_report(make_config(), paths, output_dir=str(tmp_path / 'serial'), result_cache_dir=None)
+    parallel = build_report(make_config(), paths, output_dir=str(tmp_path / 'parallel'), max_workers=2, result_cache_dir=None)
+    assert [summary['error'] for summary in parallel] == [None, None]
+    assert _outputs(parallel) == _outputs(serial)
+
+
+def test_cli_exit_codes_and_summary(batch_inputs, tmp_path, monkeypatch):
+    from batch_report import main
+
+    monkeypatch.chdir(tmp_path)
+    paths, missing = batch_inputs
+    summary_path = str(tmp_path / 'reports' / 'summary.json')
+    assert main([os.path.dirname(paths[0]), '--no-cache', '--workers', '1', '--output-dir', 'reports', '--summary', summary_path]) == 0
+    with open(summary_path, encoding='utf-8') as f:
+        summaries = json.load(f)
+    assert [summary['input'] for summary in summaries] == [paths[0]] and summaries[0]['rows'] > 0
+    assert os.path.exists(os.path.join('reports', 'reviews_report.html'))
+
+    assert main([paths[0], missing, '--no-cache', '--workers', '1', '--output-dir', 'reports']) == 1
+    os.makedirs(tmp_path / 'empty')
+    assert main([str(tmp_path / 'empty')]) == 1
@@ -0,0 +1,72 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.run_benchmarks import compare_results, corpus_path
+from benchmarks.synthetic_reviews import ASINS, DATE_RANGE, generate_reviews, write_corpus
+
+
+def test_generator_is_deterministic_per_seed():
+    first, again, other = generate_reviews(200, seed=3), generate_reviews(200, seed=3), generate_reviews(200, seed=4)
+    pd.testing.assert_frame_equal(first, again)
+    assert not first['Content'].equals(other['Content'])
+    assert len(generate_reviews(0, seed=3)) == 0
+
+
+def test_generated_reviews_follow_the_documented_shape():
+    df = generate_reviews(2000, seed=0)
+    assert list(df.columns) == ['Content', 'Rating', 'Asin', 'Date']
+    assert set(df['Rating']) <= {1, 2, 3, 4, 5} and (df['Rating'] == 5).mean() > 0.5
+    assert set(df['Asin']) <= set(ASINS)
+    dates = df['Date'].dropna()
+    assert dates.min() >= pd.Timestamp(DATE_RANGE[0]) and dates.max() <= pd.Timestamp(DATE_RANGE[1])
+    assert 0 < df['Date'].isna().mean() < 0.03
+    # 日期偏向近期：最后一年的评论多于第一年
+    years = dates.dt.year.value_counts()
+    assert years[int(DATE_RANGE[1][:4])] > years[int(DATE_RANGE[0][:4])]
+
+
+@pytest.mark.parametrize('extension', ['xlsx', 'csv', 'parquet'])
+def test_write_corpus_round_trips_and_reuses_existing_files(tmp_path, extension):
+    path = str(tmp_path / 'data' / f'reviews.{extension}')
+    assert write_corpus(120, path, seed=5) == path
+    read = {'xlsx': pd.read_excel, 'csv': pd.read_csv, 'parquet': pd.read_parquet}[extension](path)
+    expected = generate_reviews(120, seed=5)
+    assert read['Content'].tolist() == expected['Content'].tolist()
+    assert read['Rating'].tolist() == expected['Rating'].tolist()
+    mtime = os.path.getmtime(path)
+    write_corpus(120, path, seed=6)
+    assert os.path.getmtime(path) == mtime and os.listdir(tmp_path / 'data') == [f'reviews.{extension}']
+
+
+def test_auto_format_switches_to_parquet_for_large_corpora():
+    assert corpus_path(1_000, 0, 'auto').endswith('reviews_1000_seed0.xlsx')
+    assert corpus_path(1_000_000, 0, 'auto').endswith('reviews_1000000_seed0.parquet')
+    assert corpus_path(1_000, 2, 'csv').endswith('reviews_1000_seed2.csv')
+
+
+def _result(commit, app_flow, stages, streaming=None, rows=1000):
+    run = {'rows_requested': rows, 'app_flow_seconds': app_flow, 'peak_rss_mb': 100.0,
+           'stages': [{'stage': name, 'wall_seconds': seconds} for name, seconds in stages]}
+    if streaming is not None:
+        run['streaming'] = {'wall_seconds': streaming}
+    return {'environment': {'git_commit': commit, 'timestamp': 't'}, 'settings': {}, 'runs': [run]}
+
+
+def test_compare_results_reports_ratios_per_stage():
+    baseline = _result('old', 10.0, [('analyze_sentiment', 4.0), ('save_results', 1.0)], streaming=8.0)
+    current = _result('new', 5.0, [('analyze_sentiment', 1.0), ('save_results', 1.0), ('new_stage', 0.5)], streaming=4.0)
+    lines = compare_results(baseline, current).splitlines()
+    assert lines[0].startswith('基准: old') and '当前: new' in lines[0]
+    by_name = {line.split()[0]: line.split() for line in lines[1:] if line.startswith('  ')}
+    assert by_name['app_flow'][-1] == '0.50x'
+    assert by_name['analyze_sentiment'][-1] == '0.25x'
+    assert by_name['save_results'][-1] == '1.00x'
+    assert by_name['streaming'][-1] == '0.50x'
+    assert by_name['new_stage'][-1] == '-'  # 基准中没有该阶段
+
+
+def test_compare_results_skips_sizes_missing_from_the_baseline():
+    text = compare_results(_result('old', 1.0, [], rows=1000), _result('new', 1.0, [], rows=10_000))
+    assert '10000 行' not in text
@@ -0,0 +1,40 @@
+from analysis_config import DEFAULT_CLASSIFICATIONS
+
+import baseline_reference as baseline
+
+
+def test_classify_all_matches_per_dimension_regex(run_analysis):
+    """一次扫描的多维度分类与基线“每个维度、每个类别一个正则”的逐条结果一致。"""
+    analyzer = run_analysis()
+    result = analyzer.classify_all(DEFAULT_CLASSIFICATIONS)
+    contents = analyzer.df[analyzer.config['content_column']]
+    assert list(result.columns) == [dimension[0] for dimension in DEFAULT_CLASSIFICATIONS]
+    for new_column_name, classification_key, default_value in DEFAULT_CLASSIFICATIONS:
+        rules = analyzer.config['classification_rules'][classification_key]
+        expected = [baseline.classify(text, rules, default_value) for text in contents]
+        assert analyzer.df[new_column_name].tolist() == expected, new_column_name
+        assert analyzer.df[new_column_name].nunique() > 1, new_column_name
+
+
+def test_classify_by_rules_equals_classify_all(run_analysis):
+    analyzer = run_analysis()
+    analyzer.classify_by_rules('Role_Alone', 'User_Role', '未明确')
+    analyzer.classify_all([('Role_Together', 'User_Role', '未明确'), ('Gender', 'Gender', '未知性别')])
+    assert analyzer.df['Role_Alone'].tolist() == analyzer.df['Role_Together'].tolist()
+
+
+def test_missing_rules_fall_back_to_default(run_analysis):
+    analyzer = run_analysis()
+    analyzer.classify_all([('Unknown', 'No_Such_Rules', '其他')])
+    assert (analyzer.df['Unknown'] == '其他').all()
+
+
+def test_classification_survives_external_frames(run_analysis, reviews):
+    """classify_all 处理不在预计算索引中的评论（例如替换了 self.df）时重新扫描原文，结果仍与基线一致。"""
+    analyzer = run_analysis()
+    frame = reviews.head(40).copy()
+    frame.index += 10_000
+    analyzer.df = frame
+    analyzer.classify_all([('User_Role', 'User_Role', '未明确')])
+    rules = analyzer.config['classification_rules']['User_Role']
+    assert frame['User_Role'].tolist() == [baseline.classify(text, rules, '未明确') for text in frame['Content']]
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis_config import DEFAULT_CLASSIFICATIONS
+
+
+@pytest.fixture
+def classified_pair(run_analysis, tmp_path):
+    """同一份数据的两次完整分析与分类：一个保持原始类型，一个调用 compact_memory 压缩。"""
+    def run(**overrides):
+        plain = run_analysis(output_filepath=str(tmp_path / 'plain.csv'), **overrides)
+        plain.classify_all(DEFAULT_CLASSIFICATIONS)
+        compact = run_analysis(output_filepath=str(tmp_path / 'compact.csv'), **overrides)
+        compact.classify_all(DEFAULT_CLASSIFICATIONS)
+        sizes = compact.compact_memory()
+        return plain, compact, sizes
+    return run
+
+
+def test_compact_memory_narrows_dtypes(classified_pair):
+    _, analyzer, sizes = classified_pair()
+    assert sizes['after_bytes'] < sizes['before_bytes']
+    for feature in analyzer.config['feature_keywords']:
+        assert analyzer.df[f'feature_{feature}'].dtype == np.int8
+        assert analyzer.df[f'sentiment_{feature}'].dtype == np.int8
+        assert analyzer.df[f'sentiment_score_{feature}'].dtype == np.float32
+    for keyword in analyzer.config['keywords']:
+        assert analyzer.df[f'has_{keyword}'].dtype == np.int8
+    for column in analyzer.CATEGORICAL_COLUMNS:
+        if column in analyzer.df.columns:
+            assert isinstance(analyzer.df[column].dtype, pd.CategoricalDtype), column
+    # 类别按首次出现顺序排列
+    role = analyzer.df['User_Role']
+    assert list(role.cat.categories) == list(pd.unique(role.astype(object)))
+
+
+@pytest.mark.parametrize('lean_memory', [False, True])
+def test_compacted_results_match_uncompacted(classified_pair, lean_memory):
+    """压缩前后导出的 CSV 字节一致，特征报告与全面诊断结果相同。"""
+    plain, compact, _ = classified_pair(lean_memory=lean_memory)
+    plain.save_results()
+    compact.save_results()
+    assert open(compact.config['output_filepath'], 'rb').read() == open(plain.config['output_filepath'], 'rb').read()
+    assert compact.generate_feature_analysis_report() == plain.generate_feature_analysis_report()
+    assert compact.run_comprehensive_feature_diagnostics() == plain.run_comprehensive_feature_diagnostics()
+    assert compact.run_comprehensive_user_diagnostics() == plain.run_comprehensive_user_diagnostics()
+
+
+def test_compact_memory_without_data_is_a_no_op(nltk_data, make_config):
+    from review_analyzer_core import ReviewAnalyzer
+
+    assert ReviewAnalyzer(make_config(), 'standard').compact_memory() == {'before_bytes': 0, 'after_bytes': 0}
+
+
+def test_full_df_keeps_all_periods(run_analysis):
+    """full_df 是核心分析完成时的全时段数据：按时段替换 self.df 后仍返回全部评论，且不另存副本。"""
+    analyzer = run_analysis()
+    analyzer.classify_all(DEFAULT_CLASSIFICATIONS)
+    analyzer.compact_memory()
+    processed_df = analyzer.df
+    assert analyzer.full_df is processed_df
+    analyzer.df = processed_df[processed_df['Rating'] <= 2]
+    assert analyzer.full_df is processed_df and 'User_Role' in analyzer.full_df.columns
+    analyzer.reset()
+    assert analyzer.full_df is None
+
+
+def test_full_df_falls_back_to_loaded_frame(nltk_data, make_config, reviews):
+    from review_analyzer_core import ReviewAnalyzer
+
+    analyzer = ReviewAnalyzer(make_config(), 'standard')
+    analyzer.df = reviews
+    assert analyzer.full_df is reviews
+
+
+def test_lean_memory_keeps_the_exported_schema(run_analysis, tmp_path):
+    """精简内存模式释放 Processed_Text，但导出的 CSV 与普通模式字节一致。"""
+    exports = []
+    for lean_memory in (False, True):
+        analyzer = run_analysis(lean_memory=lean_memory, output_filepath=str(tmp_path / f'lean_{lean_memory}.csv'))
+        analyzer.classify_all(DEFAULT_CLASSIFICATIONS)
+        assert ('Processed_Text' in analyzer.df.columns) != lean_memory
+        analyzer.save_results()
+        exports.append(open(analyzer.config['output_filepath'], 'rb').read())
+    assert exports[0] == exports[1]
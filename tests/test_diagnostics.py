@@ -0,0 +1,110 @@
+import pytest
+
+from analysis_config import DEFAULT_CLASSIFICATIONS
+from report_pipeline import build_time_periods
+
+
+@pytest.fixture
+def classified(run_analysis):
+    """完成核心分析、用户画像分类与时间维度的分析器（与报告流程步骤 2~4 相同）。"""
+    def run(**overrides):
+        analyzer = run_analysis(**overrides)
+        analyzer.classify_all(DEFAULT_CLASSIFICATIONS)
+        analyzer.compact_memory()
+        time_periods = build_time_periods(analyzer.df, analyzer.config['date_column'])
+        return analyzer, time_periods
+    return run
+
+
+def _reports_per_period_copy(analyzer, time_periods, min_period_size=10):
+    """基线做法：逐时段复制 DataFrame，再分别运行特征与用户群体的全面诊断。"""
+    processed_df = analyzer.df
+    reports = {}
+    for period_key in time_periods:
+        if period_key == "_ALL_": period_df = processed_df
+        elif 'Q' in period_key: period_df = processed_df[processed_df['Quarter'] == period_key]
+        else: period_df = processed_df[processed_df['Year'] == int(period_key)]
+        if len(period_df) < min_period_size: continue
+        analyzer.df = period_df.copy()
+        reports[period_key] = analyzer.run_comprehensive_feature_diagnostics() + analyzer.run_comprehensive_user_diagnostics()
+    analyzer.df = processed_df
+    return reports
+
+
+def test_period_diagnostics_match_per_period_copies(classified):
+    analyzer, time_periods = classified()
+    assert len(time_periods) > 5
+    reports = analyzer.run_period_diagnostics(analyzer.df, time_periods, min_period_size=10)
+    expected = _reports_per_period_copy(analyzer, time_periods)
+    assert list(reports) == list(expected)
+    assert len(reports['_ALL_']) == 2 * len(analyzer.config['feature_keywords']) + analyzer.df['User_Role'].nunique()
+    assert reports == expected
+
+
+def test_small_periods_are_skipped(classified):
+    analyzer, time_periods = classified()
+    reports = analyzer.run_period_diagnostics(analyzer.df, time_periods, min_period_size=len(analyzer.df))
+    assert list(reports) == ['_ALL_']
+
+
+def test_report_tasks_keep_task_order():
+    import time
+    from diagnostics_engine import run_report_tasks
+
+    tasks = [lambda i=i: (time.sleep(0.01 * (5 - i)), i)[1] for i in range(5)]
+    assert run_report_tasks(tasks, max_workers=4) == list(range(5))
+    assert run_report_tasks(tasks, max_workers=1) == list(range(5))
+
+
+def test_parallel_diagnostics_match_serial(classified):
+    serial, time_periods = classified(diagnostic_workers=1)
+    parallel, _ = classified(diagnostic_workers=4)
+    assert parallel.diagnostic_workers == 4
+    assert parallel.run_comprehensive_feature_diagnostics() == serial.run_comprehensive_feature_diagnostics()
+    assert parallel.run_comprehensive_user_diagnostics() == serial.run_comprehensive_user_diagnostics()
+    assert (parallel.run_period_diagnostics(parallel.df, time_periods)
+            == serial.run_period_diagnostics(serial.df, time_periods))
+
+
+@pytest.fixture
+def uncompacted(run_analysis):
+    """分类后未压缩类型的分析器：标签列仍是普通对象列，与基线逐群体复制的 DataFrame 相同。"""
+    analyzer = run_analysis()
+    analyzer.classify_all(DEFAULT_CLASSIFICATIONS)
+    return analyzer
+
+
+def _masks(df):
+    return {'low_ratings': df['Rating'] <= 3, 'user_role': df['User_Role'] == df['User_Role'].iloc[0],
+            'nobody': df['Rating'] > 5}
+
+
+def test_segment_statistics_match_dataframe_copies(uncompacted):
+    df = uncompacted.df
+    for name, mask in _masks(df).items():
+        segment, copy = uncompacted.segment(mask), df[mask].copy()
+        assert len(segment) == len(copy), name
+        for column in ('User_Role', 'Usage', 'Product_Category'):
+            expected = copy[column].value_counts()
+            actual = segment.value_counts(column)
+            assert list(actual.items()) == list(expected.items()), (name, column)
+        feature_cols = segment.base.feature_cols
+        if len(copy):
+            assert segment.feature_mention_rates().to_dict() == copy[feature_cols].mean().to_dict(), name
+            assert segment.mean('Rating') == pytest.approx(copy['Rating'].mean())
+            expected_pairs = copy[feature_cols].corr().unstack().sort_values(ascending=False)
+            assert [pair[:2] for pair in segment.sorted_feature_pairs()] == list(expected_pairs.index), name
+
+
+def test_reports_accept_segments_and_dataframes(uncompacted):
+    df = uncompacted.df
+    for name, mask in _masks(df).items():
+        segment = uncompacted.segment(mask)
+        copy = df[mask].copy()
+        assert uncompacted.analyze_top_praises(copy) == uncompacted.analyze_top_praises(segment), name
+        assert uncompacted.analyze_top_complaints(copy) == uncompacted.analyze_top_complaints(segment), name
+        assert uncompacted._calculate_feature_lift(copy) == uncompacted._calculate_feature_lift(segment), name
+        # 外部构造、索引无法映射回 self.df 的 DataFrame 单独构建底座，结果相同
+        detached = copy.reset_index(drop=True)
+        detached.index += len(df)
+        assert uncompacted.analyze_top_complaints(detached) == uncompacted.analyze_top_complaints(segment), name
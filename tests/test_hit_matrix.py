@@ -0,0 +1,45 @@
+import re
+
+import numpy as np
+
+import baseline_reference as baseline
+
+
+def test_hit_matrix_rows_equal_per_review_scans(run_analysis):
+    analyzer = run_analysis(lean_memory=False)
+    df = analyzer.df
+    assert analyzer._hit_matrix.shape == (len(df), len(analyzer.matcher.sub_topic_keys))
+    for row, text in enumerate(df['Processed_Text']):
+        assert set(np.flatnonzero(analyzer._hit_matrix[row])) == analyzer.matcher.scan_sub_topics(text)
+
+
+def test_feature_flags_match_baseline_regex(run_analysis):
+    """特征提及列与基线正则一致（基线区分大小写，这里对比小写后的关键词，见 test_keyword_matcher）。"""
+    analyzer = run_analysis(lean_memory=False)
+    df = analyzer.df
+    for feature, sub_topics in analyzer.config['feature_keywords'].items():
+        lowered = {sub_topic: [kw.lower() for kw in keywords] for sub_topic, keywords in sub_topics.items()}
+        expected = [int(baseline.feature_mentioned(text, lowered)) for text in df['Processed_Text']]
+        assert df[f'feature_{feature}'].tolist() == expected, feature
+
+
+def test_segment_sub_topic_counts_match_regex_counts(run_analysis):
+    """群体内各子主题的命中评论数等于基线对该群体逐个子主题执行 str.contains 的结果。"""
+    analyzer = run_analysis(lean_memory=False)
+    df = analyzer.df
+    mask = (df['Rating'] <= 3).to_numpy()
+    counts = analyzer.segment(mask).sub_topic_counts()
+    texts = df.loc[mask, 'Processed_Text']
+    for feature, sub_topics in analyzer.config['feature_keywords'].items():
+        for sub_topic, keywords in sub_topics.items():
+            if not keywords:
+                continue
+            pattern = r'\b(?:' + '|'.join(re.escape(kw.lower()) for kw in keywords) + r')\b'
+            expected = int(texts.str.contains(pattern, regex=True).sum())
+            assert counts[analyzer.matcher.sub_topic_id(feature, sub_topic)] == expected, (feature, sub_topic)
+
+
+def test_overall_mention_rates_follow_feature_columns(run_analysis):
+    analyzer = run_analysis()
+    columns = [f'feature_{f}' for f in analyzer.config['feature_keywords']]
+    np.testing.assert_allclose(analyzer._overall_mention_rates[columns].to_numpy(), analyzer.df[columns].mean().to_numpy())
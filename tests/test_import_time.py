@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks import import_time
+
+
+@pytest.mark.parametrize('module', list(import_time.IMPORT_BUDGETS_MS))
+def test_entry_modules_defer_heavy_dependencies(module):
+    """入口模块导入时不加载 NLTK / TextBlob / pyarrow / openpyxl（在子进程中拦截这些包）。"""
+    result = import_time.measure_import(module, runs=1)
+    assert result['deferred_error'] is None, result['deferred_error']
+
+
+def test_budget_violations_fail_the_check(capsys):
+    assert import_time.main(['--modules', 'review_io', '--runs', '1', '--budget-ms', '0']) == 1
+    assert '❌ review_io' in capsys.readouterr().out
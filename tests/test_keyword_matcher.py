@@ -0,0 +1,75 @@
+import pytest
+
+from analysis_config import BASE_CLASSIFICATION_RULES, BASE_FEATURE_KEYWORDS
+from keyword_matcher import KeywordMatcher
+
+import baseline_reference as baseline
+
+EDGE_CASE_REVIEWS = [
+    "My mom's favorite set. She is an ARTIST and a Teacher.",
+    "Momentum is not a mom. Kids-friendly markers for my kids!",
+    "The ink dried out after two days; the tips frayed and the colors bleed.",
+    "Good Copic alternative, blends with other alcohol markers, true to color.",
+    "",
+    "!!!",
+]
+
+
+def test_feature_mentions_match_baseline_regex(nltk_data, reviews):
+    """在预处理文本上，前缀树的特征提及与基线 \\b(...)\\b 正则逐条一致（基线区分大小写，故对比小写关键词）。"""
+    keywords = baseline.lowercase_keywords(BASE_FEATURE_KEYWORDS)
+    matcher = KeywordMatcher(keywords)
+    texts = list(reviews['Content']) + EDGE_CASE_REVIEWS
+    mismatches = []
+    for text in texts:
+        processed = baseline.preprocess_text(text)
+        hits = matcher.scan_sub_topics(processed)
+        for feature, sub_topics in keywords.items():
+            expected = baseline.feature_mentioned(processed, sub_topics)
+            actual = any(key_id in hits for key_id in matcher.sub_topic_ids(feature))
+            if expected != actual:
+                mismatches.append((text, feature, expected))
+    assert mismatches == []
+
+
+def test_classification_matches_baseline_regex(reviews):
+    """分类维度“先命中者优先”的结果与基线逐类别正则（不区分大小写）逐条一致。"""
+    matcher = KeywordMatcher({}, BASE_CLASSIFICATION_RULES)
+    texts = list(reviews['Content']) + EDGE_CASE_REVIEWS
+    for dimension, rules in BASE_CLASSIFICATION_RULES.items():
+        expected = [baseline.classify(text, rules, '默认') for text in texts]
+        actual = [matcher.classify(matcher.scan_categories(text), dimension, '默认') for text in texts]
+        assert actual == expected, dimension
+
+
+def test_keywords_match_case_insensitively():
+    """
+    关键词匹配有意不区分大小写：含大写字母的配置关键词（如 'good Copic alternative'）也会命中小写的预处理文本。
+    基线的特征提及正则区分大小写，这类关键词从未命中过；此处固定新的行为。
+    """
+    assert 'good Copic alternative' in BASE_FEATURE_KEYWORDS['绘画表现']['正面-兼容酒精性马克笔']
+    matcher = KeywordMatcher({'兼容性': {'正面-兼容': ['good Copic alternative']}}, {'User_Role': {'艺术家': ['Artist']}})
+    assert matcher.scan_sub_topics('good copic alternative') == {matcher.sub_topic_id('兼容性', '正面-兼容')}
+    assert matcher.classify(matcher.scan_categories('I am an ARTIST.'), 'User_Role', '未明确') == '艺术家'
+    assert matcher.classify(matcher.scan_categories('artistic license'), 'User_Role', '未明确') == '未明确'
+
+
+def test_overlapping_keywords_all_hit():
+    matcher = KeywordMatcher({'颜色': {'中性-颜色': ['color'], '正面-准确': ['color accuracy', 'accuracy great']}})
+    hits = matcher.scan_sub_topics('color accuracy great')
+    assert hits == {matcher.sub_topic_id('颜色', '中性-颜色'), matcher.sub_topic_id('颜色', '正面-准确')}
+
+
+def test_first_matching_category_wins_in_config_order():
+    rules = {'Gender': {'女性': ['wife', 'daughter'], '男性': ['husband', 'son']}}
+    matcher = KeywordMatcher({}, rules)
+    assert matcher.classify(matcher.scan_categories("Bought for my son and my daughter"), 'Gender', '未知') == '女性'
+    assert matcher.classify(matcher.scan_categories("Bought for my husband"), 'Gender', '未知') == '男性'
+    assert matcher.classify(matcher.scan_categories("Bought for grandsons"), 'Gender', '未知') == '未知'
+
+
+@pytest.mark.parametrize('text', [None, float('nan'), 42])
+def test_non_text_input_has_no_hits(text):
+    matcher = KeywordMatcher({'颜色': {'中性': ['color']}}, {'Usage': {'绘画': ['42']}})
+    assert matcher.scan_sub_topics(text) == frozenset()
+    assert isinstance(matcher.scan_categories(text), frozenset)
@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from review_cache import PolarityCache, ResultCache, fingerprint
+
+
+def _frame(rows=5):
+    return pd.DataFrame({'Content': [f"review {i}" for i in range(rows)], 'Rating': np.arange(rows, dtype=float)})
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({'a': 1, 'b': [1, 2]}) == fingerprint({'b': [1, 2], 'a': 1})
+    assert fingerprint({'a': 1}) != fingerprint({'a': 2})
+
+
+def test_result_cache_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = ResultCache.make_key('file', 'keywords', '画像', 'rules', 'settings')
+    assert cache.load(key) is None
+    assert cache.store(key, _frame(), {'totalReviews': np.int64(5), 'avgRating': '2.00'})
+    df, dashboard = cache.load(key)
+    pd.testing.assert_frame_equal(df, _frame())
+    assert dashboard == {'totalReviews': 5, 'avgRating': '2.00'}
+
+
+def test_result_cache_key_depends_on_every_component():
+    parts = ['file', 'keywords', '画像', 'rules', 'settings']
+    keys = {ResultCache.make_key(*parts)}
+    for position in range(len(parts)):
+        changed = list(parts)
+        changed[position] += '-changed'
+        keys.add(ResultCache.make_key(*changed))
+    assert len(keys) == len(parts) + 1
+
+
+def test_corrupted_entry_is_dropped(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.store('key', _frame(), {})
+    with open(os.path.join(str(tmp_path), 'key', ResultCache.DASHBOARD_FILE), 'w') as f:
+        f.write('{not json')
+    assert cache.load('key') is None
+    assert not os.path.exists(os.path.join(str(tmp_path), 'key'))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    for key in ('old', 'used', 'new'):
+        cache.store(key, _frame(200), {})
+    os.utime(os.path.join(str(tmp_path), 'old'), (1, 1))
+    os.utime(os.path.join(str(tmp_path), 'used'), (2, 2))
+    cache.load('used')  # 读取会刷新最近使用时间
+    entry_size = ResultCache._dir_size(os.path.join(str(tmp_path), 'new'))
+    cache.max_bytes = 2 * entry_size
+    cache._evict()
+    assert sorted(os.listdir(str(tmp_path))) == ['new', 'used']
+
+
+def test_generate_report_reuses_cached_result(nltk_data, make_config, reviews_file, tmp_path):
+    """同一文件、同一配置第二次生成报告时命中结果缓存，CSV 与 HTML 与首次完全相同；关键词变化则不命中。"""
+    from report_pipeline import generate_report
+    from review_analyzer_core import ReviewAnalyzer
+
+    path = reviews_file()
+    cache_dir = str(tmp_path / 'result_cache')
+    outputs = []
+    for run in range(2):
+        analyzer = ReviewAnalyzer(make_config(path), 'standard')
+        csv_path, html_path = str(tmp_path / f'out{run}.csv'), str(tmp_path / f'out{run}.html')
+        summary = generate_report(analyzer, 'standard', path, csv_path, html_path, result_cache_dir=cache_dir)
+        assert summary['error'] is None and summary['cached'] == (run == 1)
+        outputs.append((open(csv_path, 'rb').read(), open(html_path, encoding='utf-8').read()))
+    assert outputs[0] == outputs[1]
+
+    config = make_config(path)
+    config['base_keywords'] = dict(config['base_keywords'], 新特征={'正面-测试': ['great']})
+    analyzer = ReviewAnalyzer(config, 'standard')
+    summary = generate_report(analyzer, 'standard', path, str(tmp_path / 'out2.csv'), str(tmp_path / 'out2.html'),
+                              result_cache_dir=cache_dir)
+    assert summary['error'] is None and not summary['cached']
+
+
+class _CountingScorer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [float(len(text)) for text in texts]
+
+
+def test_polarity_cache_scores_each_text_once():
+    cache, compute = PolarityCache(max_entries=10), _CountingScorer()
+    assert cache.score(['good', 'bad', 'good'], compute) == [4.0, 3.0, 4.0]
+    assert cache.score(['bad', 'fine'], compute) == [3.0, 4.0]
+    assert compute.calls == [['good', 'bad'], ['fine']]
+    info = cache.cache_info()
+    assert (info['hits'], info['misses'], info['size']) == (2, 3, 3)
+
+
+def test_polarity_cache_evicts_least_recently_used():
+    cache, compute = PolarityCache(max_entries=2), _CountingScorer()
+    cache.score(['a', 'b'], compute)
+    cache.score(['a'], compute)      # a 变为最近使用
+    cache.score(['c'], compute)      # 淘汰 b
+    cache.score(['a', 'b'], compute)
+    assert compute.calls == [['a', 'b'], ['c'], ['b']]
+
+
+def test_polarity_cache_persists_and_is_invalidated_by_version(tmp_path):
+    cache_dir = str(tmp_path / 'polarity')
+    cache = PolarityCache(cache_dir=cache_dir, version='v1')
+    cache.score(['good', 'bad'], _CountingScorer())
+    cache.save()
+
+    compute = _CountingScorer()
+    assert PolarityCache(cache_dir=cache_dir, version='v1').score(['good', 'bad'], compute) == [4.0, 3.0]
+    assert compute.calls == []
+    assert PolarityCache(cache_dir=cache_dir, version='v1', max_entries=1).cache_info()['size'] == 1
+    assert PolarityCache(cache_dir=cache_dir, version='v2').cache_info()['size'] == 0
+
+
+def test_analyzer_reuses_persisted_polarities(nltk_data, make_config, reviews_file, tmp_path):
+    """第二次分析同一批评论时，整体情感与句子极性全部来自持久化的极性缓存，结果不变。"""
+    from review_analyzer_core import ReviewAnalyzer
+
+    config = make_config(reviews_file(), polarity_cache_path=str(tmp_path / 'polarity'))
+    first = ReviewAnalyzer(dict(config), 'standard')
+    first.run_analysis()
+    second = ReviewAnalyzer(dict(config), 'standard')
+    second.run_analysis()
+    assert second.polarity_cache_info()['misses'] == 0
+    pd.testing.assert_frame_equal(second.df, first.df)
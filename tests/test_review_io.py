@@ -0,0 +1,125 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from review_io import detect_input_format, iter_review_chunks, read_reviews, read_reviews_with_columns
+
+FORMATS = ['xlsx', 'csv', 'parquet', 'arrow']
+
+
+@pytest.fixture
+def wide_reviews(reviews):
+    """在配置列之间夹入分析用不到的列，检查列裁剪与导出时的列顺序。"""
+    frame = reviews.head(120).copy()
+    frame.insert(1, 'Title', [f"title {i}" for i in range(len(frame))])
+    frame['Extra'] = range(len(frame))
+    return frame
+
+
+@pytest.mark.parametrize('name, expected', [('a.xlsx', 'excel'), ('a.CSV', 'csv'), ('a.pq', 'parquet'), ('a.feather', 'arrow'),
+                                            ('upload', 'excel')])
+def test_detect_input_format(name, expected):
+    assert detect_input_format(name) == expected
+    assert detect_input_format(name, 'CSV') == 'csv'
+
+
+@pytest.mark.parametrize('extension', FORMATS)
+def test_formats_read_the_same_projected_frame(reviews_file, wide_reviews, extension):
+    path = reviews_file(extension, wide_reviews)
+    df, names = read_reviews_with_columns(path, columns=['Rating', 'Content', 'Missing'])
+    assert names == list(wide_reviews.columns)
+    assert list(df.columns) == ['Content', 'Rating']  # 按文件中的顺序，忽略不存在的列
+    pd.testing.assert_frame_equal(df, wide_reviews[['Content', 'Rating']].reset_index(drop=True), check_dtype=False)
+
+
+@pytest.mark.parametrize('extension', FORMATS)
+def test_buffers_can_be_read_repeatedly(reviews_file, wide_reviews, extension):
+    buffer = io.BytesIO(open(reviews_file(extension, wide_reviews), 'rb').read())
+    first = read_reviews(buffer, detect_input_format(f'x.{extension}'), ['Content'])
+    second = read_reviews(buffer, detect_input_format(f'x.{extension}'), ['Extra'])
+    assert len(first) == len(second) == len(wide_reviews)
+
+
+@pytest.mark.parametrize('extension', FORMATS)
+def test_chunks_concatenate_to_full_read(reviews_file, wide_reviews, extension):
+    path = reviews_file(extension, wide_reviews)
+    chunks = list(iter_review_chunks(path, chunk_size=50))
+    assert [len(chunk) for chunk in chunks] == [50, 50, 20]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), read_reviews(path), check_dtype=False)
+
+
+def test_excel_conversion_copy_is_reused_for_any_columns(reviews_file, wide_reviews, tmp_path, capsys):
+    path = reviews_file('xlsx', wide_reviews)
+    conversion_dir = str(tmp_path / 'input_cache')
+    first = read_reviews(path, columns=['Content', 'Rating'], conversion_dir=conversion_dir)
+    assert len(os.listdir(conversion_dir)) == 1
+    capsys.readouterr()
+    again = read_reviews(path, columns=['Content', 'Rating'], conversion_dir=conversion_dir)
+    extra, names = read_reviews_with_columns(path, columns=['Extra'], conversion_dir=conversion_dir)
+    assert capsys.readouterr().out.count('直接读取其 Parquet 副本') == 2
+    pd.testing.assert_frame_equal(again, first)
+    assert extra['Extra'].tolist() == wide_reviews['Extra'].tolist()
+    assert names == list(wide_reviews.columns)
+
+
+def test_excel_conversion_dir_is_bounded(reviews, reviews_file, tmp_path):
+    conversion_dir = str(tmp_path / 'input_cache')
+    paths = []
+    for rows in (100, 110, 120):
+        path = str(tmp_path / f'{rows}.xlsx')
+        reviews.head(rows).to_excel(path, index=False)
+        paths.append(path)
+    read_reviews(paths[0], conversion_dir=conversion_dir)
+    copy_size = os.path.getsize(os.path.join(conversion_dir, os.listdir(conversion_dir)[0]))
+    for path in paths[1:]:
+        read_reviews(path, conversion_dir=conversion_dir, conversion_max_bytes=int(2.5 * copy_size))
+    # 只保留最近使用的两个副本
+    kept = {len(pd.read_parquet(os.path.join(conversion_dir, name))) for name in os.listdir(conversion_dir)}
+    assert kept == {110, 120}
+
+
+@pytest.mark.parametrize('lean_memory', [False, True])
+@pytest.mark.parametrize('extension', FORMATS)
+def test_export_keeps_all_input_columns(run_analysis, wide_reviews, tmp_path, extension, lean_memory):
+    """分析只载入配置列，但导出的 CSV 保留全部输入列，并按文件中的顺序排在派生列之前。"""
+    analyzer = run_analysis(wide_reviews, extension, lean_memory=lean_memory, excel_conversion_dir=str(tmp_path / 'input_cache'))
+    assert 'Extra' not in analyzer.df.columns and 'Title' not in analyzer.df.columns
+    analyzer.save_results()
+    exported = pd.read_csv(analyzer.config['output_filepath'])
+    assert list(exported.columns[:len(wide_reviews.columns)]) == list(wide_reviews.columns)
+    assert exported['Extra'].tolist() == wide_reviews.loc[analyzer.df.index, 'Extra'].tolist()
+    assert exported['Title'].tolist() == wide_reviews.loc[analyzer.df.index, 'Title'].tolist()
+    assert {'Sentiment', 'Content_Clean', 'Processed_Text'} <= set(exported.columns)
+
+
+def test_streaming_export_keeps_all_input_columns(nltk_data, make_config, reviews_file, wide_reviews, tmp_path):
+    from review_analyzer_core import ReviewAnalyzer
+
+    path = reviews_file('csv', wide_reviews)
+    full = ReviewAnalyzer(make_config(path, output_filepath=str(tmp_path / 'full.csv')), 'standard')
+    full.run_analysis()
+    full.save_results()
+    ReviewAnalyzer(make_config(path, output_filepath=str(tmp_path / 'stream.csv')), 'standard').run_streaming_analysis(chunk_size=50)
+    assert open(tmp_path / 'stream.csv', 'rb').read() == open(tmp_path / 'full.csv', 'rb').read()
+
+
+def test_parquet_index_columns_are_not_input_columns(nltk_data, make_config, wide_reviews, tmp_path):
+    """带有非默认索引写出的 Parquet：索引列不算输入列，分析、导出与逐块读取都照常进行。"""
+    frame = wide_reviews.sample(80, random_state=1)
+    path = str(tmp_path / 'indexed.parquet')
+    frame.to_parquet(path)
+    df, names = read_reviews_with_columns(path, columns=['Content'])
+    assert names == list(wide_reviews.columns)
+    assert list(df.index) == list(frame.index)
+    assert [list(chunk.columns) for chunk in iter_review_chunks(path, chunk_size=50)] == [names, names]
+
+    from review_analyzer_core import ReviewAnalyzer
+
+    analyzer = ReviewAnalyzer(make_config(path), 'standard')
+    assert analyzer.run_analysis() is not None
+    analyzer.save_results()
+    exported = pd.read_csv(analyzer.config['output_filepath'])
+    assert list(exported.columns[:len(names)]) == names
+    assert exported['Extra'].tolist() == frame.loc[analyzer.df.index, 'Extra'].tolist()
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from keyword_matcher import KeywordMatcher
+from review_analyzer_core import ReviewAnalyzer
+from review_cache import ReviewStore
+
+
+def _fingerprints(keys):
+    return pd.Series(keys, index=range(len(keys)))
+
+
+def test_changed_group_fingerprint_drops_its_columns(tmp_path):
+    store = ReviewStore(str(tmp_path))
+    assert not store.ensure_group('text', 'v1', ['Processed_Text'])
+    store.ensure_group('feature:颜色', 'k1', ['feature_颜色'])
+    store.update(_fingerprints(['a', 'b']), pd.DataFrame({'Processed_Text': ['x', 'y'], 'feature_颜色': [1, 0]}))
+    store.save()
+
+    reopened = ReviewStore(str(tmp_path))
+    assert reopened.ensure_group('text', 'v1', ['Processed_Text'])
+    assert not reopened.ensure_group('feature:颜色', 'k2', ['feature_颜色'])
+    assert list(reopened.frame.columns) == ['Processed_Text']
+    assert reopened.group_available(_fingerprints(['a', 'c']), 'text').tolist() == [True, False]
+
+
+def test_least_recently_seen_reviews_are_evicted(tmp_path):
+    store = ReviewStore(str(tmp_path), max_rows=3)
+    store.ensure_group('text', 'v1', ['Sentiment'])
+    store.update(_fingerprints(['a', 'b', 'c']), pd.DataFrame({'Sentiment': [0.1, 0.2, 0.3]}))
+    store.update(_fingerprints(['a', 'd']), pd.DataFrame({'Sentiment': [0.1, 0.4]}))
+    assert list(store.frame.index) == ['c', 'a', 'd']
+    store.save()
+    assert len(ReviewStore(str(tmp_path), max_rows=2).frame) == 2
+
+
+@pytest.fixture
+def incremental_run(nltk_data, make_config, reviews_file, tmp_path):
+    """在同一个增量评论库上执行分析，返回分析器。"""
+    path = reviews_file()
+    store_path = str(tmp_path / 'review_store')
+
+    def run():
+        analyzer = ReviewAnalyzer(make_config(path, incremental_store_path=store_path, lean_memory=False), 'standard')
+        assert analyzer.run_analysis() is not None
+        return analyzer
+    run.store_path = store_path
+    return run
+
+
+def _tamper_scores(store_path, column, value):
+    store = ReviewStore(store_path)
+    store.frame[column] = value
+    store.dirty = True
+    store.save()
+
+
+def test_second_run_reuses_stored_results(incremental_run):
+    first = incremental_run()
+    feature = next(iter(first.config['feature_keywords']))
+    _tamper_scores(incremental_run.store_path, f'sentiment_score_{feature}', 0.123)
+    second = incremental_run()
+    assert (second.df[f'sentiment_score_{feature}'] == 0.123).all()
+    pd.testing.assert_series_equal(second.df['Sentiment'], first.df['Sentiment'])
+
+
+@pytest.mark.parametrize('owner, attribute', [(ReviewAnalyzer, 'TEXT_PIPELINE_VERSION'), (KeywordMatcher, 'MATCHER_VERSION')])
+def test_algorithm_version_change_invalidates_feature_results(incremental_run, monkeypatch, owner, attribute):
+    first = incremental_run()
+    feature = next(iter(first.config['feature_keywords']))
+    _tamper_scores(incremental_run.store_path, f'sentiment_score_{feature}', 0.123)
+    monkeypatch.setattr(owner, attribute, getattr(owner, attribute) + '-changed')
+    second = incremental_run()
+    np.testing.assert_array_equal(second.df[f'sentiment_score_{feature}'], first.df[f'sentiment_score_{feature}'])
+
+
+def test_pipeline_writes_the_store_once_and_only_when_changed(nltk_data, make_config, reviews_file, tmp_path, monkeypatch):
+    """完整流程（含分类）只写一次库；同一份数据再次分析没有新结果，不再重写。精简内存模式下预处理文本照常入库。"""
+    from report_pipeline import analyze_reviews
+
+    writes = []
+    original_save = ReviewStore.save
+    def counting_save(store):
+        writes.append(store.dirty)
+        original_save(store)
+    monkeypatch.setattr(ReviewStore, 'save', counting_save)
+
+    config = make_config(reviews_file(), incremental_store_path=str(tmp_path / 'review_store'), lean_memory=True)
+    analyze_reviews(ReviewAnalyzer(dict(config), 'standard'), progress=lambda message: None)
+    assert writes == [True]
+    stored = ReviewStore(config['incremental_store_path']).frame
+    assert {'Processed_Text', 'Sentiment', 'User_Role', 'Motivation'} <= set(stored.columns)
+    assert stored['Processed_Text'].notna().all()
+
+    analyze_reviews(ReviewAnalyzer(dict(config), 'standard'), progress=lambda message: None)
+    assert writes == [True, False]
+
+
+def test_keyword_edit_recomputes_only_that_feature(nltk_data, make_config, reviews_file, tmp_path):
+    from analysis_config import BASE_FEATURE_KEYWORDS
+
+    path = reviews_file()
+    store_path = str(tmp_path / 'review_store')
+    ReviewAnalyzer(make_config(path, incremental_store_path=store_path), 'standard').run_analysis()
+    unchanged, edited = list(BASE_FEATURE_KEYWORDS)[:2]
+    for feature in (unchanged, edited):
+        _tamper_scores(store_path, f'sentiment_score_{feature}', 0.123)
+
+    keywords = {feature: dict(sub_topics) for feature, sub_topics in BASE_FEATURE_KEYWORDS.items()}
+    first_sub_topic = next(iter(keywords[edited]))
+    keywords[edited][first_sub_topic] = keywords[edited][first_sub_topic] + ['marker']
+    analyzer = ReviewAnalyzer(make_config(path, incremental_store_path=store_path, base_keywords=keywords), 'standard')
+    analyzer.run_analysis()
+    fresh = ReviewAnalyzer(make_config(path, base_keywords=keywords), 'standard')
+    fresh.run_analysis()
+
+    assert (analyzer.df[f'sentiment_score_{unchanged}'] == 0.123).all()
+    np.testing.assert_array_equal(analyzer.df[f'sentiment_score_{edited}'], fresh.df[f'sentiment_score_{edited}'])
+    np.testing.assert_array_equal(analyzer.df[f'feature_{edited}'], fresh.df[f'feature_{edited}'])
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from analysis_config import BASE_FEATURE_KEYWORDS, PROFILE_OVERRIDES
+from conftest import PROFILE
+
+import baseline_reference as baseline
+
+
+@pytest.fixture
+def lowercase_run(run_analysis):
+    """使用小写关键词执行分析（基线的特征提及区分大小写，小写词库下两者的提及判定才可逐条对比）。"""
+    def run(**overrides):
+        return run_analysis(base_keywords=baseline.lowercase_keywords(BASE_FEATURE_KEYWORDS),
+                            profiles={PROFILE: baseline.lowercase_keywords(PROFILE_OVERRIDES[PROFILE])}, **overrides)
+    return run
+
+
+@pytest.mark.parametrize('lean_memory', [False, True])
+def test_attribution_matches_baseline_sentence_loop(lowercase_run, lean_memory):
+    """矢量化的句子级情感归因与基线 iterrows 逐句循环的提及、得分与标签逐条一致。"""
+    analyzer = lowercase_run(lean_memory=lean_memory)
+    content_col = analyzer.config['content_column']
+    feature_keywords = analyzer.config['feature_keywords']
+    expected = baseline.attribute_feature_sentiments(analyzer.df[[content_col]], feature_keywords, content_col)
+    assert (expected[[f'sentiment_score_{feature}' for feature in feature_keywords]] != 0).any(axis=None)
+    for feature in feature_keywords:
+        assert analyzer.df[f'feature_{feature}'].tolist() == expected[f'feature_{feature}'].tolist(), feature
+        np.testing.assert_allclose(analyzer.df[f'sentiment_score_{feature}'].to_numpy(dtype=float),
+                                   expected[f'sentiment_score_{feature}'].to_numpy(dtype=float), atol=1e-9, err_msg=feature)
+        assert analyzer.df[f'sentiment_{feature}'].tolist() == expected[f'sentiment_{feature}'].tolist(), feature
+
+
+def test_neutral_sub_topics_use_sentence_polarity(run_analysis, reviews):
+    """
+    基础词库中没有中性子主题，这里用自定义词库覆盖“中性子主题取该句极性”的路径：
+    同一句命中正面/负面子主题时取 ±1，只命中中性子主题时取该句的 TextBlob 极性，最后按句平均。
+    """
+    keywords = {
+        '色彩': {'正面-鲜艳': ['vibrant'], '负面-暗淡': ['dull'], '中性-颜色': ['color']},
+        '包装': {'中性-盒子': ['box'], '负面-破损': ['broken box']},
+    }
+    frame = reviews.head(4).copy()
+    frame['Content'] = [
+        "The color is lovely. The color is vibrant. Awful color.",
+        "Nothing to say about it.",
+        "Dull color, but a beautiful color too! The box was fine.",
+        "What a wonderful box. It came as a broken box, sadly.",
+    ]
+    analyzer = run_analysis(frame=frame, base_keywords=keywords, profiles={})
+    expected = baseline.attribute_feature_sentiments(analyzer.df[['Content']], keywords, 'Content')
+    score_cols = [f'sentiment_score_{feature}' for feature in keywords]
+    scores = expected[score_cols].to_numpy()
+    assert ((scores != 0) & (np.abs(scores) != 1)).any()
+    np.testing.assert_allclose(analyzer.df[score_cols].to_numpy(dtype=float), scores, atol=1e-9)
+    assert analyzer.df['sentiment_色彩'].tolist() == expected['sentiment_色彩'].tolist()
+
+
+def test_sentence_table_is_not_kept_after_attribution(lowercase_run):
+    analyzer = lowercase_run(lean_memory=False)
+    assert '_sentence_table' not in vars(analyzer)
+    assert analyzer.token_corpus is None
@@ -0,0 +1,86 @@
+import tracemalloc
+
+import pytest
+
+from stage_profiler import StageProfiler, max_rss_mb
+
+
+@pytest.fixture
+def traced_profiler():
+    was_tracing = tracemalloc.is_tracing()
+    yield StageProfiler(trace_memory=True)
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def _allocate(megabytes):
+    block = bytearray(megabytes * 1024 ** 2)
+    del block
+
+
+def test_stage_peaks_are_measured_per_stage(traced_profiler):
+    """tracemalloc 模式下每个阶段记录自身的峰值：已释放的大块内存照样计入，随后的阶段不受其影响。"""
+    with traced_profiler.stage('outer'):
+        with traced_profiler.stage('allocate'):
+            _allocate(20)
+        with traced_profiler.stage('small'):
+            _allocate(1)
+    records = {record['stage']: record for record in traced_profiler.report()['stages']}
+    assert 19 < records['allocate']['peak_memory_delta_mb'] < 25
+    assert records['small']['peak_memory_delta_mb'] < 2
+    assert records['outer']['peak_memory_delta_mb'] >= records['allocate']['peak_memory_delta_mb']
+    assert [records[name]['depth'] for name in ('outer', 'allocate', 'small')] == [0, 1, 1]
+
+
+def test_untraced_stages_only_report_the_high_water_mark():
+    profiler = StageProfiler()
+    with profiler.stage('allocate', rows=3):
+        _allocate(1)
+    record = profiler.report()['stages'][0]
+    assert record['peak_memory_delta_mb'] is None and record['rows'] == 3
+    if max_rss_mb() is not None:
+        assert record['new_high_water_mark_mb'] >= 0
+
+
+def test_summary_sums_times_and_keeps_memory_maxima(traced_profiler):
+    for megabytes in (1, 12, 2):
+        with traced_profiler.stage('chunk', rows=10):
+            _allocate(megabytes)
+    (total,) = traced_profiler.summary()
+    assert total['calls'] == 3 and total['rows'] == 30
+    assert 11 < total['peak_memory_delta_mb'] < 16
+    assert total['new_high_water_mark_mb'] is None or total['new_high_water_mark_mb'] >= 0
+
+
+def test_analyzer_records_stage_peaks_when_profiling_memory(run_analysis):
+    was_tracing = tracemalloc.is_tracing()
+    try:
+        traced = run_analysis(profile_memory=True)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    stages = traced.stage_report()['stages']
+    assert all(stage['peak_memory_delta_mb'] is not None for stage in stages)
+    assert all(stage['peak_memory_delta_mb'] is None for stage in run_analysis().stage_report()['stages'])
+
+
+def _benchmark_result(trace_memory, peak):
+    stage = {'stage': 'analyze_sentiment', 'wall_seconds': 1.0, 'cpu_seconds': 1.0, 'peak_memory_delta_mb': peak,
+             'new_high_water_mark_mb': 0.0, 'rows': 10, 'calls': 1, 'depth': 0}
+    run = {'rows_requested': 10, 'rows': 10, 'input_file': 'x', 'app_flow_seconds': 2.0, 'init_seconds': 0.1,
+           'peak_rss_mb': 100.0, 'stages': [stage]}
+    return {'environment': {'git_commit': 'abc', 'timestamp': 't'}, 'settings': {'trace_memory': trace_memory}, 'runs': [run]}
+
+
+def test_benchmark_output_labels_memory_fields(capsys):
+    from benchmarks.run_benchmarks import _print_run, compare_results
+
+    traced, untraced = _benchmark_result(True, 8.0), _benchmark_result(False, None)
+    assert 'analyze_sentiment (peak MB)' in compare_results(traced, traced)
+    text = compare_results(untraced, traced)
+    assert '(peak MB)' not in text and '--trace-memory' in text
+    _print_run(untraced['runs'][0])
+    _print_run(traced['runs'][0])
+    untraced_line, traced_line = [line for line in capsys.readouterr().out.splitlines() if 'analyze_sentiment' in line]
+    assert '进程内存新高' in untraced_line and '阶段峰值' not in untraced_line
+    assert '阶段峰值' in traced_line
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from analysis_config import DEFAULT_CLASSIFICATIONS
+from review_analyzer_core import ReviewAnalyzer
+
+
+@pytest.mark.parametrize('lean_memory', [False, True])
+@pytest.mark.parametrize('extension', ['parquet', 'csv', 'xlsx'])
+def test_streaming_matches_in_memory_analysis(nltk_data, make_config, reviews_file, tmp_path, lean_memory, extension):
+    """分块流式分析导出的 CSV（列、顺序与取值）以及汇总报告与一次性分析完全一致。"""
+    path = reviews_file(extension)
+    in_memory = ReviewAnalyzer(make_config(path, lean_memory=lean_memory, output_filepath=str(tmp_path / 'full.csv')), 'standard')
+    in_memory.run_analysis()
+    in_memory.classify_all(DEFAULT_CLASSIFICATIONS)
+    in_memory.save_results()
+    expected_report = in_memory.generate_feature_analysis_report()
+
+    streaming = ReviewAnalyzer(make_config(path, lean_memory=lean_memory, output_filepath=str(tmp_path / 'stream.csv')), 'standard')
+    result = streaming.run_streaming_analysis(chunk_size=70, classifications=DEFAULT_CLASSIFICATIONS)
+
+    assert result['rows'] == len(in_memory.df)
+    assert open(tmp_path / 'stream.csv', 'rb').read() == open(tmp_path / 'full.csv', 'rb').read()
+    assert result['feature_report'] == expected_report
+    assert result['distributions']['User_Role'] == in_memory.df['User_Role'].astype(str).value_counts().to_dict()
+    assert streaming.df is None and streaming.token_corpus is None
+
+
+def test_streaming_ignores_review_store(nltk_data, make_config, reviews_file, tmp_path):
+    store_path = tmp_path / 'review_store'
+    config = make_config(reviews_file(), incremental_store_path=str(store_path))
+    assert ReviewAnalyzer(config, 'standard').run_streaming_analysis(chunk_size=100)['rows'] == 300
+    assert not store_path.exists()
+
+
+def test_streaming_missing_file_returns_none(nltk_data, make_config, tmp_path):
+    analyzer = ReviewAnalyzer(make_config(str(tmp_path / 'missing.parquet')), 'standard')
+    assert analyzer.run_streaming_analysis(chunk_size=100) is None
@@ -0,0 +1,102 @@
+import os
+
+import pandas as pd
+import pytest
+
+from text_processing import (
+    ParallelTextMapper, PolarityScorer, TextNormalizer, get_normalizer, pattern_tokens, preprocess_chunk, resolve_n_jobs,
+    split_sentences_chunk,
+)
+
+import baseline_reference as baseline
+
+
+@pytest.mark.parametrize('n_jobs, expected', [(None, 1), (0, 1), (1, 1), (3, 3), (-1, os.cpu_count() or 1)])
+def test_resolve_n_jobs(n_jobs, expected):
+    assert resolve_n_jobs(n_jobs) == expected
+
+
+def test_parallel_mapper_preserves_order_and_results(nltk_data, reviews):
+    texts = list(reviews['Content'])
+    mapper = ParallelTextMapper(n_jobs=2, min_chunk_size=20)
+    try:
+        assert mapper.map(preprocess_chunk, texts) == preprocess_chunk(texts)
+        assert mapper.map(split_sentences_chunk, texts) == split_sentences_chunk(texts)
+        assert mapper._executor is not None  # 确实经过了进程池
+    finally:
+        mapper.close()
+    assert mapper._executor is None
+
+
+def test_small_inputs_run_in_process(nltk_data):
+    mapper = ParallelTextMapper(n_jobs=4, min_chunk_size=500)
+    assert mapper.map(preprocess_chunk, ["Great markers!", None]) == ["great marker", ""]
+    assert mapper._executor is None
+
+
+def test_parallel_analysis_matches_serial(nltk_data, make_config, reviews_file):
+    """n_jobs=2 时分析结果与串行逐列一致。"""
+    from review_analyzer_core import ReviewAnalyzer
+
+    path = reviews_file()
+    frames = []
+    for n_jobs in (1, 2):
+        analyzer = ReviewAnalyzer(make_config(path, lean_memory=False), 'standard', n_jobs=n_jobs)
+        analyzer._text_mapper.min_chunk_size = 20
+        assert analyzer.run_analysis() is not None
+        frames.append(analyzer.df)
+    pd.testing.assert_frame_equal(frames[0], frames[1])
+
+
+def test_normalizer_matches_baseline_preprocessing(nltk_data, reviews):
+    normalizer = TextNormalizer()
+    texts = list(reviews['Content']) + ["It's NOT the 2nd-best pen... Tips frayed!!", "", None, 3.5]
+    assert [normalizer.normalize(text) for text in texts] == [baseline.preprocess_text(text) for text in texts]
+
+
+def test_lemma_cache_is_bounded_and_counts_hits(nltk_data):
+    normalizer = TextNormalizer(lemma_cache_size=2)
+    normalizer.normalize("markers markers markers")
+    info = normalizer.cache_info()
+    assert (info['hits'], info['misses'], info['size'], info['max_size']) == (2, 1, 1, 2)
+    assert info['hit_rate'] == pytest.approx(2 / 3)
+    normalizer.normalize("colors inks tips")
+    assert normalizer.cache_info()['size'] == 2
+    normalizer.clear_cache()
+    assert normalizer.cache_info()['size'] == 0
+
+
+def test_normalizer_is_shared_per_cache_size(nltk_data):
+    normalizer = get_normalizer(1234)
+    assert get_normalizer(1234) is normalizer
+    assert get_normalizer(4321) is not normalizer
+
+
+POLARITY_EDGE_CASES = [
+    "Not very good at all.", "Never bad!!!", "I don't like them :(", "Love it :-) <3", "Terribly slow... but nice (!)",
+    "It's \"great\", they said.", "Mr. Smith's pens are ok.\n\nSecond paragraph is AWFUL", "Good good good!", "", "   ",
+    "not not happy", "extremely disappointing", "The U.S. version is fine!?", "Wow!! Amazing colours ;)",
+]
+
+
+def test_polarity_scorer_matches_textblob(reviews):
+    scorer = PolarityScorer()
+    texts = list(reviews['Content']) + [text.lower() for text in reviews['Content']] + POLARITY_EDGE_CASES
+    texts += [sentence for text in reviews['Content'].head(50) for sentence in text.split('. ')]
+    expected = [baseline.textblob_polarity(text) for text in texts]
+    assert [scorer.polarity(text) for text in texts] == expected
+    assert scorer.polarity_batch(texts) == expected
+
+
+def test_pattern_tokens_match_textblob_tokenizer(reviews):
+    from textblob._text import find_tokens
+
+    for text in POLARITY_EDGE_CASES + list(reviews['Content'].head(50)):
+        assert pattern_tokens(text) == " ".join(find_tokens(text)).lower().split(), text
+
+
+def test_sentiment_column_matches_textblob_on_lowercased_content(run_analysis):
+    """整体情感与基线相同：对小写内容逐行执行 TextBlob。"""
+    analyzer = run_analysis(lean_memory=True)
+    content = analyzer.df[analyzer.config['content_column']].astype(str).str.lower()
+    assert analyzer.df['Sentiment'].tolist() == [baseline.textblob_polarity(text) for text in content]
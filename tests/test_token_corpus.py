@@ -0,0 +1,67 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis_config import BASE_FEATURE_KEYWORDS
+from keyword_matcher import KeywordMatcher
+from token_corpus import TokenCorpus
+
+import baseline_reference as baseline
+
+TEXTS = ["ink dry out fast", None, "", "color vibrant ink", "tip fray tip"]
+
+
+def test_round_trip_restores_texts():
+    corpus = TokenCorpus.from_texts(TEXTS, pd.Index([10, 11, 12, 13, 14]))
+    assert corpus.vocabulary == ['ink', 'dry', 'out', 'fast', 'color', 'vibrant', 'tip', 'fray']
+    assert corpus.token_ids.dtype == np.int32 and corpus.offsets.dtype == np.int64
+    assert corpus.texts() == [text or '' for text in TEXTS]
+    assert corpus.positions_of(pd.Index([13, 10])).tolist() == [3, 0]
+    assert corpus.positions_of(pd.Index([13, 99])) is None
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_saved_corpus_loads_identically(tmp_path, mmap):
+    corpus = TokenCorpus.from_texts(TEXTS, pd.Index(['a', 'b', 'c', 'd', 'e']))
+    corpus.save(str(tmp_path))
+    loaded = TokenCorpus.load(str(tmp_path), mmap=mmap)
+    assert loaded.vocabulary == corpus.vocabulary
+    assert loaded.texts() == corpus.texts()
+    assert list(loaded.index) == list(corpus.index)
+    np.testing.assert_array_equal(loaded.offsets, corpus.offsets)
+
+
+def test_word_counts_match_counter():
+    corpus = TokenCorpus.from_texts(TEXTS)
+    for positions in (None, np.array([4, 0]), np.array([1, 2]), np.array([], dtype=np.int64)):
+        texts = corpus.texts(positions)
+        expected = Counter(' '.join(texts).split())
+        ids, counts = corpus.word_counts(positions)
+        assert [(corpus.vocabulary[i], c) for i, c in zip(ids, counts)] == list(expected.items())
+        assert corpus.frequent_words(positions, min_frequency=1) == sorted(expected.items(), key=lambda item: item[1], reverse=True)
+
+
+def test_scanning_token_ids_matches_scanning_text(nltk_data, reviews):
+    """在词元编号上匹配子主题与在预处理文本上匹配的命中完全相同（含词表外关键词被剪除的情况）。"""
+    matcher = KeywordMatcher(baseline.lowercase_keywords(BASE_FEATURE_KEYWORDS))
+    processed = [baseline.preprocess_text(text) for text in reviews['Content']]
+    corpus = TokenCorpus.from_texts(processed)
+    id_trie = matcher.sub_topic_trie_for(corpus.vocabulary_index)
+    hits = [matcher.scan_sub_topics(text) for text in processed]
+    assert sum(map(len, hits)) > 0
+    assert [matcher.scan_token_ids(id_trie, corpus.row_ids(i)) for i in range(len(corpus))] == hits
+
+
+def test_lean_memory_keeps_results_in_the_corpus(run_analysis):
+    """精简内存模式不常驻 Content_Clean，预处理文本只以词元语料保存：逐行结果、还原的文本与特征报告都与普通模式相同。"""
+    normal = run_analysis(lean_memory=False)
+    lean = run_analysis(lean_memory=True)
+    derived_text = ['Content_Clean', 'Processed_Text']
+    assert set(derived_text) <= set(normal.df.columns) and not set(derived_text) & set(lean.df.columns)
+    assert lean.token_corpus is not None and len(lean.token_corpus) == len(lean.df)
+    assert lean.token_corpus.texts() == normal.df['Processed_Text'].tolist()
+    pd.testing.assert_series_equal(lean._processed_texts(lean.df), normal.df['Processed_Text'], check_names=False)
+    pd.testing.assert_frame_equal(lean.df, normal.df.drop(columns=derived_text))
+    assert lean.generate_feature_analysis_report() == normal.generate_feature_analysis_report()
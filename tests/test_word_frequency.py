@@ -0,0 +1,107 @@
+import random
+
+import numpy as np
+import pytest
+
+from text_processing import SENTENCE_BOUNDARY, get_normalizer
+from token_corpus import TokenCorpus
+from word_frequency import FrequencyCounter, corpus_frequencies
+
+STOP_WORDS = frozenset(['the', 'out', 'of', 'it', 'is', 'a', 'not'])
+
+
+def test_phrase_text_keeps_stopwords_within_sentences(nltk_data):
+    text = get_normalizer().phrase_text("The fine tip dried out. Out of the box, it is great!")
+    sentences = text.split(f' {SENTENCE_BOUNDARY} ')
+    assert len(sentences) == 2
+    assert 'dried out' in sentences[0] and sentences[1].startswith('out of the box')
+    assert get_normalizer().phrase_text(None) == ''
+
+
+def test_phrases_stay_inside_sentences_and_skip_all_stopword_grams():
+    counter = FrequencyCounter((1, 2), STOP_WORDS)
+    counter.update_texts(["tip dried", "tip"])
+    counter.update_phrase_texts([f"the tip dried out {SENTENCE_BOUNDARY} out of the box", None])
+    assert dict(counter.counts) == {'tip': 2, 'dried': 1}
+    assert dict(counter.phrase_counts) == {'the tip': 1, 'tip dried': 1, 'dried out': 1, 'the box': 1}
+    # 并列时单词排在短语之前
+    assert counter.most_common() == [('tip', 2), ('dried', 1), ('the tip', 1), ('tip dried', 1), ('dried out', 1), ('the box', 1)]
+
+
+def test_phrase_only_range_skips_words():
+    counter = FrequencyCounter((2, 3), STOP_WORDS)
+    counter.update_texts(["tip dried"])
+    counter.update_phrase_texts(["tip dried out"])
+    assert counter.most_common() == [('tip dried', 1), ('tip dried out', 1), ('dried out', 1)]
+
+
+def _random_rows(seed, n_rows=400):
+    r = random.Random(seed)
+    vocabulary = ['ink', 'tip', 'dried', 'bleed', 'color', 'marker'] + sorted(STOP_WORDS)
+    words, phrases = [], []
+    for _ in range(n_rows):
+        sentences = [' '.join(r.choice(vocabulary) for _ in range(r.randint(0, 6))) for _ in range(r.randint(1, 3))]
+        phrases.append(f' {SENTENCE_BOUNDARY} '.join(sentences))
+        words.append(' '.join(token for token in ' '.join(sentences).split() if token not in STOP_WORDS))
+    return words, phrases
+
+
+@pytest.mark.parametrize('ngram_range', [(1, 1), (1, 2), (1, 3), (2, 2)])
+@pytest.mark.parametrize('top_k', [None, 5, 40])
+@pytest.mark.parametrize('chunk_size, max_workers', [(10_000, 1), (37, 3)])
+def test_corpus_frequencies_match_frequency_counter(ngram_range, top_k, chunk_size, max_workers):
+    words, phrases = _random_rows(seed=sum(ngram_range) + (top_k or 0))
+    expected = FrequencyCounter(ngram_range, STOP_WORDS)
+    expected.update_texts(words)
+    expected.update_phrase_texts(phrases)
+    positions = np.array(sorted(random.Random(1).sample(range(len(words)), 300)))
+    subset = FrequencyCounter(ngram_range, STOP_WORDS)
+    subset.update_texts(words[p] for p in positions)
+    subset.update_phrase_texts(phrases[p] for p in positions)
+
+    corpus, phrase_corpus = TokenCorpus.from_texts(words), TokenCorpus.from_texts(phrases)
+    kwargs = dict(ngram_range=ngram_range, top_k=top_k, chunk_size=chunk_size, max_workers=max_workers,
+                  phrase_corpus=phrase_corpus, stop_words=STOP_WORDS)
+    assert corpus_frequencies(corpus, min_frequency=2, **kwargs) == expected.most_common(2, top_k)
+    assert corpus_frequencies(corpus, positions, 2, phrase_positions=positions, **kwargs) == subset.most_common(2, top_k)
+
+
+def test_chunked_counters_merge_to_one_pass():
+    words, phrases = _random_rows(seed=3)
+    whole = FrequencyCounter((1, 2), STOP_WORDS)
+    whole.update_texts(words)
+    whole.update_phrase_texts(phrases)
+    merged = FrequencyCounter((1, 2), STOP_WORDS)
+    for start in range(0, len(words), 64):
+        part = FrequencyCounter((1, 2), STOP_WORDS)
+        part.update_texts(words[start:start + 64])
+        part.update_phrase_texts(phrases[start:start + 64])
+        merged.merge(part)
+    assert merged.most_common() == whole.most_common()
+
+
+def test_phrases_require_a_phrase_corpus():
+    with pytest.raises(ValueError):
+        corpus_frequencies(TokenCorpus.from_texts(["tip dried"]), ngram_range=(1, 2))
+
+
+def test_report_word_cloud_contains_real_phrases(run_analysis, reviews):
+    """报告词云的短语来自保留停用词的原句：含停用词的 "dried out" 可以入选，不会出现跨句拼接或纯停用词短语。"""
+    frame = reviews.copy()
+    low_rows = frame.index[frame['Rating'] <= 3][:6]
+    frame.loc[low_rows, 'Content'] = "The fine tip dried out. Out of the box it was fine."
+    analyzer = run_analysis(frame, word_cloud_ngram_range=(1, 2), word_cloud_top_k=None)
+    report = analyzer.generate_feature_analysis_report()
+    stop_words = analyzer.normalizer.stop_words
+    low = analyzer.df[analyzer.df['Rating'] <= 3]
+    counter = FrequencyCounter((1, 2), stop_words)
+    counter.update_texts(analyzer._processed_texts(low))
+    counter.update_phrase_texts(analyzer._phrase_texts(low))
+    assert counter.phrase_counts['dried out'] == 6 and 'out out' not in counter.phrase_counts
+    assert report['word_frequencies']['low_rating_words'] == counter.most_common(5)
+    assert ('dried out', 6) in report['word_frequencies']['low_rating_words']
+
+    phrases = {gram for grams in report['word_frequencies'].values() for gram, _ in grams if ' ' in gram}
+    assert phrases
+    assert not [gram for gram in phrases if all(token in stop_words for token in gram.split())]
+    assert not [gram for gram in phrases if SENTENCE_BOUNDARY in gram]
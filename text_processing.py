@@ -0,0 +1,356 @@
+# text_processing.py (版本 1.4 - 并行NLP预处理 + 可复用文本规范化组件 + 批量极性打分 + 按句切分的短语文本；NLTK / TextBlob 延迟导入)
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import List, Dict, Callable, Any, Optional
+
+# NLTK 与 TextBlob 的导入耗时占本模块导入时间的一半以上，且只有真正处理文本时才需要，
+# 因此都推迟到首次使用时再导入：只创建分析器、读取缓存结果或启动工作进程时不必为其付出启动开销。
+
+DEFAULT_LEMMA_CACHE_SIZE = 100_000
+
+_NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+# 短语文本中句与句之间的分隔词元（预处理会去掉全部非字母字符，真实词元中不会出现）
+SENTENCE_BOUNDARY = '|'
+
+# 每个工作进程（以及主进程）各自持有一份文本规范化组件，只在首次使用时加载一次 NLTK 资源
+_WORKER_STATE = {}
+
+
+class TextNormalizer:
+    """
+    【V10.2 文本规范化组件】
+    一次性加载停用词表与 WordNet 词形还原器，供所有评论与句子的预处理复用。
+    评论词汇高度符合齐夫分布，因此为“单词 → 词形”维护一个有界的 LRU 缓存，
+    并暴露命中/未命中计数，便于据此调整缓存大小。
+    """
+
+    def __init__(self, lemma_cache_size: int = DEFAULT_LEMMA_CACHE_SIZE):
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+        from nltk.tokenize import sent_tokenize, word_tokenize
+
+        self.stop_words = frozenset(stopwords.words('english'))
+        self.lemma_cache_size = lemma_cache_size
+        self._word_tokenize = word_tokenize
+        self._sent_tokenize = sent_tokenize
+        self._lemmatizer = WordNetLemmatizer()
+        self._cached_lemmatize = lru_cache(maxsize=lemma_cache_size)(self._lemmatizer.lemmatize)
+
+    def lemmatize(self, word: str) -> str:
+        return self._cached_lemmatize(word)
+
+    def normalize(self, text: str) -> str:
+        """执行完整的文本预处理：小写、去特殊字符、分词、去停用词、词形还原。"""
+        if not isinstance(text, str): return ""
+        text = _NON_ALPHA_PATTERN.sub(' ', text.lower())
+        tokens = self._word_tokenize(text)
+        stop_words, lemmatize = self.stop_words, self._cached_lemmatize
+        lemmatized_tokens = [
+            lemmatize(word) for word in tokens
+            if word not in stop_words and len(word) > 2
+        ]
+        return ' '.join(lemmatized_tokens)
+
+    def phrase_text(self, text: str) -> str:
+        """
+        【V11.4 短语文本】词云短语（如 "dried out"）的统计来源：逐句小写、去特殊字符、分词，
+        保留停用词（否则 out、not 之类的短语成分会被删去，相邻的词元也就不再相邻），其余词与 normalize 相同地还原词形。
+        句与句之间以 SENTENCE_BOUNDARY 分隔，统计时短语不跨越句子。
+        """
+        if not isinstance(text, str): return ""
+        stop_words, lemmatize = self.stop_words, self._cached_lemmatize
+        sentences = []
+        for sentence in self._sent_tokenize(text):
+            tokens = self._word_tokenize(_NON_ALPHA_PATTERN.sub(' ', sentence.lower()))
+            if tokens:
+                sentences.append(' '.join(word if word in stop_words or len(word) <= 2 else lemmatize(word) for word in tokens))
+        return f' {SENTENCE_BOUNDARY} '.join(sentences)
+
+    def cache_info(self) -> Dict[str, Any]:
+        """返回词形缓存的命中、未命中次数、当前大小与命中率。"""
+        info = self._cached_lemmatize.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': (info.hits / lookups) if lookups else 0.0,
+        }
+
+    def clear_cache(self):
+        self._cached_lemmatize.cache_clear()
+
+
+# --- 与 TextBlob PatternAnalyzer 逐位一致的分词规则（textblob._text.find_tokens 的默认参数） ---
+_QUOTES = (("“", " “ "), ("”", " ” "), ("‘", " ‘ "), ("’", " ’ "), ("'", " ' "), ('"', ' " '))
+_LINEBREAK_PATTERN = re.compile(r"\n{2,}")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_TOKEN_PATTERN = re.compile(r"(\S+)\s")
+DEFAULT_TOKEN_CACHE_SIZE = 200_000
+# 极性打分算法的版本号；打分规则变化时递增，使持久化的极性缓存作废
+POLARITY_SCORER_VERSION = 'pattern-en-v1'
+
+
+@lru_cache(maxsize=None)
+def _pattern_rules() -> SimpleNamespace:
+    """首次使用时从 textblob._text 载入分词所需的标点、缩写、表情符号与正则规则。"""
+    from textblob._text import (
+        PUNCTUATION, ABBREVIATIONS, EMOTICONS, EOS, RE_ABBR1, RE_ABBR2, RE_ABBR3, RE_SARCASM, RE_EMOTICONS,
+        replacements,
+    )
+    token_punctuation = tuple(PUNCTUATION.replace(".", ""))
+    return SimpleNamespace(
+        punctuation=PUNCTUATION, abbreviations=ABBREVIATIONS, emoticons=EMOTICONS, eos=EOS, contractions=replacements,
+        abbreviation_patterns=(RE_ABBR1, RE_ABBR2, RE_ABBR3), sarcasm=RE_SARCASM, emoticon_pattern=RE_EMOTICONS,
+        token_punctuation=token_punctuation,
+        trailing_punctuation=token_punctuation + (".",),
+        sentence_end=("...", ".", "!", "?", EOS),
+        sentence_tail=("'", '"', "”", "’", "...", ".", "!", "?", ")", EOS),
+    )
+
+
+@lru_cache(maxsize=DEFAULT_TOKEN_CACHE_SIZE)
+def _split_token(t: str) -> tuple:
+    """拆分单个空白分隔词两端的标点（缩写除外）。结果只取决于词本身，因此按词缓存。"""
+    rules = _pattern_rules()
+    contractions, token_punctuation, trailing_punctuation = rules.contractions, rules.token_punctuation, rules.trailing_punctuation
+    tokens, tail = [], []
+    while t.startswith(token_punctuation) and t not in contractions:
+        tokens.append(t[0])
+        t = t[1:]
+    while t.endswith(trailing_punctuation) and t not in contractions:
+        if t.endswith(token_punctuation):
+            tail.append(t[-1])
+            t = t[:-1]
+        if t.endswith("..."):
+            tail.append("...")
+            t = t[:-3].rstrip(".")
+        if t.endswith("."):
+            if t in rules.abbreviations or any(pattern.match(t) is not None for pattern in rules.abbreviation_patterns):
+                break
+            tail.append(t[-1])
+            t = t[:-1]
+    if t != "":
+        tokens.append(t)
+    tokens.extend(reversed(tail))
+    return tuple(tokens)
+
+
+def pattern_tokens(text: str) -> List[str]:
+    """
+    返回与 TextBlob 情感分析完全相同的小写词序列
+    （即 " ".join(find_tokens(text)).split() 后逐词小写）。
+    """
+    rules = _pattern_rules()
+    eos = rules.eos
+    string = str(text)
+    for contraction, spaced in rules.contractions.items():
+        if contraction in string:
+            string = string.replace(contraction, spaced)
+    for quote, spaced in _QUOTES:
+        string = string.replace(quote, spaced)
+    string = _LINEBREAK_PATTERN.sub(" %s " % eos, string.replace("\r\n", "\n"))
+    string = _WHITESPACE_PATTERN.sub(" ", string)
+    tokens = []
+    for t in _TOKEN_PATTERN.findall(string + " "):
+        tokens.extend(_split_token(t))
+
+    # 按句末标点分句；分句只影响 EOS 标记的去除以及讽刺标记、表情符号的合并范围
+    sentence_end, sentence_tail = rules.sentence_end, rules.sentence_tail
+    sentences, i, j = [[]], 0, 0
+    while j < len(tokens):
+        if tokens[j] in sentence_end:
+            while j < len(tokens) and tokens[j] in sentence_tail:
+                if tokens[j] in ("'", '"') and sentences[-1].count(tokens[j]) % 2 == 0:
+                    break
+                j += 1
+            sentences[-1].extend(t for t in tokens[i:j] if t != eos)
+            sentences.append([])
+            i = j
+        j += 1
+    sentences[-1].extend(tokens[i:j])
+
+    words = []
+    for sentence in sentences:
+        if not sentence:
+            continue
+        sentence = rules.sarcasm.sub("(!)", " ".join(sentence))
+        sentence = rules.emoticon_pattern.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), sentence)
+        words.extend(sentence.lower().split())
+    return words
+
+
+class PolarityScorer:
+    """
+    【V10.7 批量极性打分】
+    与 TextBlob(text).sentiment.polarity 结果逐位一致的批量实现：
+    情感词典（en-sentiment.xml）只加载一次并展开为 “词 → (极性, 主观性, 强度, 是否修饰词)” 的平面字典，
+    分词结果按词缓存，同一批次中重复的文本只打分一次；否定、修饰词、感叹号、讽刺标记与表情符号的规则与 TextBlob 相同。
+    省去了逐行构造 TextBlob 对象与分析结果的开销。
+    """
+
+    def __init__(self):
+        from textblob.en import sentiment as pattern_sentiment
+
+        len(pattern_sentiment)  # 触发词典的延迟加载（含 “terrible → terribly” 副词扩展）
+        modifiers = pattern_sentiment.modifiers
+        self.negations = frozenset(pattern_sentiment.negations)
+        self.lexicon = {
+            word: tuple(scores[None]) + (any(pos in scores for pos in modifiers),)
+            for word, scores in dict.items(pattern_sentiment)
+        }
+        rules = _pattern_rules()
+        self.punctuation = rules.punctuation
+        self.emoticons = {}
+        for (_, polarity), faces in rules.emoticons.items():
+            for face in faces:
+                self.emoticons.setdefault(face.lower(), polarity)
+
+    def _assessment_polarities(self, words: List[str]) -> List[float]:
+        """按 PatternAnalyzer 的规则，返回每个评估片段（已知词及其修饰/否定）的极性。"""
+        lexicon, negations, emoticons, punctuation = self.lexicon, self.negations, self.emoticons, self.punctuation
+        a = []  # [极性, 强度, 是否否定]
+        m = None  # 前一个修饰词
+        n = None  # 前一个否定词
+        for w in words:
+            entry = lexicon.get(w)
+            if entry is not None:
+                p, _, i, is_modifier = entry
+                if m is None:
+                    a.append([p, i, False])
+                else:
+                    a[-1][0] = max(-1.0, min(p * a[-1][1], +1.0))
+                    a[-1][1] = i
+                if n is not None:
+                    a[-1][1] = 1.0 / a[-1][1]
+                    a[-1][2] = True
+                m = w if is_modifier else None
+                n = w if w in negations else None
+            else:
+                if w in negations:
+                    n = w
+                elif n and len(w.strip("'")) > 1:
+                    n = None
+                if n is not None and m is not None and m.endswith("ly"):
+                    a[-1][2] = True
+                    n = None
+                elif m and len(w) > 2:
+                    m = None
+                if w == "!" and a:
+                    a[-1][0] = max(-1.0, min(a[-1][0] * 1.25, +1.0))
+                if w == "(!)":
+                    a.append([0.0, 1.0, False])
+                if w.isalpha() is False and len(w) <= 5 and w not in punctuation:
+                    polarity = emoticons.get(w)
+                    if polarity is not None:
+                        a.append([polarity, 1.0, False])
+        return [p * -0.5 if negated else p for p, _, negated in a]
+
+    def polarity(self, text: str) -> float:
+        total, count = 0, 0
+        for p in self._assessment_polarities(pattern_tokens(text)):
+            total += p
+            count += 1
+        return total / float(count or 1)
+
+    def polarity_batch(self, texts: List[str]) -> List[float]:
+        """批量打分，批次内重复的文本只计算一次。"""
+        scores = {}
+        for text in texts:
+            if text not in scores:
+                scores[text] = self.polarity(text)
+        return [scores[text] for text in texts]
+
+
+def get_polarity_scorer() -> PolarityScorer:
+    """返回当前进程共享的极性打分器（情感词典只加载一次）。"""
+    scorer = _WORKER_STATE.get('polarity_scorer')
+    if scorer is None:
+        scorer = PolarityScorer()
+        _WORKER_STATE['polarity_scorer'] = scorer
+    return scorer
+
+
+def get_normalizer(lemma_cache_size: int = DEFAULT_LEMMA_CACHE_SIZE) -> TextNormalizer:
+    """返回当前进程共享的文本规范化组件（缓存大小变化时重新创建）。"""
+    normalizer = _WORKER_STATE.get('normalizer')
+    if normalizer is None or normalizer.lemma_cache_size != lemma_cache_size:
+        normalizer = TextNormalizer(lemma_cache_size)
+        _WORKER_STATE['normalizer'] = normalizer
+    return normalizer
+
+
+def init_nlp_worker(lemma_cache_size: int = DEFAULT_LEMMA_CACHE_SIZE):
+    """进程池的初始化函数：在每个工作进程启动时一次性加载停用词表、词形还原器与情感词典。"""
+    get_normalizer(lemma_cache_size)
+    get_polarity_scorer()
+
+
+# --- 可在工作进程中执行的分块任务（必须定义在模块顶层，才能被 pickle） ---
+def preprocess_chunk(texts: List[Any]) -> List[str]:
+    normalizer = _WORKER_STATE.get('normalizer') or get_normalizer()
+    return [normalizer.normalize(text) for text in texts]
+
+
+def phrase_chunk(texts: List[Any]) -> List[str]:
+    normalizer = _WORKER_STATE.get('normalizer') or get_normalizer()
+    return [normalizer.phrase_text(text) for text in texts]
+
+
+def split_sentences_chunk(texts: List[str]) -> List[List[str]]:
+    from nltk.tokenize import sent_tokenize
+    return [sent_tokenize(text) for text in texts]
+
+
+def polarity_chunk(texts: List[str]) -> List[float]:
+    return get_polarity_scorer().polarity_batch(texts)
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """将 n_jobs 解析为实际进程数：None/0/1 为串行，-1 表示使用全部CPU核心。"""
+    if not n_jobs:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+class ParallelTextMapper:
+    """
+    将文本序列切分为若干块，分发到进程池中执行，并按原顺序重新拼接结果。
+    进程池在首次使用时创建、在 close() 时关闭，同一次分析中的各个阶段共享同一批工作进程。
+    """
+
+    def __init__(self, n_jobs: int = 1, min_chunk_size: int = 500, lemma_cache_size: int = DEFAULT_LEMMA_CACHE_SIZE):
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self.min_chunk_size = min_chunk_size
+        self.lemma_cache_size = lemma_cache_size
+        self._executor = None
+
+    def map(self, chunk_func: Callable[[List[Any]], List[Any]], values) -> List[Any]:
+        values = list(values)
+        # 数据量太小或串行模式下，直接在当前进程内执行
+        if self.n_jobs <= 1 or len(values) < 2 * self.min_chunk_size:
+            return chunk_func(values)
+
+        chunk_size = max(self.min_chunk_size, -(-len(values) // (self.n_jobs * 4)))
+        chunks = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_jobs, initializer=init_nlp_worker, initargs=(self.lemma_cache_size,)
+            )
+        results = []
+        # executor.map 保证结果顺序与输入块顺序一致
+        for chunk_result in self._executor.map(chunk_func, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,136 @@
+# token_corpus.py (版本 1.0 - 词元编号语料：词表 + CSR 布局的 int32 词元数组)
+
+import json
+import os
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class TokenCorpus:
+    """
+    【V11.0 词元语料】
+    将“预处理文本”（空格分隔的词元串）存为一份词表与两个扁平数组（CSR 布局）：
+    - token_ids: 所有评论的词元编号依次拼接（int32）；
+    - offsets:   第 i 条评论的词元为 token_ids[offsets[i]:offsets[i + 1]]（int64）。
+    词频统计直接对编号做 np.bincount，关键词匹配也可在编号上进行；
+    两个数组可直接保存为 .npy 文件，并以内存映射方式按需读取。
+    """
+
+    VOCABULARY_FILE = 'vocabulary.json'
+    TOKEN_IDS_FILE = 'token_ids.npy'
+    OFFSETS_FILE = 'offsets.npy'
+    INDEX_FILE = 'index.npy'
+
+    def __init__(self, vocabulary: List[str], token_ids: np.ndarray, offsets: np.ndarray, index: Optional[pd.Index] = None):
+        self.vocabulary = list(vocabulary)
+        self.token_ids = token_ids
+        self.offsets = offsets
+        self.index = index if index is not None else pd.RangeIndex(len(offsets) - 1)
+        self._vocabulary_index = None
+
+    @classmethod
+    def from_texts(cls, texts: Iterable, index: Optional[pd.Index] = None) -> 'TokenCorpus':
+        """由预处理文本构建语料；词表按词元首次出现的顺序编号，非字符串（缺失值）视为空文本。"""
+        vocabulary_index = {}
+        token_ids = []
+        offsets = [0]
+        for text in texts:
+            if isinstance(text, str):
+                token_ids.extend(vocabulary_index.setdefault(token, len(vocabulary_index)) for token in text.split())
+            offsets.append(len(token_ids))
+        corpus = cls(list(vocabulary_index), np.asarray(token_ids, dtype=np.int32), np.asarray(offsets, dtype=np.int64), index)
+        corpus._vocabulary_index = vocabulary_index
+        return corpus
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def vocabulary_index(self) -> dict:
+        """词元 → 编号。"""
+        if self._vocabulary_index is None:
+            self._vocabulary_index = {token: i for i, token in enumerate(self.vocabulary)}
+        return self._vocabulary_index
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.token_ids.nbytes + self.offsets.nbytes)
+
+    def row_ids(self, position: int) -> np.ndarray:
+        """第 position 条评论的词元编号。"""
+        return self.token_ids[self.offsets[position]:self.offsets[position + 1]]
+
+    def text(self, position: int) -> str:
+        """还原第 position 条评论的预处理文本。"""
+        vocabulary = self.vocabulary
+        return ' '.join(vocabulary[i] for i in self.row_ids(position))
+
+    def texts(self, positions: Optional[np.ndarray] = None) -> List[str]:
+        positions = range(len(self)) if positions is None else positions
+        return [self.text(position) for position in positions]
+
+    def positions_of(self, labels: pd.Index) -> Optional[np.ndarray]:
+        """将 DataFrame 索引标签转换为语料中的行号；只要有一个标签不在语料中（或语料索引有重复）就返回 None。"""
+        if not self.index.is_unique:
+            return None
+        positions = self.index.get_indexer(labels)
+        if (positions < 0).any():
+            return None
+        return positions
+
+    def gather(self, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """按 positions 的顺序取出这些评论的全部词元编号并拼接（不经过任何字符串）。"""
+        if positions is None:
+            return self.token_ids
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = self.offsets[positions]
+        lengths = self.offsets[positions + 1] - starts
+        if len(positions) == 0 or lengths.sum() == 0:
+            return np.empty(0, dtype=self.token_ids.dtype)
+        # 每个词元的全局下标 = 所在评论的起点 + 在该评论内的偏移
+        shifts = starts - np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return self.token_ids[np.repeat(shifts, lengths) + np.arange(lengths.sum())]
+
+    def word_counts(self, positions: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        返回 (词元编号, 出现次数)，词元按其在这些评论中首次出现的顺序排列
+        （与对拼接后的文本使用 Counter 计数时的插入顺序一致）。
+        """
+        ids = self.gather(positions)
+        if len(ids) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        present, first_seen = np.unique(ids, return_index=True)
+        present = present[np.argsort(first_seen, kind='stable')]
+        counts = np.bincount(ids, minlength=len(self.vocabulary))[present]
+        return present, counts
+
+    def frequent_words(self, positions: Optional[np.ndarray] = None, min_frequency: int = 5) -> List[Tuple[str, int]]:
+        """返回出现次数不少于 min_frequency 的 [(词, 次数), ...]，按次数降序（并列时保持首次出现顺序）。"""
+        ids, counts = self.word_counts(positions)
+        keep = counts >= min_frequency
+        ids, counts = ids[keep], counts[keep]
+        order = np.argsort(-counts, kind='stable')
+        vocabulary = self.vocabulary
+        return [(vocabulary[i], int(c)) for i, c in zip(ids[order], counts[order])]
+
+    def save(self, corpus_dir: str):
+        """保存为词表 JSON + 三个 .npy 数组。"""
+        os.makedirs(corpus_dir, exist_ok=True)
+        with open(os.path.join(corpus_dir, self.VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.vocabulary, f, ensure_ascii=False)
+        np.save(os.path.join(corpus_dir, self.TOKEN_IDS_FILE), self.token_ids)
+        np.save(os.path.join(corpus_dir, self.OFFSETS_FILE), self.offsets)
+        np.save(os.path.join(corpus_dir, self.INDEX_FILE), self.index.to_numpy(), allow_pickle=True)
+
+    @classmethod
+    def load(cls, corpus_dir: str, mmap: bool = True) -> 'TokenCorpus':
+        """读取已保存的语料；mmap=True 时词元数组以内存映射方式打开，只有被访问的部分才会读入内存。"""
+        mmap_mode = 'r' if mmap else None
+        with open(os.path.join(corpus_dir, cls.VOCABULARY_FILE), 'r', encoding='utf-8') as f:
+            vocabulary = json.load(f)
+        token_ids = np.load(os.path.join(corpus_dir, cls.TOKEN_IDS_FILE), mmap_mode=mmap_mode)
+        offsets = np.load(os.path.join(corpus_dir, cls.OFFSETS_FILE), mmap_mode=mmap_mode)
+        index = pd.Index(np.load(os.path.join(corpus_dir, cls.INDEX_FILE), allow_pickle=True))
+        return cls(vocabulary, token_ids, offsets, index)
@@ -0,0 +1,223 @@
+# word_frequency.py (版本 1.1 - 可合并的分块词频 / 短语频率统计；短语按句统计并保留停用词)
+
+import heapq
+from collections import Counter
+from functools import partial
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from diagnostics_engine import run_report_tasks
+from text_processing import SENTENCE_BOUNDARY
+
+DEFAULT_FREQUENCY_CHUNK_SIZE = 50_000
+
+
+def _top_frequencies(items: List[Tuple[str, int]], min_frequency: int, top_k: Optional[int]) -> List[Tuple[str, int]]:
+    """按次数降序返回频率不低于 min_frequency 的条目；并列时保持首次出现顺序。top_k 为 None 时返回全部。"""
+    frequent = [(gram, count) for gram, count in items if count >= min_frequency]
+    if top_k is not None and top_k < len(frequent):
+        # heapq.nlargest 与 sorted(..., reverse=True)[:top_k] 的结果（含并列顺序）完全相同，但只维护 top_k 大小的堆
+        return heapq.nlargest(top_k, frequent, key=lambda item: item[1])
+    return sorted(frequent, key=lambda item: item[1], reverse=True)
+
+
+class FrequencyCounter:
+    """
+    【V11.1 流式词频统计】
+    逐块累加单词与 n 元短语（如 "dried out"）的出现次数，只保存计数器本身；
+    各数据块的部分计数可用 merge 按顺序合并，合并后的结果（含并列时的首次出现顺序）与一次性统计完全相同。
+    【V11.4】单词来自预处理文本（已去停用词）；短语来自 TextNormalizer.phrase_text 生成的短语文本：
+    保留停用词、不跨越句子与评论边界，全部由停用词组成的短语（如 "it is"）不计。
+    次数并列时单词排在短语之前，各自保持首次出现顺序。
+    """
+
+    def __init__(self, ngram_range: Tuple[int, int] = (1, 1), stop_words: Iterable[str] = ()):
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = frozenset(stop_words)
+        self.counts = Counter()
+        self.phrase_counts = Counter()
+
+    @property
+    def counts_phrases(self) -> bool:
+        return self.ngram_range[1] >= 2
+
+    def update(self, token_rows: Iterable[List[str]]):
+        """累加若干条已分词的预处理文本中的单词（ngram_range 不含 1 时不计单词）。"""
+        if self.ngram_range[0] > 1:
+            return
+        counts = self.counts
+        for tokens in token_rows:
+            counts.update(tokens)
+
+    def update_texts(self, texts: Iterable):
+        """累加若干条空格分隔的预处理文本（缺失值忽略）。"""
+        self.update(text.split() for text in texts if isinstance(text, str))
+
+    def update_phrases(self, token_rows: Iterable[List[str]]):
+        """累加若干条已分词的短语文本中的 n 元短语；同一起始位置的短语按长度从短到长计入。"""
+        low, high = max(self.ngram_range[0], 2), self.ngram_range[1]
+        counts, stop_words = self.phrase_counts, self.stop_words
+        for tokens in token_rows:
+            n_tokens = len(tokens)
+            for start in range(n_tokens):
+                for n in range(low, min(high, n_tokens - start) + 1):
+                    gram = tokens[start:start + n]
+                    if SENTENCE_BOUNDARY in gram:
+                        break
+                    if all(token in stop_words for token in gram):
+                        continue
+                    counts[' '.join(gram)] += 1
+
+    def update_phrase_texts(self, texts: Iterable):
+        """累加若干条短语文本（缺失值忽略）。"""
+        if self.counts_phrases:
+            self.update_phrases(text.split() for text in texts if isinstance(text, str))
+
+    def merge(self, other: 'FrequencyCounter') -> 'FrequencyCounter':
+        """按顺序并入另一个（后续数据块的）部分计数。"""
+        self.counts.update(other.counts)
+        self.phrase_counts.update(other.phrase_counts)
+        return self
+
+    def most_common(self, min_frequency: int = 1, top_k: Optional[int] = None) -> List[Tuple[str, int]]:
+        return _top_frequencies(list(self.counts.items()) + list(self.phrase_counts.items()), min_frequency, top_k)
+
+
+def _chunk_ngram_counts(corpus, positions: np.ndarray, n_values: List[int], boundary_id: Optional[int] = None,
+                        is_stop: Optional[np.ndarray] = None) -> List[tuple]:
+    """
+    统计一个数据块中各长度短语的出现次数。短语用词元编号按词表大小进制编码为 int64。
+    含句子分隔词元（boundary_id）或全部由停用词（is_stop[编号] 为 True）组成的多词短语不计。
+    返回 [(n, 编码, 首次出现的词元位置, 次数), ...]。
+    """
+    ids = corpus.gather(positions).astype(np.int64)
+    lengths = corpus.offsets[positions + 1] - corpus.offsets[positions]
+    row_of_token = np.repeat(np.arange(len(positions)), lengths)
+    vocabulary_size = max(len(corpus.vocabulary), 1)
+    results = []
+    for n in n_values:
+        n_grams = len(ids) - n + 1
+        if n_grams <= 0:
+            continue
+        keys = ids[:n_grams].copy()
+        for k in range(1, n):
+            keys = keys * vocabulary_size + ids[k:k + n_grams]
+        # 首尾词元属于同一条评论的短语才有效
+        starts = np.flatnonzero(row_of_token[:n_grams] == row_of_token[n - 1:n - 1 + n_grams])
+        if n > 1 and len(starts) and (boundary_id is not None or is_stop is not None):
+            window = ids[starts[:, None] + np.arange(n)]
+            valid = np.ones(len(starts), dtype=bool)
+            if boundary_id is not None:
+                valid &= ~(window == boundary_id).any(axis=1)
+            if is_stop is not None:
+                valid &= ~is_stop[window].all(axis=1)
+            starts = starts[valid]
+        if len(starts) == 0:
+            continue
+        unique_keys, first, inverse = np.unique(keys[starts], return_index=True, return_inverse=True)
+        results.append((n, unique_keys, starts[first], np.bincount(inverse)))
+    return results
+
+
+def _decode_ngram(key: int, n: int, vocabulary: List[str]) -> str:
+    vocabulary_size = max(len(vocabulary), 1)
+    tokens = []
+    for _ in range(n):
+        key, token_id = divmod(key, vocabulary_size)
+        tokens.append(vocabulary[token_id])
+    return ' '.join(reversed(tokens))
+
+
+def _gram_frequencies(corpus, positions: np.ndarray, n_values: List[int], min_frequency: int, top_k: Optional[int],
+                      chunk_size: int, max_workers: int, stop_words: frozenset) -> List[Tuple[str, int]]:
+    """在一份语料上分块并行统计 n_values 中各长度的短语；按次数降序，并列时按首次出现的 (位置, 长度) 排列。"""
+    high = max(n_values)
+    vocabulary_index = corpus.vocabulary_index
+    boundary_id = vocabulary_index.get(SENTENCE_BOUNDARY)
+    is_stop = None
+    if stop_words and high > 1:
+        is_stop = np.zeros(len(corpus.vocabulary), dtype=bool)
+        is_stop[[i for token, i in vocabulary_index.items() if token in stop_words]] = True
+
+    chunks = [positions[start:start + chunk_size] for start in range(0, len(positions), chunk_size)]
+    chunk_results = run_report_tasks([partial(_chunk_ngram_counts, corpus, chunk, n_values, boundary_id, is_stop)
+                                      for chunk in chunks], max_workers)
+
+    # 合并各块的部分计数：首次出现位置换算为全局词元位置，(位置, 长度) 决定并列时的先后顺序
+    token_offset = 0
+    merged = {n: ([], [], []) for n in n_values}
+    for chunk, results in zip(chunks, chunk_results):
+        for n, keys, first, counts in results:
+            merged[n][0].append(keys)
+            merged[n][1].append((token_offset + first) * (high + 1) + n)
+            merged[n][2].append(counts)
+        token_offset += int((corpus.offsets[chunk + 1] - corpus.offsets[chunk]).sum())
+
+    all_n, all_keys, all_ranks, all_counts = [], [], [], []
+    for n, (keys, ranks, counts) in merged.items():
+        if not keys:
+            continue
+        keys, ranks, counts = np.concatenate(keys), np.concatenate(ranks), np.concatenate(counts)
+        # 各块按顺序拼接，某短语在拼接数组中的首次出现即其全局首次出现
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        all_n.append(np.full(len(unique_keys), n))
+        all_keys.append(unique_keys)
+        all_ranks.append(ranks[first])
+        all_counts.append(np.bincount(inverse, weights=counts).astype(np.int64))
+    if not all_keys:
+        return []
+    n_array, keys, ranks, counts = (np.concatenate(a) for a in (all_n, all_keys, all_ranks, all_counts))
+
+    keep = counts >= min_frequency
+    n_array, keys, ranks, counts = n_array[keep], keys[keep], ranks[keep], counts[keep]
+    if top_k is not None and top_k < len(counts):
+        # 部分选择：只保留计数不低于第 top_k 大计数的候选，再对候选排序
+        threshold = np.partition(counts, len(counts) - top_k)[len(counts) - top_k]
+        candidates = counts >= threshold
+        n_array, keys, ranks, counts = n_array[candidates], keys[candidates], ranks[candidates], counts[candidates]
+    order = np.lexsort((ranks, -counts))
+    if top_k is not None:
+        order = order[:top_k]
+    vocabulary = corpus.vocabulary
+    return [(_decode_ngram(int(keys[i]), int(n_array[i]), vocabulary), int(counts[i])) for i in order]
+
+
+def corpus_frequencies(corpus, positions: Optional[np.ndarray] = None, min_frequency: int = 5,
+                       ngram_range: Tuple[int, int] = (1, 1), top_k: Optional[int] = None,
+                       chunk_size: int = DEFAULT_FREQUENCY_CHUNK_SIZE, max_workers: int = 1,
+                       phrase_corpus=None, phrase_positions: Optional[np.ndarray] = None,
+                       stop_words: Iterable[str] = ()) -> List[Tuple[str, int]]:
+    """
+    【V11.1 分块并行词频】直接在词元编号语料（TokenCorpus）上统计单词与短语频率：
+    评论按 chunk_size 分块，各块在线程池中独立计数，再按块顺序合并部分计数；
+    只有最终入选的 top_k 个条目才解码为字符串。结果与 FrequencyCounter 逐条统计完全相同。
+    【V11.4】单词取自预处理文本的语料 corpus（positions 行）；ngram_range 含二元及以上短语时，
+    短语取自短语文本的语料 phrase_corpus（phrase_positions 行，须与 positions 对应同一批评论）。
+    """
+    low, high = ngram_range
+    stop_words = frozenset(stop_words)
+    if positions is None:
+        positions = np.arange(len(corpus))
+    positions = np.asarray(positions, dtype=np.int64)
+    words = []
+    if low <= 1:
+        words = _gram_frequencies(corpus, positions, [1], min_frequency, top_k, chunk_size, max_workers, stop_words)
+    if high < 2:
+        return words
+    if phrase_corpus is None:
+        raise ValueError("统计短语需要提供短语文本的语料 phrase_corpus")
+
+    if phrase_positions is None:
+        phrase_positions = np.arange(len(phrase_corpus))
+    phrase_positions = np.asarray(phrase_positions, dtype=np.int64)
+    if len(phrase_corpus.vocabulary) ** high >= 2 ** 63:
+        # 词表过大、短语编码会溢出时，短语退回逐条统计
+        counter = FrequencyCounter(ngram_range, stop_words)
+        counter.update_phrases([phrase_corpus.vocabulary[i] for i in phrase_corpus.row_ids(p)] for p in phrase_positions)
+        phrases = counter.most_common(min_frequency, top_k)
+    else:
+        phrases = _gram_frequencies(phrase_corpus, phrase_positions, list(range(max(low, 2), high + 1)),
+                                    min_frequency, top_k, chunk_size, max_workers, stop_words)
+    # 两个列表各自已按次数降序排列；稳定排序后并列时单词在前，与 FrequencyCounter 相同
+    return _top_frequencies(words + phrases, min_frequency, top_k)